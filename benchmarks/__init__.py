@@ -0,0 +1 @@
+"""Benchmarks of conscience, see `benchmarks.harness`."""
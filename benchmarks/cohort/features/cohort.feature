@@ -0,0 +1,24 @@
+Feature: EndOfDayz
+
+    Scenario: The game is displayed
+        Given I start a task 1 game with the map "maps/basic.txt"
+         Then the window title is "EndOfDayz"
+          And I see text displaying, roughly, "EndOfDayz"
+          And a BasicMap instance should be packed within the GUI
+          And an InventoryView instance should be packed within the GUI
+
+    Scenario: The title is above the game
+        Given I start a task 1 game with the map "maps/basic.txt"
+         Then I see text displaying, exactly, EndOfDayz
+          And it is above all other widgets
+
+    Scenario: The player moves
+        Given I start a task 1 game with the map "maps/basic.txt"
+         When I press the D key, 2 times
+          And I press the S key, 1 times
+         Then a BasicMap instance should be packed within the GUI
+
+    Scenario: The game keeps time
+        Given I start a task 1 game with the map "maps/basic.txt"
+         When 3 seconds pass
+         Then an InventoryView instance should be packed within the GUI
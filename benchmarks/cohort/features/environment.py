@@ -0,0 +1,17 @@
+from conscience import setup
+from conscience.lib.window import destroy_root
+
+
+def before_feature(context, feature):
+    setup(context)
+
+
+def before_scenario(context, scenario):
+    context.suite.start(context)
+    context.window = context.suite.window
+
+
+def after_scenario(context, scenario):
+    # a reused window is scrubbed by the suite when the next scenario starts
+    if "window" in context and not context.suite.reuse_window:
+        destroy_root(context.window)
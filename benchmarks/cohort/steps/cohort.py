@@ -0,0 +1,14 @@
+from behave import *
+
+from conscience import load_common_steps
+
+load_common_steps()
+
+
+@given('I start a task 1 game with the map "{path}"')
+def start_game(context, path: str):
+    game = context.under_test.advanced_game(path)
+    size = game.get_grid().get_size()
+    gui = context.under_test.BasicGraphicalInterface(context.window, size)
+    gui.play(game)
+    context.window.update()
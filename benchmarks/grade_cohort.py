@@ -0,0 +1,219 @@
+"""Benchmark grading a realistic cohort of submissions end to end.
+
+Generates mutated variants of `tests/dayz/dayz.py` (see `benchmarks.mutants`), grades
+them all with `conscience.witness_all` against the features in `benchmarks/cohort`,
+and reports:
+    - throughput, in submissions graded per minute;
+    - the p50, p95 and p99 latency of grading a submission;
+    - the peak resident memory of each worker;
+    - how each kind of mutant was graded: passed, failed, timed out, or failed to load.
+
+    python -m benchmarks.grade_cohort --count 300 --workers 4 --json cohort.json
+
+Steps are given a time budget (see `conscience.budget`), so the infinite loops end.
+Each worker reuses one root window across scenarios (see `conscience.lib.window`),
+unless given --fresh-windows.
+Without DISPLAY set, each worker is given an Xvfb display of its own.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+from conscience import (
+    DisplayPool,
+    GradedSubmission,
+    build_config,
+    setup_config,
+    witness_all,
+)
+from conscience.display import DisplayError
+from conscience.lobes import MockAfter, PreventMainloop, TrackKeypresses
+from conscience.score import GradescopeResults
+from conscience.suite import ConscienceSuite
+
+from benchmarks.mutants import MUTATIONS
+
+ROOT = Path(__file__).resolve().parent.parent
+SUBMISSION = ROOT / "tests" / "dayz" / "dayz.py"
+FEATURES = ROOT / "benchmarks" / "cohort" / "features"
+
+
+def cohort_config(step_timeout: float, scenario_timeout: float, reuse_window: bool):
+    suite = ConscienceSuite(reuse_window=reuse_window)
+    for lobe in (PreventMainloop(), MockAfter(), TrackKeypresses()):
+        suite.enable(lobe)
+
+    config = build_config(is_gradescope=True)
+    setup_config(
+        config,
+        suite,
+        tests=[FEATURES],
+        steps_dir=Path("../steps"),
+        environment_file=Path("environment.py"),
+        # the submission loads its maps and images relative to its own directory
+        working_directory=SUBMISSION.parent,
+    )
+    config.step_timeout = step_timeout
+    config.scenario_timeout = scenario_timeout
+    return config
+
+
+def generate(directory: Path, count: int, seed: int) -> dict[Path, str]:
+    """Writes `count` mutants of the submission to the directory.
+
+    Returns:
+        The kind of mutation of each mutant written.
+    """
+    source = SUBMISSION.read_text()
+    rng = random.Random(seed)
+    kinds = list(MUTATIONS)
+
+    mutants = {}
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        path = directory / f"{i:04}_{kind}.py"
+        path.write_text(MUTATIONS[kind](source, rng))
+        mutants[path] = kind
+    return mutants
+
+
+def classify(results: GradescopeResults) -> str:
+    """Decides how a submission was graded, from its results."""
+    tests = results.get("tests")
+    if tests is None:
+        # the traceback of a submission which couldn't be loaded
+        errors = re.findall(
+            r"^(\w+(?:Error|Exception))\b", results.get("output", ""), re.M
+        )
+        return f"load error ({errors[-1]})" if errors else "load error"
+    if any("exceeded" in test.get("output", "") for test in tests):
+        return "timed out"
+    if any(test.get("score", 0) < test.get("max_score", 0) for test in tests):
+        return "failed"
+    return "passed"
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarise(
+    graded: list[GradedSubmission], mutants: dict[Path, str], elapsed: float
+) -> dict:
+    latencies = [submission.elapsed for submission in graded]
+    peak_rss: dict[int, int] = {}
+    for submission in graded:
+        if submission.worker is not None:
+            peak_rss[submission.worker] = max(
+                peak_rss.get(submission.worker, 0), submission.peak_rss or 0
+            )
+
+    outcomes: dict[str, Counter] = defaultdict(Counter)
+    for submission in graded:
+        outcomes[mutants[submission.target]][classify(submission.results)] += 1
+
+    return {
+        "submissions": len(graded),
+        "elapsed": elapsed,
+        "per_minute": len(graded) / elapsed * 60,
+        "latency": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": max(latencies),
+        },
+        "peak_rss_kb": {str(worker): rss for worker, rss in sorted(peak_rss.items())},
+        "outcomes": {kind: dict(counts) for kind, counts in outcomes.items()},
+    }
+
+
+def report(summary: dict) -> str:
+    latency = summary["latency"]
+    lines = [
+        f"graded {summary['submissions']} submissions in {summary['elapsed']:.1f}s, "
+        f"{summary['per_minute']:.1f} per minute",
+        f"latency p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s, "
+        f"p99 {latency['p99']:.2f}s, max {latency['max']:.2f}s",
+        "peak RSS per worker: "
+        + ", ".join(f"{rss / 1024:.0f}MB" for rss in summary["peak_rss_kb"].values()),
+        "",
+        "outcomes by mutation:",
+    ]
+    for kind, counts in sorted(summary["outcomes"].items()):
+        described = ", ".join(f"{count} {outcome}" for outcome, count in counts.items())
+        lines.append(f"  {kind:<15} {described}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--submissions-per-worker", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--step-timeout", type=float, default=5)
+    parser.add_argument("--scenario-timeout", type=float, default=15)
+    parser.add_argument(
+        "--fresh-windows",
+        action="store_true",
+        help="create a root window per scenario, rather than reusing one",
+    )
+    parser.add_argument("--json", type=Path, help="write the summary to this file")
+    args = parser.parse_args(argv)
+
+    factory = partial(
+        cohort_config,
+        args.step_timeout,
+        args.scenario_timeout,
+        not args.fresh_windows,
+    )
+
+    displays = None
+    if not os.environ.get("DISPLAY"):
+        try:
+            displays = DisplayPool(args.workers)
+            displays.start()
+        except DisplayError as e:
+            print(f"no DISPLAY set, and could not start Xvfb: {e}", file=sys.stderr)
+            return 2
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            mutants = generate(Path(directory), args.count, args.seed)
+            start = time.perf_counter()
+            graded = list(
+                witness_all(
+                    factory,
+                    list(mutants),
+                    workers=args.workers,
+                    submissions_per_worker=args.submissions_per_worker,
+                    displays=displays,
+                )
+            )
+            elapsed = time.perf_counter() - start
+    finally:
+        if displays is not None:
+            displays.close()
+
+    summary = summarise(graded, mutants, elapsed)
+    print(report(summary))
+    if args.json is not None:
+        args.json.write_text(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
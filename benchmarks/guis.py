@@ -0,0 +1,110 @@
+"""Synthetic GUIs to benchmark against, each stressing a different part of conscience.
+
+Each builder lays out widgets in the root window, as a student's `setup_display`
+would, and returns the widget the benchmarked steps should start from (as
+`context.last`), if any.
+"""
+
+import tkinter as tk
+from typing import Optional
+
+# keys bound by the bindings GUI, as pressed by the keyboard steps
+KEYS = ("Left", "Right", "Up", "Down", "w", "a", "s", "d", "space")
+
+
+def labels(root: tk.Tk, count: int = 100) -> tk.Widget:
+    """A column of `count` labels, reading "Label 0" to "Label {count - 1}"."""
+    label = None
+    for i in range(count):
+        label = tk.Label(root, text=f"Label {i}")
+        label.pack()
+    return label
+
+
+def nested(root: tk.Tk, depth: int = 50, siblings: int = 2) -> tk.Widget:
+    """Frames nested `depth` deep, each with `siblings` labels beside the next frame,
+    and a single "Deepest" label at the bottom.
+    """
+    parent: tk.Widget = root
+    for level in range(depth):
+        for i in range(siblings):
+            tk.Label(parent, text=f"Level {level}.{i}").pack(side=tk.LEFT)
+        frame = tk.Frame(parent)
+        frame.pack(side=tk.LEFT)
+        parent = frame
+
+    deepest = tk.Label(parent, text="Deepest", bg="#371D33")
+    deepest.pack()
+    return deepest
+
+
+class GameGrid(tk.Canvas):
+    """A canvas drawn as a grid of cells, like the maps of the assignments."""
+
+
+def canvas_grid(
+    root: tk.Tk, rows: int = 20, columns: int = 20, cell: int = 24, images: int = 4
+) -> tk.Widget:
+    """A `rows` by `columns` grid of cells on a canvas, each holding one of `images`
+    distinct images and every fifth cell also holding a text item.
+    """
+    grid = GameGrid(root, width=columns * cell, height=rows * cell)
+    grid.pack()
+
+    # kept on the canvas, or tkinter would garbage collect the images
+    grid.images = [
+        tk.PhotoImage(name=f"tile{i}", width=cell - 2, height=cell - 2)
+        for i in range(images)
+    ]
+    for row in range(rows):
+        for column in range(columns):
+            x, y = column * cell + cell // 2, row * cell + cell // 2
+            grid.create_image(x, y, image=grid.images[(row + column) % images])
+            if (row * columns + column) % 5 == 0:
+                grid.create_text(x, y, text=f"{row},{column}")
+    return grid
+
+
+def after_loops(root: tk.Tk, loops: int = 20, interval: int = 10) -> tk.Widget:
+    """`loops` game loops, each rescheduling itself every `interval` milliseconds and
+    updating the text of a label as it does.
+    """
+    ticks = tk.Label(root, text="Ticks 0")
+    ticks.pack()
+    count = 0
+
+    def loop():
+        nonlocal count
+        count += 1
+        ticks.config(text=f"Ticks {count}")
+        root.after(interval, loop)
+
+    for _ in range(loops):
+        root.after(interval, loop)
+    return ticks
+
+
+def bindings(root: tk.Tk, extra: int = 200) -> Optional[tk.Widget]:
+    """Bindings for every key pressed by the keyboard steps, a generic key press
+    binding, and `extra` bindings to other sequences, alongside a slow game clock.
+    """
+    moves = tk.Label(root, text="Moves 0")
+    moves.pack()
+    count = 0
+
+    def clock():
+        root.after(1000, clock)
+
+    root.after(1000, clock)
+
+    def move(event):
+        nonlocal count
+        count += 1
+        moves.config(text=f"Moves {count}")
+
+    root.bind("<KeyPress>", lambda event: None)
+    for key in KEYS:
+        root.bind(f"<Key-{key}>", move)
+    for i in range(extra):
+        root.bind(f"<Control-Key-{i}>", move)
+    return moves
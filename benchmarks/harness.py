@@ -0,0 +1,323 @@
+"""Benchmark the standard steps of `conscience.common` against synthetic GUIs.
+
+Each case builds one of the GUIs in `benchmarks.guis`, at a given size, then times
+each of its steps many times over, marking the widget index stale before every call
+as the runner does before every step. The latency and throughput of every step are
+reported, and can be saved as a baseline for later runs to be compared against:
+
+    python -m benchmarks.harness --save benchmarks/baseline.json
+    ... change conscience ...
+    python -m benchmarks.harness --baseline benchmarks/baseline.json
+
+A baseline is only meaningful on the machine it was recorded on, so none is shipped.
+Comparing exits with status 1 if any step's median latency regressed by more than
+the tolerance.
+
+Tk needs an X display. Without DISPLAY set, an Xvfb server is started for the run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tkinter as tk
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import conscience.common as common
+from conscience.display import DisplayError, DisplayPool
+from conscience.lib.grid import SerializedGrid
+from conscience.lib.identify import CanvasSelector, invalidate_widget_index
+from conscience.lobes.after import MockAfter
+from conscience.lobes.keyboard import TrackKeypresses
+from conscience.parsers import RelativePosition
+
+from benchmarks import guis
+
+Step = Callable[[SimpleNamespace], None]
+Results = dict[str, dict[str, dict[str, float]]]
+"""case -> step -> metric -> value"""
+
+
+@dataclass
+class Case:
+    """A synthetic GUI of a given size, and the steps to time against it"""
+
+    name: str
+    build: Callable[..., Optional[tk.Widget]]
+    params: dict[str, int]
+    steps: dict[str, Step] = field(default_factory=dict)
+
+
+def _labels(count: int) -> Case:
+    return Case(
+        f"labels-{count}",
+        guis.labels,
+        {"count": count},
+        {
+            "rough text": partial(common.rough_text, text=f"label {count - 1}"),
+            "exact text": partial(common.exact_text, text=f"Label {count - 1}"),
+            "below all": partial(
+                common.relative_to_all, position=RelativePosition.Below
+            ),
+            "count instances": partial(
+                common.multiple_classes_packed, count=count, clazz="Label"
+            ),
+        },
+    )
+
+
+def _nested(depth: int) -> Case:
+    return Case(
+        f"nested-{depth}",
+        guis.nested,
+        {"depth": depth},
+        {
+            "rough text": partial(common.rough_text, text="deepest"),
+            "exact text": partial(common.exact_text, text="Deepest"),
+            "count instances": partial(
+                common.multiple_classes_packed, count=depth, clazz="Frame"
+            ),
+        },
+    )
+
+
+def _canvas_grid(rows: int, columns: int) -> Case:
+    def serialize(context):
+        SerializedGrid(context.last, (rows, columns)).serialize()
+
+    def text_at(context):
+        SerializedGrid(context.last, (rows, columns)).get_text_at_position((0, 0))
+
+    def images(context):
+        registry = {"tile0": "tile"}
+        assert CanvasSelector.get_canvas_images(registry, context.last, "tile")
+
+    return Case(
+        f"canvas-{rows}x{columns}",
+        guis.canvas_grid,
+        {"rows": rows, "columns": columns},
+        {
+            "single instance": partial(common.single_class_packed, clazz="GameGrid"),
+            "serialize grid": serialize,
+            "text at position": text_at,
+            "find images": images,
+            "find text": lambda context: CanvasSelector.get_canvas_text(
+                context.last, "0,0"
+            ),
+        },
+    )
+
+
+def _after_loops(loops: int) -> Case:
+    return Case(
+        f"after-{loops}",
+        guis.after_loops,
+        {"loops": loops, "interval": 10},
+        {
+            "one second passes": lambda context: context.after.step(1000),
+        },
+    )
+
+
+def _bindings(extra: int) -> Case:
+    return Case(
+        f"bindings-{extra}",
+        guis.bindings,
+        {"extra": extra},
+        {
+            "press key 10 times": partial(common.when_i_press_n, key="LEFT", count=10),
+            "repeat key sequence": partial(
+                common.repeat_key_sequence, sequence="wasd", count=2
+            ),
+        },
+    )
+
+
+CASES = [
+    _labels(100),
+    _labels(1000),
+    _nested(20),
+    _nested(100),
+    _canvas_grid(10, 10),
+    _canvas_grid(40, 40),
+    _after_loops(10),
+    _after_loops(50),
+    _bindings(10),
+    _bindings(1000),
+]
+
+
+# The methods replaced by the lobes set up for each case, restored afterwards.
+_MOCKED = [
+    (tk.Tk, "after"),
+    (tk.Widget, "after"),
+    (tk.Tk, "after_cancel"),
+    (tk.Widget, "after_cancel"),
+    (tk.Tk, "bind"),
+    (tk.Tk, "bind_all"),
+]
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def _metrics(latencies: list[float]) -> dict[str, float]:
+    mean = statistics.fmean(latencies)
+    return {
+        "calls": len(latencies),
+        "mean_ms": mean * 1000,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "throughput": 1 / mean if mean > 0 else float("inf"),
+    }
+
+
+def run_case(case: Case, repeat: int = 50) -> dict[str, dict[str, float]]:
+    """Builds the GUI of the case, then times each of its steps `repeat` times.
+
+    Raises:
+        AssertionError: If a step fails, as its timings would be meaningless.
+    """
+    originals = [(clz, name, vars(clz).get(name)) for clz, name in _MOCKED]
+    root = tk.Tk()
+    try:
+        context = SimpleNamespace(window=root, last=None)
+        suite = SimpleNamespace()
+        for lobe in (MockAfter(), TrackKeypresses()):
+            lobe.on_start(context, suite)
+
+        start = time.perf_counter()
+        context.last = case.build(root, **case.params)
+        root.update()
+        results = {"build": _metrics([time.perf_counter() - start])}
+
+        for name, step in case.steps.items():
+            last = context.last
+            latencies = []
+            # the first call warms up any caches which outlive a step
+            for _ in range(repeat + 1):
+                context.last = last
+                invalidate_widget_index()
+                start = time.perf_counter()
+                try:
+                    step(context)
+                except AssertionError as e:
+                    raise AssertionError(f"{case.name}: {name} failed: {e}") from e
+                latencies.append(time.perf_counter() - start)
+            context.last = last
+            results[name] = _metrics(latencies[1:])
+        return results
+    finally:
+        root.destroy()
+        for clz, name, original in originals:
+            if original is not None:
+                setattr(clz, name, original)
+            elif name in vars(clz):
+                delattr(clz, name)
+
+
+def run(cases: list[Case], repeat: int = 50) -> Results:
+    return {case.name: run_case(case, repeat) for case in cases}
+
+
+def compare(results: Results, baseline: Results, tolerance: float = 0.25) -> list[str]:
+    """Returns a description of every step whose median latency is more than
+    `tolerance` slower than in the baseline.
+    """
+    regressions = []
+    for case, steps in results.items():
+        for step, metrics in steps.items():
+            before = baseline.get(case, {}).get(step)
+            if before is None or before["p50_ms"] == 0:
+                continue
+            ratio = metrics["p50_ms"] / before["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{case}: {step} took {metrics['p50_ms']:.3f}ms, "
+                    f"{ratio:.2f}x the baseline {before['p50_ms']:.3f}ms"
+                )
+    return regressions
+
+
+def report(results: Results, baseline: Optional[Results] = None) -> str:
+    lines = [
+        f"{'case':<16} {'step':<22} {'p50 ms':>10} {'p95 ms':>10} {'per second':>12}"
+        + ("  vs baseline" if baseline else "")
+    ]
+    for case, steps in results.items():
+        for step, metrics in steps.items():
+            line = (
+                f"{case:<16} {step:<22} {metrics['p50_ms']:>10.3f} "
+                f"{metrics['p95_ms']:>10.3f} {metrics['throughput']:>12.1f}"
+            )
+            before = (baseline or {}).get(case, {}).get(step)
+            if before is not None and before["p50_ms"] > 0:
+                line += f"  {metrics['p50_ms'] / before['p50_ms']:>10.2f}x"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--case", action="append", help="only run the named cases")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--save", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare with these results")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if not args.case or case.name in args.case]
+
+    displays = None
+    if not os.environ.get("DISPLAY"):
+        try:
+            displays = DisplayPool(1, check_interval=None)
+            displays.start()
+        except DisplayError as e:
+            print(f"no DISPLAY set, and could not start Xvfb: {e}", file=sys.stderr)
+            return 2
+        os.environ["DISPLAY"] = displays.names[0]
+
+    try:
+        results = run(cases, args.repeat)
+    finally:
+        if displays is not None:
+            displays.close()
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    print(report(results, baseline))
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.platform(),
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Benchmark how long importing conscience takes, in a fresh interpreter each time.
+
+    python -m benchmarks.import_time
+
+Importing `conscience` itself should stay cheap, as every grading worker and step
+module does it. `tests/test_imports.py` guards which modules it may import.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Optional
+
+MODULES = ("conscience", "conscience.lib", "conscience.config", "conscience.batch")
+
+
+def import_time(module: str, repeat: int = 10) -> float:
+    """The median time in seconds to start an interpreter and import the module,
+    less the time to start an interpreter alone.
+    """
+
+    def median(statement: str) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", statement], check=True)
+            times.append(time.perf_counter() - start)
+        return statistics.median(times)
+
+    return median(f"import {module}") - median("pass")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        print(f"{module:<20} {import_time(module, args.repeat) * 1000:>8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Mutate a submission into the kinds of broken submissions a cohort hands in.
+
+Each mutation takes the source of a working submission and returns a broken
+variant of it. Mutations are located with the syntax tree of the source, but
+applied to its lines, so the rest of the submission is left untouched.
+"""
+
+import ast
+import random
+from typing import Callable
+
+Mutation = Callable[[str, random.Random], str]
+
+# Methods of the task 1 GUI of tests/dayz/dayz.py run by the cohort features,
+# so a mutation of them shows up when grading.
+HOT_METHODS = {
+    "BasicGraphicalInterface": ("draw", "_step", "_handle_keypress", "_move"),
+    "BasicMap": ("draw_entity",),
+    "InventoryView": ("draw",),
+}
+
+
+def _classes(tree: ast.Module) -> dict[str, ast.ClassDef]:
+    return {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+
+
+def _insert_in_method(source: str, rng: random.Random, statement: str) -> str:
+    """Inserts the statement at the start of a random hot method."""
+    classes = _classes(ast.parse(source))
+    methods = [
+        node
+        for name, wanted in HOT_METHODS.items()
+        if name in classes
+        for node in classes[name].body
+        if isinstance(node, ast.FunctionDef) and node.name in wanted
+    ]
+    method = rng.choice(methods)
+    first = method.body[0]
+
+    lines = source.splitlines(keepends=True)
+    indent = " " * first.col_offset
+    inserted = "".join(f"{indent}{line}\n" for line in statement.splitlines())
+    lines.insert(first.lineno - 1, inserted)
+    return "".join(lines)
+
+
+def original(source: str, rng: random.Random) -> str:
+    return source
+
+
+def broken_layout(source: str, rng: random.Random) -> str:
+    """Packs the title below the game, and some widgets on the wrong side."""
+    source = source.replace(").pack(fill=tk.X)", ").pack(side=tk.BOTTOM, fill=tk.X)")
+    parts = source.split("side=tk.LEFT")
+    return "".join(
+        part
+        + (rng.choice(["side=tk.TOP", "side=tk.LEFT"]) if i < len(parts) - 1 else "")
+        for i, part in enumerate(parts)
+    )
+
+
+def missing_class(source: str, rng: random.Random) -> str:
+    """Removes a random class."""
+    node = rng.choice(list(_classes(ast.parse(source)).values()))
+    lines = source.splitlines(keepends=True)
+    del lines[node.lineno - 1 : node.end_lineno]
+    return "".join(lines)
+
+
+def infinite_loop(source: str, rng: random.Random) -> str:
+    return _insert_in_method(source, rng, "while True:\n    pass")
+
+
+def slow_callback(source: str, rng: random.Random) -> str:
+    return _insert_in_method(
+        source, rng, f"__import__('time').sleep({rng.choice([0.05, 0.2, 0.5])})"
+    )
+
+
+def import_error(source: str, rng: random.Random) -> str:
+    """Imports a module which isn't installed, as submissions developed with it do."""
+    module = rng.choice(["numpy", "pygame", "a2_support", "end_of_dayz_support"])
+    return source.replace(
+        "import tkinter as tk\n", f"import tkinter as tk\nimport {module}\n", 1
+    )
+
+
+def syntax_error(source: str, rng: random.Random) -> str:
+    """Drops the colon from a random function definition."""
+    tree = ast.parse(source)
+    functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    function = rng.choice(functions)
+    lines = source.splitlines(keepends=True)
+    # the colon ends the last line of the signature, before the body
+    for line in range(function.body[0].lineno - 2, function.lineno - 2, -1):
+        if lines[line].rstrip().endswith(":"):
+            lines[line] = lines[line].rstrip()[:-1] + "\n"
+            break
+    return "".join(lines)
+
+
+MUTATIONS: dict[str, Mutation] = {
+    "original": original,
+    "broken_layout": broken_layout,
+    "missing_class": missing_class,
+    "infinite_loop": infinite_loop,
+    "slow_callback": slow_callback,
+    "import_error": import_error,
+    "syntax_error": syntax_error,
+}
@@ -1,20 +1,73 @@
+"""Perform automated testing of Tkinter GUI applications.
+
+The public names below are imported lazily, on first use, so that importing
+conscience (e.g. from a grading worker, or a step module only using `conscience.lib`)
+doesn't also import behave, PIL and the formatters until they are needed.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
 name = "conscience"
 
-from conscience.config import (
-    ConscienceConfiguration,
-    GradescopeConfiguration,
-    build_config,
-    setup_config,
-)
-from conscience.main import (
-    setup,
-    witness,
-    load_common_steps,
-)
-from conscience.score import (
-    GradescopeResults,
-    TestScore,
-    aggregate_results,
-    export_results,
-)
-from conscience.suite import ConscienceSuite
+# public name -> the module defining it
+_EXPORTS = {
+    "ConscienceConfiguration": "conscience.config",
+    "GradescopeConfiguration": "conscience.config",
+    "build_config": "conscience.config",
+    "setup_config": "conscience.config",
+    "setup": "conscience.main",
+    "witness": "conscience.main",
+    "load_common_steps": "conscience.main",
+    "GradedSubmission": "conscience.batch",
+    "witness_all": "conscience.batch",
+    "ResultCache": "conscience.cache",
+    "DisplayPool": "conscience.display",
+    "Profiler": "conscience.profiling",
+    "aggregate_profiles": "conscience.profiling",
+    "regrade": "conscience.regrading",
+    "GradescopeResults": "conscience.score",
+    "TestScore": "conscience.score",
+    "aggregate_results": "conscience.score",
+    "export_results": "conscience.score",
+    "ConscienceSuite": "conscience.suite",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(attribute: str):
+    module = _EXPORTS.get(attribute)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
+
+    value = getattr(importlib.import_module(module), attribute)
+    # later lookups find the name directly, without calling __getattr__ again
+    globals()[attribute] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from conscience.batch import GradedSubmission, witness_all
+    from conscience.cache import ResultCache
+    from conscience.config import (
+        ConscienceConfiguration,
+        GradescopeConfiguration,
+        build_config,
+        setup_config,
+    )
+    from conscience.display import DisplayPool
+    from conscience.main import load_common_steps, setup, witness
+    from conscience.profiling import Profiler, aggregate_profiles
+    from conscience.regrading import regrade
+    from conscience.score import (
+        GradescopeResults,
+        TestScore,
+        aggregate_results,
+        export_results,
+    )
+    from conscience.suite import ConscienceSuite
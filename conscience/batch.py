@@ -0,0 +1,166 @@
+"""Grade many submissions in parallel.
+
+`conscience.main.witness` can only grade a single target per process, as it
+changes the working directory, monkeypatches tkinter and loads the target as the
+`under_test` module. This module fans a list of submissions out over a pool of
+worker processes, each of which runs `witness` on one submission at a time.
+Each worker may be given a display of its own by a `conscience.display.DisplayPool`.
+"""
+
+import os
+import resource
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from conscience.config import ConscienceConfiguration
+from conscience.display import DisplayPool, lease_display, wait_for_display
+from conscience.features import FeatureCache
+from conscience.main import witness
+from conscience.profiling import ScenarioProfile
+from conscience.score import GradescopeResults, error_results
+
+ConfigFactory = Callable[[], ConscienceConfiguration]
+"""A callable which builds a fully setup configuration (see `conscience.config.setup_config`)"""
+
+
+class GradedSubmission(NamedTuple):
+    """The results of grading a single submission within a batch"""
+
+    target: Path
+    results: GradescopeResults
+    elapsed: float
+    """Wall clock time in seconds spent grading the submission"""
+    profile: Optional[list[ScenarioProfile]] = None
+    """The report of the configuration's profiler, if it had one (see `conscience.profiling`)"""
+    worker: Optional[int] = None
+    """The process id of the worker which graded the submission"""
+    peak_rss: Optional[int] = None
+    """The peak resident memory of the worker so far, in kilobytes"""
+
+
+# State held by each worker process, populated by `_init_worker`.
+_factory: Optional[ConfigFactory] = None
+_home: Optional[str] = None
+_features: Optional[FeatureCache] = None
+_display: Optional[str] = None
+
+
+def _init_worker(factory: ConfigFactory, features: FeatureCache, displays=None):
+    global _factory, _home, _features, _display
+    _factory = factory
+    _home = os.getcwd()
+    _features = features
+    if displays is not None:
+        _display = lease_display(displays)
+
+
+def _peak_rss() -> int:
+    # kilobytes on Linux, but bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _grade(target: Path) -> GradedSubmission:
+    assert _factory is not None and _home is not None, "worker not initialised"
+
+    # witness chdirs into the working directory, which is relative to where we started,
+    # and then resolves the target relative to it.
+    os.chdir(_home)
+    start = time.perf_counter()
+    if _display is not None and not wait_for_display(_display):
+        return GradedSubmission(
+            target,
+            error_results(f"display {_display} is not accepting connections"),
+            time.perf_counter() - start,
+        )
+
+    profile = None
+    try:
+        config = _factory()
+        if config.feature_cache is None:
+            config.feature_cache = _features
+        results = witness(config, target)
+        if config.profiler is not None:
+            profile = config.profiler.report()
+    except BaseException:
+        # including a submission calling sys.exit, which would otherwise end the worker
+        results = error_results(traceback.format_exc())
+
+    return GradedSubmission(
+        target,
+        results,
+        time.perf_counter() - start,
+        profile,
+        os.getpid(),
+        _peak_rss(),
+    )
+
+
+def witness_all(
+    factory: ConfigFactory,
+    targets: Iterable[Path],
+    workers: Optional[int] = None,
+    submissions_per_worker: Optional[int] = 20,
+    start_method: Optional[str] = None,
+    feature_cache: Optional[FeatureCache] = None,
+    displays: Optional[DisplayPool] = None,
+) -> Iterator[GradedSubmission]:
+    """Tests many target assessment files over a pool of worker processes.
+
+    Parameters:
+        factory: Builds the configuration to grade each submission with. A fresh
+            configuration is built for every submission. When using the "spawn"
+            start method this must be picklable (i.e. a module level function).
+        targets: The target files to run the tests on.
+        workers: The number of worker processes, defaults to the number of cores.
+        submissions_per_worker: The number of submissions a worker grades before
+            it is replaced by a fresh process, undoing any monkeypatching left behind.
+            If None, workers live for the whole batch.
+        start_method: The multiprocessing start method to use, see `multiprocessing.get_context`.
+            Defaults to "spawn" when workers are replaced, as they can't be after a "fork".
+        feature_cache: The parsed features to start every worker with, used by any
+            configuration without a cache of its own. If None, the features are parsed
+            once here, before any worker starts.
+        displays: A started pool of displays to share between the workers. Each
+            worker is given a display of its own for its lifetime, so there should be
+            at least as many displays as workers.
+
+    Returns:
+        A stream of graded submissions, in the order in which they finish.
+
+    Raises:
+        concurrent.futures.process.BrokenProcessPool: If a worker died while grading,
+            e.g. because a submission crashed the interpreter.
+    """
+    if feature_cache is None:
+        feature_cache = FeatureCache()
+        feature_cache.prime(factory())
+
+    if start_method is None and submissions_per_worker is not None:
+        start_method = "spawn"
+    context = get_context(start_method)
+    leases = None
+    if displays is not None:
+        leases = context.Queue()
+        for name in displays.names:
+            leases.put(name)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(factory, feature_cache, leases),
+        max_tasks_per_child=submissions_per_worker,
+    ) as executor:
+        futures = [executor.submit(_grade, target) for target in targets]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,174 @@
+"""Enforce wall clock and CPU time budgets on scenarios and their steps.
+
+Budgets are set with scenario tags, in the same way as weights are:
+
+    @timeout(10)      the scenario's steps may take 10 seconds of wall clock time in total
+    @cpu(5)           the scenario's steps may use 5 seconds of CPU time in total
+    @stepTimeout(2)   each step may take 2 seconds of wall clock time
+
+Scenarios without tags fall back to the `scenario_timeout`, `scenario_cpu` and
+`step_timeout` of the configuration, where None means unlimited.
+
+A step which exceeds a budget is interrupted by an interval timer, and fails with a
+`BudgetFailure`, so its scenario fails and grading moves on to the next one.
+The timer only interrupts the code of steps (see `BudgetEnforcer.running`), never
+behave's own. Interval timers are only available on Unix, from the main thread.
+"""
+
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from behave.model import Scenario
+from loguru import logger
+
+from conscience.formatters import parse_tag_value
+
+# How long to wait before interrupting a step again, once it has exceeded its budget,
+# in case the student's code swallowed the first interruption.
+REPEAT_INTERVAL = 0.1
+
+
+class BudgetExceeded(BaseException):
+    """Raised within a step which has exceeded its time budget.
+
+    Like KeyboardInterrupt, it isn't an Exception, so that submissions catching
+    Exception don't swallow it. `BudgetEnforcer.running` turns it into a
+    `BudgetFailure` once it leaves the step.
+    """
+
+
+class BudgetFailure(AssertionError):
+    """The failed assertion of a step which exceeded its time budget."""
+
+
+def _supported() -> bool:
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+class BudgetEnforcer:
+    """Arms interval timers for the duration of each step of a scenario with a budget."""
+
+    def __init__(self, config):
+        self.config = config
+        self._warned = False
+        self._active = False
+        # how many steps are running within each other, see `running`
+        self._running = 0
+        self.reset()
+
+    def reset(self):
+        self.timeout: Optional[float] = None
+        self.cpu: Optional[float] = None
+        self.step_timeout: Optional[float] = None
+        self._elapsed = 0.0
+        self._cpu_used = 0.0
+
+    def before_scenario(self, scenario: Scenario):
+        self.reset()
+        config = self.config
+        self.timeout = parse_tag_value(
+            scenario, "timeout", getattr(config, "scenario_timeout", None)
+        )
+        self.cpu = parse_tag_value(
+            scenario, "cpu", getattr(config, "scenario_cpu", None)
+        )
+        self.step_timeout = parse_tag_value(
+            scenario, "stepTimeout", getattr(config, "step_timeout", None)
+        )
+
+        self._active = any(
+            budget is not None for budget in (self.timeout, self.cpu, self.step_timeout)
+        )
+        if self._active and not _supported():
+            if not self._warned:
+                logger.warning(
+                    "time budgets require signal.setitimer on the main thread"
+                )
+                self._warned = True
+            self._active = False
+
+    def _wall_budget(self) -> Optional[tuple[float, str]]:
+        """Returns the wall clock time the next step may take, and what limits it."""
+        budgets = []
+        if self.timeout is not None:
+            remaining = self.timeout - self._elapsed
+            budgets.append(
+                (remaining, f"scenario exceeded its time budget of {self.timeout}s")
+            )
+        if self.step_timeout is not None:
+            budgets.append(
+                (
+                    self.step_timeout,
+                    f"step exceeded its time budget of {self.step_timeout}s",
+                )
+            )
+        return min(budgets, default=None)
+
+    def before_step(self):
+        if not self._active:
+            return
+
+        self._step_start = time.perf_counter()
+        self._step_cpu_start = time.process_time()
+
+        wall = self._wall_budget()
+        if wall is not None:
+            remaining, message = wall
+            self._previous_alarm = signal.signal(
+                signal.SIGALRM, self._interrupt(signal.ITIMER_REAL, message)
+            )
+            signal.setitimer(signal.ITIMER_REAL, max(remaining, 1e-3))
+
+        if self.cpu is not None:
+            message = f"scenario exceeded its CPU budget of {self.cpu}s"
+            self._previous_prof = signal.signal(
+                signal.SIGPROF, self._interrupt(signal.ITIMER_PROF, message)
+            )
+            remaining = self.cpu - self._cpu_used
+            signal.setitimer(signal.ITIMER_PROF, max(remaining, 1e-3))
+
+    def after_step(self):
+        if not self._active:
+            return
+
+        if self._wall_budget() is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_alarm)
+
+        if self.cpu is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_prof)
+
+        self._elapsed += time.perf_counter() - self._step_start
+        self._cpu_used += time.process_time() - self._step_cpu_start
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        """Runs the code of a step, which may be interrupted once it exceeds its budget.
+
+        Raises:
+            BudgetFailure: If the step exceeded its budget, so that behave fails it.
+        """
+        self._running += 1
+        try:
+            yield
+        except BudgetExceeded as e:
+            raise BudgetFailure(*e.args) from None
+        finally:
+            self._running -= 1
+
+    def _interrupt(self, timer: int, message: str):
+        def handler(signum, frame):
+            # the timer fires once, and is only armed again for as long as the step
+            # keeps running, so it never goes off within behave once the step has failed
+            signal.setitimer(timer, REPEAT_INTERVAL)
+            if self._running:
+                raise BudgetExceeded(message)
+
+        return handler
@@ -0,0 +1,319 @@
+"""Cache grading results on disk.
+
+Students often resubmit identical files, and cohorts are regraded when only part of
+the test suite has changed. A `ResultCache` stores the results of each grading, keyed
+by a hash of everything which could change them:
+
+    - the target file and the files alongside it that it uses (modules, images, ...),
+    - the feature files, step modules and environment files of the test paths,
+    - the conscience package itself, which holds the common steps and lobes,
+    - the lobes enabled on the suite (and the modules they are defined in),
+    - the overwrites and seed of the suite,
+    - the type of configuration, which decides the format of the results,
+    - the student's metadata and categories, which adjust the weights of tests.
+
+Results are not stored if the target failed to load, the hooks of a scenario failed,
+or a step exceeded its time or CPU budget (see `conscience.budget`), as these are often
+caused by the grading environment (e.g. a missing display, a killed worker or a busy
+machine) rather than by the submission.
+
+To use it, set the `result_cache` of a configuration before calling `witness`.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from conscience.score import GradescopeResults
+
+# Bumped whenever the format of the key or stored results changes.
+CACHE_VERSION = 3
+
+# Directories never worth hashing when looking for sibling assets.
+IGNORED_DIRECTORIES = {"__pycache__", ".git", ".venv", "venv", "node_modules"}
+
+# path -> (modification time, size, digest), shared by every cache in this process.
+_file_digests: dict[str, tuple[int, int, str]] = {}
+
+# path -> (digest, modules imported, strings), for the sources of submissions.
+_file_references: dict[str, tuple[str, list[str], list[str]]] = {}
+
+
+def file_digest(path: Path) -> str:
+    """Returns the sha256 of the file's contents, only re-reading changed files."""
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    entry = _file_digests.get(key)
+    if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+        with open(key, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        entry = (stat.st_mtime_ns, stat.st_size, digest)
+        _file_digests[key] = entry
+
+    return entry[2]
+
+
+def _walk(directory: Path, suffixes: Optional[set[str]] = None) -> Iterable[Path]:
+    """Yields every file below the directory in a stable order."""
+    for root, directories, files in os.walk(directory):
+        directories[:] = sorted(
+            name
+            for name in directories
+            if name not in IGNORED_DIRECTORIES and not name.startswith(".")
+        )
+        for name in sorted(files):
+            path = Path(root, name)
+            if suffixes is None or path.suffix in suffixes:
+                yield path
+
+
+def _references(path: Path) -> tuple[list[str], list[str]]:
+    """Returns the top level modules imported by the source file, and the strings in it,
+    only re-parsing changed files.
+    """
+    key = os.path.abspath(path)
+    digest = file_digest(path)
+
+    entry = _file_references.get(key)
+    if entry is None or entry[0] != digest:
+        modules, strings = [], []
+        try:
+            tree = ast.parse(Path(key).read_bytes())
+        except (SyntaxError, ValueError):
+            tree = ast.Module(body=[], type_ignores=[])
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.append(node.module.split(".")[0])
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                strings.append(node.value)
+        entry = (digest, modules, strings)
+        _file_references[key] = entry
+
+    return entry[1], entry[2]
+
+
+def _named_files(directory: Path, name: str) -> list[Path]:
+    """Returns the file, or the files below the directory, which the name refers to
+    relative to the directory, if it is within it.
+    """
+    if not name or len(name) > 255 or "\0" in name or "\n" in name:
+        return []
+
+    path = directory / name
+    try:
+        resolved = path.resolve()
+        if resolved == directory or not resolved.is_relative_to(directory):
+            return []
+        if resolved.is_file():
+            return [resolved]
+        if resolved.is_dir() and resolved.name not in IGNORED_DIRECTORIES:
+            return list(_walk(resolved))
+    except OSError:
+        pass
+    return []
+
+
+def _used_files(target: Path) -> list[Path]:
+    """Returns the target, and the files in its directory it may use: the local
+    modules it imports (and those they import), and any file or directory named by a
+    string in their source, such as "images/player.png" or "images".
+    """
+    directory = Path(target).resolve().parent
+    found: set[Path] = set()
+    pending = [Path(target).resolve()]
+    while pending:
+        path = pending.pop()
+        if path in found or not path.is_file():
+            continue
+        found.add(path)
+        if path.suffix != ".py":
+            continue
+
+        modules, strings = _references(path)
+        for module in modules:
+            pending.extend(_named_files(directory, f"{module}.py"))
+            if (directory / module / "__init__.py").is_file():
+                pending.extend(_named_files(directory, module))
+        for string in strings:
+            pending.extend(_named_files(directory, string))
+
+    return sorted(found)
+
+
+def _hash_files(hasher, paths: Iterable[Path], relative_to: Path):
+    for path in paths:
+        hasher.update(path.relative_to(relative_to).as_posix().encode("utf8"))
+        hasher.update(file_digest(path).encode("ascii"))
+
+
+def _stable_repr(value: Any) -> str:
+    """A representation of the value that doesn't change between processes."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_stable_repr(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort()
+        return f"[{', '.join(items)}]"
+    if isinstance(value, dict):
+        items = sorted(
+            f"{_stable_repr(k)}: {_stable_repr(v)}" for k, v in value.items()
+        )
+        return f"{{{', '.join(items)}}}"
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+def cacheable(results: GradescopeResults) -> bool:
+    """Whether the results were decided by the submission, rather than by the target
+    failing to load, the hooks of a scenario failing or a step running out of time.
+    """
+    tests = results.get("tests")
+    if tests is None:
+        return False
+    return not any(
+        test.get("extra_data", {}).get("hook_failed")
+        or test.get("extra_data", {}).get("over_budget")
+        for test in tests
+    )
+
+
+class ResultCache:
+    """Grading results stored in a directory, keyed by submission and test suite."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def submission_fingerprint(self, target: Path) -> str:
+        """Hashes the target and the files alongside it that it uses, so that other
+        submissions in the same directory don't change it.
+
+        Files are found from the source alone: local modules the target imports, and
+        files or directories named by its strings. An asset whose path is built up at
+        runtime is only included if a string names the directory holding it.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(Path(target).name.encode("utf8"))
+        directory = Path(target).resolve().parent
+        _hash_files(hasher, _used_files(target), directory)
+        return hasher.hexdigest()
+
+    def suite_fingerprint(self, config) -> str:
+        """Hashes everything the configuration tests submissions with.
+
+        Parameters:
+            config: A ConscienceConfiguration, already setup (see `conscience.config.setup_config`).
+        """
+        suite = config.suite
+        lobes = suite._lobes if suite else []
+        identity = _stable_repr(
+            [
+                type(config),
+                list(config.paths),
+                config.steps_dir,
+                config.environment_file,
+                getattr(config, "streaming", False),
+                getattr(config, "execute_target", True),
+                os.path.abspath("."),
+                suite.seed if suite else None,
+                suite._overwrites if suite else None,
+                [(type(lobe), vars(lobe)) for lobe in lobes],
+            ]
+        )
+
+        hasher = hashlib.sha256()
+        hasher.update(f"{CACHE_VERSION}:{identity}".encode("utf8"))
+
+        # feature files, step modules and environment files
+        for path in map(Path, config.paths):
+            _hash_files(hasher, _walk(path, {".feature", ".py"}), path)
+
+            # both may be outside of the path, e.g. "../steps"
+            steps = (path / config.steps_dir).resolve()
+            if steps.is_dir() and not steps.is_relative_to(path.resolve()):
+                _hash_files(hasher, _walk(steps, {".py"}), steps)
+            environment = path / config.environment_file
+            if environment.is_file():
+                hasher.update(file_digest(environment).encode("ascii"))
+
+        # common steps and the built in lobes
+        package = Path(__file__).parent
+        _hash_files(hasher, _walk(package, {".py"}), package)
+
+        # lobes defined outside of conscience
+        for lobe in lobes:
+            source = inspect.getsourcefile(type(lobe))
+            if source and not Path(source).is_relative_to(package):
+                hasher.update(file_digest(Path(source)).encode("ascii"))
+
+        return hasher.hexdigest()
+
+    def metadata_fingerprint(self, config) -> str:
+        """Hashes the student's metadata and categories, which decide whether tests
+        have their postgrad weights.
+        """
+        hasher = hashlib.sha256()
+        for path in (
+            getattr(config, "student_metadata", None),
+            getattr(config, "student_categories", None),
+        ):
+            digest = file_digest(Path(path)) if path is not None else "-"
+            hasher.update(digest.encode("ascii"))
+        return hasher.hexdigest()
+
+    def key(self, config, target: Path) -> str:
+        """Returns the key for grading the target with the configuration.
+        Paths are relative to the current working directory.
+        """
+        suite = self.suite_fingerprint(config)
+        submission = self.submission_fingerprint(target)
+        metadata = self.metadata_fingerprint(config)
+        return hashlib.sha256(
+            f"{suite}:{submission}:{metadata}".encode("ascii")
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[GradescopeResults]:
+        """Returns the stored results for the key, if there are any."""
+        try:
+            with open(self._path(key), "r", encoding="utf8") as f:
+                results = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return results
+
+    def put(self, key: str, results: GradescopeResults):
+        """Stores the results for the key, unless they aren't worth keeping (see
+        `cacheable`). Safe to call from many processes at once.
+        """
+        if not cacheable(results):
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write then rename, so readers never see a partially written file
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump(results, f, ensure_ascii=False)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
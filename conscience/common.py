@@ -5,7 +5,13 @@ import tkinter as tk
 
 from behave.runner import Context
 
-from conscience.lib.identify import WidgetSelector, CanvasSelector, find_widgets
+from conscience.lib.identify import (
+    WidgetIndex,
+    WidgetSelector,
+    CanvasSelector,
+    find_widgets,
+    invalidate_widget_index,
+)
 from conscience.parsers import RelativePosition, register_parsers
 from conscience.lobes.keyboard import press, Events
 
@@ -28,7 +34,7 @@ def window_title(context: Context, title: str):
 @then('I see text displaying, roughly, "{text:Text}"')
 def rough_text(context: Context, text: str):
     search_for = text.lower().strip()
-    widgets = find_widgets(WidgetSelector.by_rough_text(search_for), context.window)
+    widgets = WidgetIndex.of(context.window).by_rough_text(search_for)
     assert (
         len(widgets) == 1
     ), f'cannot find exactly one widget roughly matching the text "{text}", found {widgets}'
@@ -37,7 +43,7 @@ def rough_text(context: Context, text: str):
 
 @then("I see text displaying, exactly, {text:Text}")
 def exact_text(context: Context, text: str):
-    widgets = find_widgets(WidgetSelector.by_text(text), context.window)
+    widgets = WidgetIndex.of(context.window).by_text(text)
     assert (
         len(widgets) == 1
     ), f'cannot find exactly one widget exactly matching the text "{text}", found {widgets}'
@@ -46,30 +52,35 @@ def exact_text(context: Context, text: str):
 
 @then("it is {position:RelativePosition} all other widgets")
 def relative_to_all(context: Context, position: RelativePosition):
-    widgets = find_widgets(WidgetSelector.all(), context.window)
+    geometry = WidgetIndex.of(context.window).geometry
     it: tk.Widget = context.last
-    last_x, last_y = it.winfo_x(), it.winfo_y()
 
-    for widget in widgets:
-        x, y = widget.winfo_x(), widget.winfo_y()
-        if position == RelativePosition.Left:
-            assert last_x <= x, f"{widget} is further left than {it}"
-        elif position == RelativePosition.Right:
-            assert last_x >= x, f"{widget} is further right than {it}"
-        elif position == RelativePosition.Above:
-            assert last_y <= y, f"{widget} is above {it}"
-        elif position == RelativePosition.Below:
-            assert last_y >= y, f"{widget} is below {it}"
+    if position == RelativePosition.Left:
+        offenders, message = geometry.left_of(it), "is further left than"
+    elif position == RelativePosition.Right:
+        offenders, message = geometry.right_of(it), "is further right than"
+    elif position == RelativePosition.Above:
+        offenders, message = geometry.above(it), "is above"
+    else:
+        offenders, message = geometry.below(it), "is below"
+
+    assert len(offenders) == 0, f"{offenders[0]} {message} {it}"
+
+
+def widget_size(widget: tk.Widget) -> tuple[int, int]:
+    """Returns the width and height of the widget, from the latest widget index if possible."""
+    geometry = WidgetIndex.of(widget).geometry
+    return geometry.size(widget)
 
 
 def assert_widget_height(widget: tk.Widget, pixels: int, tolerance: int = 0) -> None:
-    height = widget.winfo_height()
+    _, height = widget_size(widget)
     error = abs(height - int(pixels))
     assert error <= tolerance, f"Widget height is {height} pixels, not {pixels} pixels."
 
 
 def assert_widget_width(widget: tk.Widget, pixels: int, tolerance: int = 0) -> None:
-    width = widget.winfo_width()
+    width, _ = widget_size(widget)
     error = abs(width - int(pixels))
     assert error <= tolerance, f"Widget width is {width} pixels, not {pixels} pixels."
 
@@ -85,13 +96,13 @@ def last_height(context: Context, pixels: int) -> None:
 
 
 def assert_single_widget_of_class(context: Context, clazz: str):
-    widgets = find_widgets(WidgetSelector.by_class_name(clazz), context.window)
+    widgets = WidgetIndex.of(context.window).by_class_name(clazz)
     assert len(widgets) != 0, f"No widget of class {clazz} found in GUI"
     assert len(widgets) == 1, f"More than one widget of class {clazz} found in GUI"
 
 
 def get_first_widget_of_class(context: Context, clazz: str) -> tk.Widget:
-    widgets = find_widgets(WidgetSelector.by_class_name(clazz), context.window)
+    widgets = WidgetIndex.of(context.window).by_class_name(clazz)
     return widgets[0]
 
 
@@ -108,7 +119,7 @@ def single_an_class_packed(context: Context, clazz: str):
 
 @then("{count:d} {clazz} instances should be packed within the GUI")
 def multiple_classes_packed(context: Context, count: int, clazz: str):
-    widgets = find_widgets(WidgetSelector.by_class_name(clazz), context.window)
+    widgets = WidgetIndex.of(context.window).by_class_name(clazz)
     assert (
         len(widgets) == count
     ), f"Expected {count} {clazz} instances, but found {len(widgets)}"
@@ -125,7 +136,7 @@ def widget_background_color(context: Context, clazz: str, color: str):
 @then("the {clazz} should have {count:d} text items")
 def widget_text_count(context: Context, clazz: str, count: int):
     widget = get_first_widget_of_class(context, clazz)
-    children = find_widgets(WidgetSelector.by_class_name(clazz), widget)
+    children = WidgetIndex.of(widget).by_class_name(clazz, within=widget)
     text_count = sum(1 for item in children if widget.winfo_name() == "text")
     assert text_count == count, f"Widget has {text_count} text items, expected {count}"
 
@@ -143,7 +154,7 @@ def widget_text_count(context: Context, clazz: str, count: int):
 def when_i_press_n(context: Context, key: str, count: int):
     key = key.strip()
     for _ in range(count):
-        event = getattr(Events, key.upper())
+        event = Events[key.upper()].value
         press(context, event)
 
 
@@ -153,13 +164,15 @@ def repeat_key_sequence(context: Context, sequence: str, count: int):
 
     for _ in range(count):
         for move in moves:
-            event = getattr(Events, move.upper())
+            event = Events[move.upper()].value
             press(context, event)
             context.after.step(2000)
             context.window.update()
+            invalidate_widget_index()
 
 
 def click(widget: tk.Widget, button=1):
     widget.event_generate(
         f"<ButtonPress-{button}>", x=widget.winfo_x(), y=widget.winfo_y()
     )
+    invalidate_widget_index()
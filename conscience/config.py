@@ -2,18 +2,23 @@ import traceback
 from io import BytesIO
 from pathlib import Path
 from types import ModuleType
-from typing import NoReturn, Optional, TypedDict, override
+from typing import BinaryIO, Callable, NoReturn, Optional, TypedDict, override
 
 import importlib.util
 from behave.__main__ import Configuration
 from behave.formatter.base import Formatter, StreamOpener
+from behave.model import Feature, Scenario
 from loguru import logger
 
+from conscience.cache import ResultCache
+from conscience.features import FeatureCache
 from conscience.formatters import GradescopeFormatter
+from conscience.profiling import Profiler
 from conscience.score import (
     EMPTY_SCORE,
     GradescopeResults,
     error_results,
+    read_results_from_ndjson,
     read_results_from_stream,
 )
 from conscience.suite import ConscienceSuite
@@ -49,11 +54,28 @@ class ConscienceConfiguration(Configuration):
         self.suite: Optional[ConscienceSuite] = None
         self.paths: list[str] = []
         self.under_test: Optional[ModuleType] = None
+        self.target: Optional[Path] = None
+        # False to only record the target, for suites which only check its design statically
+        self.execute_target = True
         self.more_formatters: Optional[dict[str, type[Formatter]]] = None
         self.working_directory: Optional[Path] = None
+        self.features: Optional[list[Feature]] = None
+        self.feature_cache: Optional[FeatureCache] = None
+        self.result_cache: Optional[ResultCache] = None
+        # decides which scenarios to run, see `conscience.regrading`
+        self.scenario_filter: Optional[Callable[[Scenario], bool]] = None
+        # default budgets in seconds for scenarios without budget tags, see `conscience.budget`
+        self.scenario_timeout: Optional[float] = None
+        self.scenario_cpu: Optional[float] = None
+        self.step_timeout: Optional[float] = None
+        # records the cost of each step when set, see `conscience.profiling`
+        self.profiler: Optional[Profiler] = None
 
     def load_target(self, target: Path):
-        self.under_test = load_under_test(target)
+        self.target = target
+        self.under_test = None
+        if self.execute_target:
+            self.under_test = load_under_test(target)
 
     def load_metadata(self, metadata: GradeScopeMetadata):
         pass
@@ -73,16 +95,30 @@ class GradescopeConfiguration(ConscienceConfiguration):
         super().__init__(command_args, load_config, verbose, **kwargs)
         self.student_categories: Optional[str] = None
         self.student_metadata: Optional[str] = None
+        self.streaming = False
+        self.results_path: Optional[Path] = None
+        self.output_stream: Optional[BinaryIO] = None
         self.default_format = "gradescope"
         self.more_formatters = {"gradescope": GradescopeFormatter}
 
+    def _close_output(self):
+        # the results of the previous target, left open if it failed to load
+        if self.output_stream is not None:
+            self.output_stream.close()
+
     @override
     def reset_outputs(self):
         logger.debug("Setting up output stream")
-        self.output_stream = BytesIO()
+        self._close_output()
+        if self.results_path is not None:
+            # results written to disk survive the grading process being killed
+            self.output_stream = open(self.results_path, "w+b")
+        else:
+            self.output_stream = BytesIO()
         self.outputs = [StreamOpener(stream=self.output_stream)]
 
     def handle_load_failure(self, e: Exception):
+        self._close_output()
         return error_results(traceback.format_exc())
 
     @override
@@ -92,17 +128,34 @@ class GradescopeConfiguration(ConscienceConfiguration):
 
     @override
     def read_results(self) -> GradescopeResults:
-        return read_results_from_stream(self.output_stream)
+        if self.streaming:
+            results = read_results_from_ndjson(self.output_stream)
+        else:
+            results = read_results_from_stream(self.output_stream)
+
+        if self.results_path is not None:
+            self._close_output()
+        return results
 
 
 def build_config(
     is_gradescope: bool = False,
+    streaming: bool = False,
 ) -> ConscienceConfiguration:
-    """Factory to build a config with the appropriate arguments for its type."""
+    """Factory to build a config with the appropriate arguments for its type.
+
+    Parameters:
+        is_gradescope: Whether to build a GradescopeConfiguration.
+        streaming: Whether a GradescopeConfiguration should write each test's results
+            as soon as they are finished, see `conscience.formatters.GradescopeFormatter`.
+    """
     extra_args = [] if not is_gradescope else ["--no-summary"]
     command_args = ["--no-source", "--no-timings"] + extra_args
     clz = GradescopeConfiguration if is_gradescope else ConscienceConfiguration
-    return clz(command_args=command_args)
+    config = clz(command_args=command_args)
+    if isinstance(config, GradescopeConfiguration):
+        config.streaming = streaming
+    return config
 
 
 def setup_config(
@@ -0,0 +1,269 @@
+"""Headless X displays for grading in parallel.
+
+`ConscienceSuite.start` opens a real Tk window, so every grading process needs an X
+display, and processes sharing a display are serialised by its X server. A
+`DisplayPool` runs a set of Xvfb servers, restarts any which crash, and hands one to
+each worker of `conscience.batch.witness_all`:
+
+    with DisplayPool(4) as displays:
+        for graded in witness_all(factory, targets, workers=4, displays=displays):
+            ...
+
+Requires the `Xvfb` executable (e.g. the `xvfb` package on Debian/Ubuntu).
+"""
+
+import multiprocessing.util
+import os
+import queue
+import selectors
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+X11_SOCKETS = Path("/tmp/.X11-unix")
+
+
+class DisplayError(RuntimeError):
+    """Raised when an X display can't be started"""
+
+
+def display_ready(name: str) -> bool:
+    """Returns whether the X server of the display (e.g. ":99") accepts connections."""
+    number = name.lstrip(":").split(".")[0]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(X11_SOCKETS / f"X{number}"))
+        except OSError:
+            return False
+    return True
+
+
+def _in_use(number: int) -> bool:
+    return (
+        Path(f"/tmp/.X{number}-lock").exists() or (X11_SOCKETS / f"X{number}").exists()
+    )
+
+
+class Display:
+    """A single Xvfb server"""
+
+    def __init__(self, number: int, xvfb: str = "Xvfb", screen: str = "1280x1024x24"):
+        self.number = number
+        self.xvfb = xvfb
+        self.screen = screen
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+
+    @property
+    def name(self) -> str:
+        return f":{self.number}"
+
+    def start(self, timeout: float = 10.0):
+        """Starts the server, returning once it accepts connections.
+
+        Raises:
+            DisplayError: If the server exits, or isn't ready within the timeout.
+        """
+        # Xvfb writes the display number to this pipe once it is ready
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [
+                    self.xvfb,
+                    self.name,
+                    "-screen",
+                    "0",
+                    self.screen,
+                    "-nolisten",
+                    "tcp",
+                    "-displayfd",
+                    str(write_fd),
+                ],
+                pass_fds=(write_fd,),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        finally:
+            os.close(write_fd)
+
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(read_fd, selectors.EVENT_READ)
+                ready = selector.select(timeout) and os.read(read_fd, 64).strip()
+        finally:
+            os.close(read_fd)
+
+        if not ready:
+            self.stop()
+            raise DisplayError(f"Xvfb failed to start display {self.name}")
+
+    def healthy(self) -> bool:
+        return (
+            self.process is not None
+            and self.process.poll() is None
+            and display_ready(self.name)
+        )
+
+    def restart(self, timeout: float = 10.0):
+        self.stop()
+        self.restarts += 1
+        self.start(timeout)
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        self.process.terminate()
+        try:
+            self.process.wait(5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class DisplayPool:
+    """A set of Xvfb servers, kept running by a background health check."""
+
+    def __init__(
+        self,
+        size: int,
+        xvfb: str = "Xvfb",
+        screen: str = "1280x1024x24",
+        first_display: int = 99,
+        start_timeout: float = 10.0,
+        check_interval: Optional[float] = 1.0,
+    ):
+        """
+        Parameters:
+            size: The number of displays to run, usually the number of workers.
+            xvfb: The Xvfb executable.
+            screen: The geometry and depth of each display's screen.
+            first_display: The lowest display number to use. Numbers already taken
+                by another X server are skipped.
+            start_timeout: How long in seconds to wait for each server to start.
+            check_interval: How often in seconds to check for, and restart, crashed
+                servers. If None, only `check` restarts them.
+        """
+        if shutil.which(xvfb) is None:
+            raise DisplayError(f"{xvfb} was not found, is Xvfb installed?")
+
+        self.size = size
+        self.xvfb = xvfb
+        self.screen = screen
+        self.first_display = first_display
+        self.start_timeout = start_timeout
+        self.check_interval = check_interval
+        self.displays: list[Display] = []
+
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the displays, suitable for the DISPLAY environment variable."""
+        return [display.name for display in self.displays]
+
+    def _launch(self, number: int) -> Display:
+        # another X server may claim a free number before us, so try a few
+        for candidate in range(number, number + 100):
+            if _in_use(candidate):
+                continue
+            display = Display(candidate, self.xvfb, self.screen)
+            try:
+                display.start(self.start_timeout)
+            except DisplayError:
+                continue
+            return display
+
+        raise DisplayError(f"no free display from :{number}")
+
+    def start(self):
+        """Starts every display, and the health check."""
+        number = self.first_display
+        for _ in range(self.size):
+            display = self._launch(number)
+            self.displays.append(display)
+            number = display.number + 1
+
+        if self.check_interval is not None:
+            self._monitor = threading.Thread(target=self._watch, daemon=True)
+            self._monitor.start()
+
+    def check(self) -> int:
+        """Restarts any display which has crashed, or stopped accepting connections.
+
+        Returns:
+            The number of displays restarted.
+        """
+        restarted = 0
+        with self._lock:
+            for display in self.displays:
+                if self._closed.is_set() or display.healthy():
+                    continue
+                logger.warning(f"restarting crashed display {display.name}")
+                display.restart(self.start_timeout)
+                restarted += 1
+        return restarted
+
+    def _watch(self):
+        assert self.check_interval is not None
+        while not self._closed.wait(self.check_interval):
+            try:
+                self.check()
+            except DisplayError as e:
+                logger.error(e)
+
+    def close(self):
+        """Stops the health check and every display."""
+        self._closed.set()
+        if self._monitor is not None:
+            self._monitor.join()
+        with self._lock:
+            for display in self.displays:
+                display.stop()
+
+    def __enter__(self) -> "DisplayPool":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def lease_display(displays: "queue.Queue[str]", timeout: float = 10.0) -> Optional[str]:
+    """Takes a display from the queue for the rest of this process' life, and points
+    DISPLAY at it. The display is put back on the queue when the process exits.
+
+    Returns:
+        The name of the display, or None if none became free within the timeout.
+    """
+    try:
+        name = displays.get(timeout=timeout)
+    except queue.Empty:
+        # a worker which crashed never returned its display
+        logger.warning("no free display, sharing the current DISPLAY")
+        return None
+
+    os.environ["DISPLAY"] = name
+    multiprocessing.util.Finalize(None, displays.put, args=(name,), exitpriority=10)
+    return name
+
+
+def wait_for_display(name: str, timeout: float = 10.0) -> bool:
+    """Waits for the display to accept connections, e.g. while it is being restarted."""
+    deadline = time.monotonic() + timeout
+    while not display_ready(name):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
@@ -0,0 +1,100 @@
+"""Cache parsed feature files across submissions.
+
+The feature files are identical for every submission in a cohort, so rather than
+have behave re-parse them for each student, parse each file once and hand out fresh
+copies of the parsed model. Running a feature mutates its model (statuses, captured
+output, ...), which is why copies are handed out rather than the parsed features.
+"""
+
+import os
+import pickle
+from pathlib import Path
+from typing import Iterable, Optional
+
+from behave.model import Feature
+from behave.model_core import FileLocation
+from behave.parser import parse_file
+from behave.runner_util import parse_features
+
+from conscience.runner import ConscienceRunner
+
+
+class FeatureCache:
+    """Parsed feature files keyed by their path and modification time."""
+
+    def __init__(self):
+        # absolute path -> (modification time, language, pickled feature)
+        self._entries: dict[str, tuple[int, Optional[str], bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def feature(
+        self, filename: str, language: Optional[str] = None
+    ) -> Optional[Feature]:
+        """Returns a fresh copy of the parsed feature file, parsing it only if it has
+        changed since it was last parsed.
+        """
+        key = os.path.abspath(filename)
+        modified = os.stat(filename).st_mtime_ns
+
+        entry = self._entries.get(key)
+        if entry is None or entry[:2] != (modified, language):
+            feature = parse_file(filename, language=language)
+            entry = (modified, language, pickle.dumps(feature))
+            self._entries[key] = entry
+
+        return pickle.loads(entry[2])
+
+    def parse(
+        self, locations: Iterable[str | FileLocation], language: Optional[str] = None
+    ) -> list[Feature]:
+        """A cached equivalent of `behave.runner_util.parse_features`."""
+        features = []
+        for location in locations:
+            if not isinstance(location, FileLocation):
+                location = FileLocation(os.path.normpath(location))
+
+            # Locations of individual scenarios are rare, let behave select them.
+            if location.line:
+                features.extend(parse_features([location], language=language))
+                continue
+
+            feature = self.feature(location.filename, language)
+            if feature is not None:
+                features.append(feature)
+
+        return features
+
+    def prime(self, config):
+        """Parses all features the supplied configuration would run, and has the
+        configuration use this cache from now on.
+
+        Parameters:
+            config: A ConscienceConfiguration, already setup (see `conscience.config.setup_config`).
+        """
+        config.feature_cache = self
+        home = os.getcwd()
+        try:
+            if config.working_directory:
+                os.chdir(config.working_directory)
+
+            runner = ConscienceRunner(config)
+            with runner.path_manager:
+                runner.setup_paths()
+                runner.parse_features()
+        finally:
+            os.chdir(home)
+
+    def save(self, path: Path):
+        """Writes the cache to disk, so other processes can start with it loaded."""
+        with open(path, "wb") as f:
+            pickle.dump(self._entries, f)
+
+    @classmethod
+    def load(cls, path: Path) -> "FeatureCache":
+        """Reads a cache written by `FeatureCache.save`."""
+        cache = cls()
+        with open(path, "rb") as f:
+            cache._entries = pickle.load(f)
+        return cache
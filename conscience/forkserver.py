@@ -0,0 +1,167 @@
+"""Grade submissions by forking a pre-warmed interpreter.
+
+Importing behave, PIL, loguru and tkinter, loading the step modules and parsing the
+feature files is identical for every submission. A `ForkServer` does this once in the
+parent process, then forks a child per submission which only loads the target and
+runs behave. Each child is thrown away afterwards, so submissions remain isolated.
+
+Only available on platforms which support `os.fork`.
+"""
+
+import json
+import os
+import selectors
+import sys
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from conscience.batch import GradedSubmission, _peak_rss
+from conscience.config import ConscienceConfiguration
+from conscience.main import load_common_steps, witness
+from conscience.parsers import register_parsers
+from conscience.runner import ConscienceRunner
+from conscience.score import GradescopeResults, error_results
+
+
+@dataclass
+class _Child:
+    pid: int
+    target: Path
+    start: float
+    output: bytearray = field(default_factory=bytearray)
+
+    def finish(self) -> GradedSubmission:
+        _, status = os.waitpid(self.pid, 0)
+        elapsed = time.perf_counter() - self.start
+
+        try:
+            graded = json.loads(self.output)
+        except json.JSONDecodeError:
+            code = os.waitstatus_to_exitcode(status)
+            results = error_results(f"grading process exited with status {code}")
+            return GradedSubmission(self.target, results, elapsed, worker=self.pid)
+
+        return GradedSubmission(
+            self.target,
+            graded["results"],
+            elapsed,
+            graded["profile"],
+            self.pid,
+            graded["peak_rss"],
+        )
+
+
+class ForkServer:
+    """Grades submissions in children forked from a single, pre-warmed, parent."""
+
+    def __init__(self, config: ConscienceConfiguration):
+        """
+        Parameters:
+            config: The configuration to grade with. Assumes that the passed
+                configuration is already setup (see `conscience.config.setup_config`).
+        """
+        if not hasattr(os, "fork"):
+            raise OSError("a ForkServer requires os.fork, which is not available")
+
+        self.config = config
+        self._warm = False
+
+    def warm(self):
+        """Performs the setup shared by every submission, in this process."""
+        config = self.config
+        self._home = os.getcwd()
+        if config.working_directory:
+            os.chdir(config.working_directory)
+
+        load_common_steps()
+        register_parsers()
+        if config.suite:
+            config.suite.load()
+
+        config.setup_formats()
+
+        runner = ConscienceRunner(config)
+        with runner.path_manager:
+            runner.setup_paths()
+            runner.load_step_definitions()
+            config.features = runner.parse_features()
+
+        self._warm = True
+
+    def _spawn(self, target: Path) -> tuple[int, _Child]:
+        read_fd, write_fd = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid != 0:
+            os.close(write_fd)
+            return read_fd, _Child(pid, target, start)
+
+        # -- CHILD: never return into the caller.
+        status = 0
+        try:
+            os.close(read_fd)
+            profile = None
+            try:
+                # witness chdirs into the working directory, relative to where we started
+                os.chdir(self._home)
+                results = witness(self.config, target)
+                if self.config.profiler is not None:
+                    profile = self.config.profiler.report()
+            except Exception:
+                results = error_results(traceback.format_exc())
+
+            graded = {"results": results, "profile": profile, "peak_rss": _peak_rss()}
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(json.dumps(graded, ensure_ascii=False).encode("utf8"))
+        except BaseException:
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def witness(self, target: Path) -> GradescopeResults:
+        """Tests a single target assessment file in a forked child, see `conscience.main.witness`."""
+        return next(self.witness_all([target])).results
+
+    def witness_all(
+        self, targets: Iterable[Path], workers: int = 1
+    ) -> Iterator[GradedSubmission]:
+        """Tests many target assessment files, each in its own forked child.
+
+        Parameters:
+            targets: The target files to run the tests on. As with `witness`, these are
+                relative to the configured working directory.
+            workers: The maximum number of children grading at once.
+
+        Returns:
+            A stream of graded submissions, in the order in which they finish.
+        """
+        if not self._warm:
+            self.warm()
+
+        pending = deque(targets)
+        running: dict[int, _Child] = {}
+
+        with selectors.DefaultSelector() as selector:
+            while pending or running:
+                while pending and len(running) < workers:
+                    fd, child = self._spawn(pending.popleft())
+                    running[fd] = child
+                    selector.register(fd, selectors.EVENT_READ)
+
+                for key, _ in selector.select():
+                    child = running[key.fd]
+                    chunk = os.read(key.fd, 1 << 16)
+                    if chunk:
+                        child.output.extend(chunk)
+                        continue
+
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                    del running[key.fd]
+                    yield child.finish()
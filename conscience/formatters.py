@@ -1,5 +1,6 @@
 import json
 import csv
+import hashlib
 from typing import List, Optional, TypedDict
 from enum import Enum
 from behave.formatter.base import Formatter
@@ -8,7 +9,6 @@ from behave.model_core import Status
 
 from conscience.score import GradescopeResults, TestScore
 
-
 # NOTE: type hints borrowed from MikeLint
 
 
@@ -49,7 +49,32 @@ def parse_tag_value(scenario: Scenario, tag_name: str, default=None):
     tags = map(lambda tag: tag[len(tag_name) :].strip("()"), tags)
     tags = filter(lambda tag: tag.lstrip("-").replace(".", "", 1).isdigit(), tags)
 
-    return float(next(tags, default))
+    value = next(tags, default)
+    return float(value) if value is not None else None
+
+
+def test_name(scenario: Scenario) -> str:
+    """The name of the test reporting the results of the scenario"""
+    return f"{scenario.name} ({scenario.feature.name})"
+
+
+def scenario_fingerprint(scenario: Scenario) -> str:
+    """A hash of everything in the feature file which decides how a scenario runs,
+    used to tell which scenarios have changed between runs (see `conscience.regrading`).
+    """
+    hasher = hashlib.sha256()
+
+    def update(*values):
+        for value in values:
+            hasher.update(repr(value).encode("utf8"))
+
+    update(test_name(scenario), sorted(scenario.effective_tags))
+    for step in scenario.all_steps:
+        update(step.keyword, step.name, step.text)
+        if step.table is not None:
+            update(step.table.headings, [list(row) for row in step.table.rows])
+
+    return hasher.hexdigest()
 
 
 def has_tag(scenario: Scenario, tag_name: str) -> bool:
@@ -59,12 +84,21 @@ def has_tag(scenario: Scenario, tag_name: str) -> bool:
 
 
 class GradescopeFormatter(Formatter):
+    """Formats results for gradescope.
+
+    By default every test is written as a single JSON object on close. If the config
+    is `streaming`, each test is instead written as a line of JSON as soon as it is
+    finished (see `conscience.score.read_results_from_ndjson`), so that the tests
+    finished before a crash or timeout are not lost.
+    """
+
     # def feature(self, feature):
     #     print(feature)
 
     def __init__(self, stream_opener, config):
         super().__init__(stream_opener, config)
 
+        self._streaming: bool = getattr(config, "streaming", False)
         self._tests: list[TestScore] = []
         self._results: GradescopeResults = {"tests": self._tests}
 
@@ -98,7 +132,7 @@ class GradescopeFormatter(Formatter):
         else:
             log = f"Submission metadata\n{self.type}"
 
-        self._tests.append(
+        self._emit(
             {
                 "score": 0,
                 "max_score": 0,
@@ -108,8 +142,17 @@ class GradescopeFormatter(Formatter):
             }
         )
 
+    def _emit(self, test: TestScore):
+        if not self._streaming:
+            self._tests.append(test)
+            return
+
+        line = json.dumps(test, ensure_ascii=False) + "\n"
+        self.stream.write(line.encode("utf8"))
+        self.stream.flush()
+
     def _format_test_name(self, scenario: Scenario):
-        return f"{scenario.name} ({scenario.feature.name})"
+        return test_name(scenario)
 
     def _format_step_name(self, step: Step):
         status = {
@@ -129,6 +172,7 @@ class GradescopeFormatter(Formatter):
     def reset(self, scenario):
         self._current_scenario: Scenario = scenario
         self._passed = True
+        self._over_budget = False
         self._output = ""
 
     def _make_test(self) -> TestScore:
@@ -142,6 +186,7 @@ class GradescopeFormatter(Formatter):
                 )
                 weight += adjustment
 
+        extra_data: dict = {"fingerprint": scenario_fingerprint(self._current_scenario)}
         if (
             self._current_scenario.status == Status.skipped
             or self._current_scenario.feature.status == Status.skipped
@@ -156,19 +201,33 @@ class GradescopeFormatter(Formatter):
                 "name": self._format_test_name(self._current_scenario),
                 "output": f"⏭  {reason}",
                 "visibility": "visible" if visible else "after_published",
+                "extra_data": extra_data,
             }
 
+        output = self._output
+        if self._over_budget:
+            # slower on a busy machine, see `conscience.cache`
+            extra_data["over_budget"] = True
+
+        # e.g. the before_scenario hook couldn't open the window, so no steps ran
+        hook_failed = getattr(self._current_scenario, "hook_failed", False)
+        if hook_failed:
+            output += f"{self._current_scenario.error_message}\n"
+            # often the fault of the grading environment, see `conscience.cache`
+            extra_data["hook_failed"] = True
+
         return {
-            "score": weight if self._passed else 0,
+            "score": weight if self._passed and not hook_failed else 0,
             "max_score": weight,
             "name": self._format_test_name(self._current_scenario),
-            "output": self._output,
+            "output": output,
             "visibility": "visible" if visible else "after_published",
+            "extra_data": extra_data,
         }
 
     def scenario(self, scenario: Scenario):
         if self._current_scenario is not None:
-            self._tests.append(self._make_test())
+            self._emit(self._make_test())
         self.reset(scenario)
 
     def help_tags(self, scenario: Scenario):
@@ -184,6 +243,8 @@ class GradescopeFormatter(Formatter):
             return
 
         self._passed = False
+        if getattr(step, "over_budget", False):
+            self._over_budget = True
 
         if step.status == Status.skipped:
             self._output += f"{self._format_step_name(step)}\n"
@@ -212,8 +273,11 @@ class GradescopeFormatter(Formatter):
 
     def close(self):
         if self._current_scenario is not None:
-            self._tests.append(self._make_test())
-        self.stream.write(json.dumps(self._results, ensure_ascii=False).encode("utf8"))
+            self._emit(self._make_test())
+        if not self._streaming:
+            self.stream.write(
+                json.dumps(self._results, ensure_ascii=False).encode("utf8")
+            )
         super().close()
 
     # def step(self, step):
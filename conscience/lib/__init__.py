@@ -1,6 +1,7 @@
 """Helper library for Conscience suite"""
 
+from .geometry import Geometry
 from .grid import ImageGrid, SerializedGrid
 from .identify import CanvasSelector, WidgetSelector
-from .images import ImageRegistry, image_id_path
+from .images import ImageIndex, ImageRegistry, image_id_path
 from .mocking import *
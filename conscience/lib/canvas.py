@@ -0,0 +1,416 @@
+"""An index of the items drawn on a canvas.
+
+Finding items by their text or image, or by the area they cover, otherwise costs a
+Tcl round trip per item. A `CanvasIndex` instead reads the type, state, tags, bounding
+box, text and image of every item with a single Tcl call, and answers queries from a
+uniform grid of buckets over the canvas.
+
+`find_enclosed` compares an area with the exact shape of each item, rather than its
+bounding box, so the index only answers `enclosed` itself where the bounding box
+decides it (see `_encloses`), and asks Tk about the rest, in one call for many areas.
+
+Changes made through `tk.Canvas` (creating, moving, reconfiguring or deleting items,
+...) are intercepted, see `_track_canvases`, so that the index only re-reads the items
+which changed, in bulk, the next time it is queried.
+"""
+
+import functools
+import math
+import tkinter as tk
+import weakref
+from typing import Iterable, NamedTuple, Optional
+
+BoundingBox = tuple[int, int, int, int]
+"""A bounding box of the form, (x1, y1, x2, y2)"""
+
+# A Tcl lambda reading every item matching any of the tags (or ids), in stacking order.
+_READ_ITEMS = """{canvas tags} {
+    set rows {}
+    set seen [dict create]
+    foreach tag $tags {
+        foreach item [$canvas find withtag $tag] {
+            if {[dict exists $seen $item]} {
+                continue
+            }
+            dict set seen $item 1
+            set row [list $item [$canvas type $item] [$canvas itemcget $item -state] [$canvas gettags $item] [$canvas bbox $item]]
+            foreach option {-text -image} {
+                lappend row [expr {![catch {$canvas itemcget $item $option} value]}] $value
+            }
+            lappend rows $row
+        }
+    }
+    return $rows
+}"""
+
+
+# A Tcl lambda finding the items enclosed by each of the areas.
+_FIND_ENCLOSED = """{canvas areas} {
+    set found {}
+    foreach area $areas {
+        lappend found [$canvas find enclosed {*}$area]
+    }
+    return $found
+}"""
+
+
+class CanvasItem(NamedTuple):
+    """The attributes of an item on a canvas, None if the item lacks them."""
+
+    id: int
+    type: str
+    state: str
+    tags: tuple[str, ...]
+    bbox: Optional[BoundingBox]
+    text: Optional[str]
+    image: Optional[str]
+
+    @property
+    def hidden(self) -> bool:
+        return self.state == "hidden"
+
+
+# Item types whose shape is their bounding box.
+_EXACT_BBOX = {"image", "bitmap", "window"}
+# Item types whose bounding box pads their shape by at most this many pixels, i.e. half
+# their outline (rounded up) and a pixel for antialiasing.
+_PADDED_BBOX = {"rectangle": 2, "oval": 2}
+
+
+def _encloses(area: BoundingBox, item: CanvasItem) -> Optional[bool]:
+    """Whether `find_enclosed` would find the item within the area, judging from its
+    bounding box alone, or None if only Tk can tell.
+
+    Every item's shape lies within its bounding box, but text must end strictly
+    within the area, so an item is only certainly enclosed if its bounding box is
+    strictly within the right and bottom edges of the area.
+    """
+    x1, y1, x2, y2 = area
+    bx1, by1, bx2, by2 = item.bbox
+    # as Tk skips items whose bounding boxes aren't within a pixel of the area
+    if bx1 >= x2 + 1 or bx2 <= x1 - 1 or by1 >= y2 + 1 or by2 <= y1 - 1:
+        return False
+    if item.type in _EXACT_BBOX:
+        return x1 <= bx1 and y1 <= by1 and bx2 <= x2 and by2 <= y2
+    if x1 <= bx1 and y1 <= by1 and bx2 < x2 and by2 < y2:
+        return True
+
+    padding = _PADDED_BBOX.get(item.type)
+    if padding is not None and (
+        x1 > bx1 + padding
+        or y1 > by1 + padding
+        or bx2 - padding > x2
+        or by2 - padding > y2
+    ):
+        return False
+    return None
+
+
+# canvas -> its index, for the interceptors to find
+_indexes: "weakref.WeakKeyDictionary[tk.Canvas, CanvasIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class CanvasIndex:
+    """A snapshot of the items on a canvas, kept up to date as the canvas changes.
+
+    Region queries skip hidden items. `enclosed` agrees with `find_enclosed`, but
+    unlike `find_overlapping`, overlap is judged by bounding boxes rather than the
+    exact shape of each item.
+    """
+
+    BUCKET_SIZE = 64
+    # The number of changed tags beyond which re-reading every item is cheaper.
+    PENDING_LIMIT = 256
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.items: dict[int, CanvasItem] = {}
+        # item -> position in the stacking order, only ever compared
+        self._order: dict[int, int] = {}
+        self._buckets: dict[tuple[int, int], set[int]] = {}
+        self._next = 0
+
+        # tags (or ids) which changed, in the order they changed, as new items must be
+        # read in stacking order
+        self._pending: dict = {}
+        self._stale = True
+
+    @classmethod
+    def of(cls, canvas: tk.Canvas) -> "CanvasIndex":
+        """Returns the index of the canvas, creating it if necessary."""
+        index = _indexes.get(canvas)
+        if index is None:
+            index = _indexes[canvas] = cls(canvas)
+        return index
+
+    # -- Keeping up to date
+
+    def invalidate(self, tag=None):
+        """Marks the items with the tag (or id) as changed, or every item if None."""
+        if self._stale:
+            return
+        if tag is None or len(self._pending) >= self.PENDING_LIMIT:
+            self._stale = True
+            self._pending.clear()
+            return
+
+        try:
+            self._pending[tag] = None
+        except TypeError:
+            # e.g. a list of tags
+            self.invalidate()
+
+    def _deleting(self, tags: tuple):
+        """Forgets the items matching any of the tags, before they are deleted."""
+        if self._stale:
+            return
+        if "all" in tags:
+            self.invalidate()
+            return
+
+        for tag in tags:
+            for item in self.canvas.find_withtag(tag):
+                self._discard(item)
+                self._order.pop(item, None)
+
+    def refresh(self):
+        """Re-reads the items which have changed since the last refresh."""
+        if self._stale:
+            tags, self._stale = ["all"], False
+            self.items.clear()
+            self._order.clear()
+            self._buckets.clear()
+        else:
+            tags = list(self._pending)
+        self._pending.clear()
+
+        if len(tags) == 0:
+            return
+
+        interpreter = self.canvas.tk
+        rows = interpreter.splitlist(
+            interpreter.call("apply", _READ_ITEMS, self.canvas._w, tuple(tags))
+        )
+        for row in rows:
+            item = self._parse(interpreter.splitlist(row))
+            self._discard(item.id)
+            self._add(item)
+
+    def _parse(self, row) -> CanvasItem:
+        item, item_type, state, tags, bbox, *options = row
+        bbox = self.canvas.tk.splitlist(bbox)
+        return CanvasItem(
+            int(item),
+            str(item_type),
+            str(state),
+            tuple(str(tag) for tag in self.canvas.tk.splitlist(tags)),
+            tuple(map(int, bbox)) if len(bbox) == 4 else None,
+            *(
+                str(options[i + 1]) if int(options[i]) else None
+                for i in range(0, len(options), 2)
+            ),
+        )
+
+    def _cells(self, bbox: BoundingBox) -> Iterable[tuple[int, int]]:
+        x1, y1, x2, y2 = map(math.floor, bbox)
+        size = self.BUCKET_SIZE
+        for column in range(x1 // size, x2 // size + 1):
+            for row in range(y1 // size, y2 // size + 1):
+                yield column, row
+
+    def _add(self, item: CanvasItem):
+        self.items[item.id] = item
+        if item.id not in self._order:
+            self._order[item.id] = self._next
+            self._next += 1
+        if item.bbox is not None:
+            for cell in self._cells(item.bbox):
+                self._buckets.setdefault(cell, set()).add(item.id)
+
+    def _discard(self, item_id: int):
+        item = self.items.pop(item_id, None)
+        if item is not None and item.bbox is not None:
+            for cell in self._cells(item.bbox):
+                self._buckets[cell].discard(item_id)
+
+    # -- Queries
+
+    def all(self) -> list[CanvasItem]:
+        """Every item on the canvas, in stacking order."""
+        self.refresh()
+        return sorted(self.items.values(), key=lambda item: self._order[item.id])
+
+    def get(self, item_id: int) -> Optional[CanvasItem]:
+        self.refresh()
+        return self.items.get(item_id)
+
+    def _candidates(self, area: BoundingBox) -> list[CanvasItem]:
+        self.refresh()
+        found = set()
+        for cell in self._cells(area):
+            found |= self._buckets.get(cell, set())
+        items = (self.items[item] for item in found)
+        return sorted(
+            (item for item in items if not item.hidden),
+            key=lambda item: self._order[item.id],
+        )
+
+    def enclosed(self, x1: int, y1: int, x2: int, y2: int) -> tuple[int, ...]:
+        """Equivalent to `canvas.find_enclosed(x1, y1, x2, y2)`"""
+        return self.enclosed_many([(x1, y1, x2, y2)])[0]
+
+    def enclosed_many(self, areas: list[BoundingBox]) -> list[tuple[int, ...]]:
+        """Equivalent to calling `canvas.find_enclosed` for each of the areas, with at
+        most one Tcl call for all of them.
+        """
+        found: list[list[CanvasItem]] = []
+        # area -> the items only Tk can place
+        unsure: dict[int, set[int]] = {}
+        for i, area in enumerate(areas):
+            x1, y1, x2, y2 = area
+            enclosed = []
+            for item in self._candidates((x1 - 1, y1 - 1, x2 + 1, y2 + 1)):
+                verdict = _encloses(area, item)
+                if verdict is None:
+                    unsure.setdefault(i, set()).add(item.id)
+                if verdict is not False:
+                    enclosed.append(item)
+            found.append(enclosed)
+
+        if unsure:
+            asked = sorted(unsure)
+            interpreter = self.canvas.tk
+            answers = interpreter.splitlist(
+                interpreter.call(
+                    "apply",
+                    _FIND_ENCLOSED,
+                    self.canvas._w,
+                    tuple(tuple(areas[i]) for i in asked),
+                )
+            )
+            for i, answer in zip(asked, answers):
+                rejected = unsure[i] - set(map(int, interpreter.splitlist(answer)))
+                found[i] = [item for item in found[i] if item.id not in rejected]
+
+        return [tuple(item.id for item in items) for items in found]
+
+    def overlapping(self, x1: int, y1: int, x2: int, y2: int) -> tuple[int, ...]:
+        """The items whose bounding boxes overlap the rectangle, in stacking order"""
+        return tuple(
+            item.id
+            for item in self._candidates((x1, y1, x2, y2))
+            if item.bbox[0] <= x2
+            and x1 <= item.bbox[2]
+            and item.bbox[1] <= y2
+            and y1 <= item.bbox[3]
+        )
+
+    def at(self, x: int, y: int) -> tuple[int, ...]:
+        """The items whose bounding boxes contain the point, in stacking order"""
+        return self.overlapping(x, y, x, y)
+
+    def with_text(self, text: str) -> list[int]:
+        return [item.id for item in self.all() if item.text == text]
+
+    def with_image(self, image: str) -> list[int]:
+        return [item.id for item in self.all() if item.image == image]
+
+    def with_tag(self, tag: str) -> list[int]:
+        return [item.id for item in self.all() if tag in item.tags]
+
+    def of_type(self, item_type: str) -> list[int]:
+        return [item.id for item in self.all() if item.type == item_type]
+
+    def bounding_boxes(self) -> list[tuple[int, BoundingBox]]:
+        """Every visible item with a bounding box, in stacking order."""
+        return [
+            (item.id, item.bbox)
+            for item in self.all()
+            if item.bbox is not None and not item.hidden
+        ]
+
+
+def _is_query(method: str, args: tuple, kwargs: dict) -> bool:
+    """Whether a call to the canvas method only reads from the canvas."""
+    if method == "coords":
+        return len(args) <= 1 and not kwargs
+    if method in ("itemconfigure", "itemconfig"):
+        cnf = args[1] if len(args) > 1 else None
+        return not kwargs and (cnf is None or isinstance(cnf, str))
+    return False
+
+
+# Methods which change the items matching their first argument.
+_CHANGES_ITEMS = (
+    "coords",
+    "move",
+    "moveto",
+    "scale",
+    "itemconfigure",
+    "itemconfig",
+    "insert",
+    "dchars",
+)
+# Methods which change which items exist, or their order, in ways that are simplest
+# to handle by re-reading everything.
+_CHANGES_CANVAS = (
+    "tag_raise",
+    "tag_lower",
+    "lift",
+    "lower",
+    "tkraise",
+    "addtag",
+    "dtag",
+)
+
+
+def _track_canvases():
+    """Wraps the methods of tk.Canvas which change its items, so that any CanvasIndex
+    of the canvas is kept up to date.
+    """
+    if getattr(tk.Canvas._create, "_tracked", False):
+        return
+
+    def wrap(method: str, track):
+        original = getattr(tk.Canvas, method)
+
+        @functools.wraps(original)
+        def tracked(self, *args, **kwargs):
+            index = _indexes.get(self)
+            if index is None or _is_query(method, args, kwargs):
+                return original(self, *args, **kwargs)
+            return track(index, original, self, args, kwargs)
+
+        tracked._tracked = True
+        setattr(tk.Canvas, method, tracked)
+
+    def created(index, original, canvas, args, kwargs):
+        item = original(canvas, *args, **kwargs)
+        index.invalidate(item)
+        return item
+
+    def changed(index, original, canvas, args, kwargs):
+        result = original(canvas, *args, **kwargs)
+        index.invalidate(args[0] if args else None)
+        return result
+
+    def changed_all(index, original, canvas, args, kwargs):
+        result = original(canvas, *args, **kwargs)
+        index.invalidate()
+        return result
+
+    def deleted(index, original, canvas, args, kwargs):
+        index._deleting(args)
+        return original(canvas, *args, **kwargs)
+
+    wrap("_create", created)
+    for method in _CHANGES_ITEMS:
+        wrap(method, changed)
+    for method in _CHANGES_CANVAS:
+        wrap(method, changed_all)
+    wrap("delete", deleted)
+
+
+_track_canvases()
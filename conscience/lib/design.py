@@ -0,0 +1,573 @@
+"""Answer questions about the design of a submission: which classes and functions it
+defines, their parameters, and what each class inherits from.
+
+`ImportedDesign` inspects the imported module under test. `StaticDesign` answers the
+same questions from the syntax tree of the source alone, so design checks can run
+without executing the submission, even when it fails to import. Parsed sources are
+cached by the hash of their contents, see `static_design`. As the submission is
+imported under another name, anything defined under `if __name__ == "__main__":` is
+never seen by either.
+
+Names from other modules (e.g. `tk.Frame` when the submission does `import tkinter as
+tk`) are found without importing anything: from the module already imported by the
+grader, or otherwise from the module's own source. Modules alongside the submission
+are always read from their source.
+"""
+
+import ast
+import inspect
+import sys
+from importlib.machinery import PathFinder
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple, Optional
+
+from conscience.cache import file_digest
+
+Parameter = tuple[str, inspect._ParameterKind]
+"""The name and kind of a parameter"""
+
+
+@dataclass
+class Definition:
+    """Something defined by a submission, e.g. a class, function or method"""
+
+    name: str
+    is_class: bool
+    callable: bool
+    parameters: Optional[list[Parameter]]
+    """The parameters it takes when called, or None if they can't be determined"""
+
+    def positional_parameters(self) -> list[str]:
+        """The names of every parameter except the **kwargs, as the design steps count them"""
+        assert self.parameters is not None, f"the parameters of {self.name} are unknown"
+        return [
+            name
+            for name, kind in self.parameters
+            if kind != inspect.Parameter.VAR_KEYWORD
+        ]
+
+    def keyword_parameters(self) -> list[str]:
+        assert self.parameters is not None, f"the parameters of {self.name} are unknown"
+        return [
+            name
+            for name, kind in self.parameters
+            if kind == inspect.Parameter.VAR_KEYWORD
+        ]
+
+
+def _inspect(name: str, obj: Any) -> Definition:
+    try:
+        signature = inspect.signature(obj)
+        parameters = [(p.name, p.kind) for p in signature.parameters.values()]
+    except (TypeError, ValueError):
+        parameters = None
+
+    return Definition(name, isinstance(obj, type), callable(obj), parameters)
+
+
+class ImportedDesign:
+    """The design of an imported module, found by introspection."""
+
+    def __init__(self, module: ModuleType):
+        self.module = module
+
+    def lookup(self, name: str) -> Optional[Definition]:
+        if not hasattr(self.module, name):
+            return None
+        return _inspect(name, getattr(self.module, name))
+
+    def member(self, clazz: str, name: str) -> Optional[Definition]:
+        obj = getattr(self.module, clazz)
+        if not hasattr(obj, name):
+            return None
+        return _inspect(f"{clazz}.{name}", getattr(obj, name))
+
+    def inherits(self, subclazz: str, clazz: str | type) -> bool:
+        if isinstance(clazz, str):
+            clazz = getattr(self.module, clazz)
+        return issubclass(getattr(self.module, subclazz), clazz)
+
+
+_KINDS = inspect.Parameter
+
+
+def _parameters(arguments: ast.arguments) -> list[Parameter]:
+    parameters = [(a.arg, _KINDS.POSITIONAL_ONLY) for a in arguments.posonlyargs]
+    parameters += [(a.arg, _KINDS.POSITIONAL_OR_KEYWORD) for a in arguments.args]
+    if arguments.vararg is not None:
+        parameters.append((arguments.vararg.arg, _KINDS.VAR_POSITIONAL))
+    parameters += [(a.arg, _KINDS.KEYWORD_ONLY) for a in arguments.kwonlyargs]
+    if arguments.kwarg is not None:
+        parameters.append((arguments.kwarg.arg, _KINDS.VAR_KEYWORD))
+    return parameters
+
+
+def _decorators(function: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
+    names = set()
+    for decorator in function.decorator_list:
+        if isinstance(decorator, ast.Name):
+            names.add(decorator.id)
+        elif isinstance(decorator, ast.Attribute):
+            names.add(decorator.attr)
+    return names
+
+
+def _function(name: str, node: ast.AST) -> Definition:
+    """A definition for a function, method or lambda, as found on its class."""
+    if isinstance(node, ast.Lambda):
+        return Definition(name, False, True, _parameters(node.args))
+
+    decorators = _decorators(node)
+    if "property" in decorators:
+        return Definition(name, False, False, None)
+
+    parameters = _parameters(node.args)
+    if "classmethod" in decorators:
+        # bound to the class when looked up on it
+        parameters = parameters[1:]
+    return Definition(name, False, True, parameters)
+
+
+def _is_main_guard(statement: ast.If) -> bool:
+    """Whether the statement is `if __name__ == "__main__":`, which is never true when
+    the submission is imported.
+    """
+    test = statement.test
+    if not (
+        isinstance(test, ast.Compare)
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+    ):
+        return False
+    sides = (test.left, test.comparators[0])
+    return any(
+        isinstance(side, ast.Name) and side.id == "__name__" for side in sides
+    ) and any(
+        isinstance(side, ast.Constant) and side.value == "__main__" for side in sides
+    )
+
+
+def _body(statements: list[ast.stmt]):
+    """The statements of a module or class body, including those guarded by if or try."""
+    for statement in statements:
+        yield statement
+        if isinstance(statement, ast.If):
+            if not _is_main_guard(statement):
+                yield from _body(statement.body)
+            yield from _body(statement.orelse)
+        elif isinstance(statement, ast.Try):
+            for block in (statement.body, statement.orelse, statement.finalbody):
+                yield from _body(block)
+            for handler in statement.handlers:
+                yield from _body(handler.body)
+
+
+def _absolute(
+    module: Optional[str], level: int, package: Optional[str]
+) -> Optional[str]:
+    """The absolute name of a module imported by `from module import ...`."""
+    if level == 0:
+        return module
+    if package is None:
+        return None
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{module}" if module else base
+
+
+class _Scope:
+    """The names bound by a module or class body, last definition wins."""
+
+    def __init__(self, statements: list[ast.stmt], package: Optional[str] = None):
+        """
+        Parameters:
+            statements: The body of the module or class.
+            package: The package relative imports are from, if the body has one.
+        """
+        self.definitions: dict[str, ast.AST] = {}
+        self.imports: dict[str, str] = {}
+        self.star_imports: list[str] = []
+
+        for statement in _body(statements):
+            if isinstance(
+                statement, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                self.definitions[statement.name] = statement
+            elif isinstance(statement, ast.Assign):
+                for target in statement.targets:
+                    if isinstance(target, ast.Name):
+                        self.definitions[target.id] = statement.value
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                if isinstance(statement.target, ast.Name):
+                    self.definitions[statement.target.id] = statement.value
+            elif isinstance(statement, ast.Import):
+                for alias in statement.names:
+                    if alias.asname is not None:
+                        self.imports[alias.asname] = alias.name
+                    else:
+                        top = alias.name.split(".")[0]
+                        self.imports[top] = top
+            elif isinstance(statement, ast.ImportFrom):
+                module = _absolute(statement.module, statement.level, package)
+                if module is None:
+                    continue
+                for alias in statement.names:
+                    if alias.name == "*":
+                        self.star_imports.append(module)
+                    else:
+                        name = alias.asname or alias.name
+                        self.imports[name] = f"{module}.{alias.name}"
+
+
+def _find_source(module: str, path: Optional[list[str]] = None) -> Optional[Path]:
+    """Finds the source file of the module, without importing it or its packages.
+
+    Parameters:
+        module: The dotted name of the module.
+        path: The directories to look for the top level package in, or None for sys.path.
+    """
+    parts = module.split(".")
+    spec = None
+    for i in range(len(parts)):
+        if i > 0 and path is None:
+            # not a package
+            return None
+        spec = PathFinder.find_spec(".".join(parts[: i + 1]), path)
+        if spec is None:
+            return None
+        path = spec.submodule_search_locations
+
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    return Path(spec.origin)
+
+
+class _Defined(NamedTuple):
+    """Something defined by the source of a module, e.g. a class of the submission or
+    of a module which hasn't been imported.
+    """
+
+    design: "StaticDesign"
+    name: str
+    node: ast.AST
+
+    @property
+    def is_class(self) -> bool:
+        return isinstance(self.node, ast.ClassDef)
+
+
+def _describe(name: str, found: Any) -> Definition:
+    """A definition of something found by `StaticDesign._external`."""
+    if isinstance(found, _Defined):
+        return found.design._definition(name, found.node)
+    if isinstance(found, StaticDesign):
+        # a module, read from its source
+        return Definition(name, False, False, None)
+    return _inspect(name, found)
+
+
+def _attribute(owner: Any, name: str) -> Optional[Any]:
+    """The attribute of something found by `StaticDesign._external`, without importing
+    anything, or None if it doesn't have one (or it can't be found statically).
+    """
+    if isinstance(owner, StaticDesign):
+        found = owner._global(name)
+        if found is None and owner.module is not None:
+            # a submodule, e.g. `tkinter.ttk` after `import tkinter.ttk`
+            found = owner._module(f"{owner.module}.{name}")
+        return found
+    if isinstance(owner, _Defined):
+        return None
+    return getattr(owner, name, None)
+
+
+class StaticDesign:
+    """The design of a submission, found from its source without running it."""
+
+    def __init__(
+        self, source: str, path: Optional[Path] = None, module: Optional[str] = None
+    ):
+        """
+        Parameters:
+            source: The source code of the submission.
+            path: Where the source was read from. Modules alongside it are read from
+                their source, even if a module of the same name has been imported.
+            module: The dotted name of the module, if this isn't the submission but a
+                module it imports.
+        """
+        self.path = path
+        self.module = module
+        package = None
+        if module is not None:
+            is_package = path is not None and path.name == "__init__.py"
+            package = module if is_package else module.rpartition(".")[0] or None
+        self.scope = _Scope(ast.parse(source).body, package)
+        self._classes: dict[str, _Scope] = {}
+        self._modules: dict[str, Optional[Any]] = {}
+        # names being resolved, as modules may import from each other
+        self._resolving: set[str] = set()
+
+    # -- resolving names defined elsewhere
+
+    def _module(self, name: str) -> Optional[Any]:
+        """Returns the module with the dotted name, either as already imported, or as read
+        from its source.
+        """
+        if name in self._modules:
+            return self._modules[name]
+
+        found = None
+        local = None
+        if self.module is None and self.path is not None:
+            local = _find_source(name, [str(self.path.resolve().parent)])
+        if local is not None:
+            found = static_design(local, name)
+        elif name in sys.modules:
+            found = sys.modules[name]
+        else:
+            source = _find_source(name)
+            found = static_design(source, name) if source is not None else None
+
+        self._modules[name] = found
+        return found
+
+    def _global(self, name: str) -> Optional[Any]:
+        """Returns what the name is bound to at the top level of this module."""
+        if name in self._resolving:
+            return None
+        self._resolving.add(name)
+        try:
+            node = self.scope.definitions.get(name)
+            # follow aliases, e.g. `Frame = BaseFrame`, to what they name
+            if isinstance(node, (ast.Name, ast.Attribute)):
+                aliased = self._resolve(node)
+                if aliased is not None:
+                    return aliased
+            if node is not None:
+                return _Defined(self, name, node)
+            return self._external(ast.Name(name))
+        finally:
+            self._resolving.discard(name)
+
+    def _lookup_dotted(self, dotted: str) -> Optional[Any]:
+        """Returns what has the dotted name, e.g. "tkinter.Frame", without importing it."""
+        parts = dotted.split(".")
+        for split in range(len(parts), 0, -1):
+            found = self._module(".".join(parts[:split]))
+            if found is None:
+                continue
+            for part in parts[split:]:
+                found = _attribute(found, part)
+                if found is None:
+                    return None
+            return found
+        return None
+
+    def _resolve(self, expression: ast.expr) -> Optional[Any]:
+        """Resolves a name, or attribute of a name, bound at the top level of this module."""
+        if isinstance(expression, ast.Name):
+            node = self.scope.definitions.get(expression.id)
+            if node is None or node is expression:
+                return self._external(expression)
+            return self._global(expression.id)
+
+        if isinstance(expression, ast.Attribute):
+            owner = self._resolve(expression.value)
+            if owner is not None:
+                return _attribute(owner, expression.attr)
+        return None
+
+    def _external(self, expression: ast.expr) -> Optional[Any]:
+        """Resolves an expression such as `tk.Frame` or `Frame`, naming something imported."""
+        if isinstance(expression, ast.Name):
+            name = expression.id
+            if name in self.scope.imports:
+                return self._lookup_dotted(self.scope.imports[name])
+            for module in self.scope.star_imports:
+                found = self._lookup_dotted(f"{module}.{name}")
+                if found is not None:
+                    return found
+            return None
+
+        if isinstance(expression, ast.Attribute):
+            owner = self._external(expression.value)
+            if owner is not None:
+                return _attribute(owner, expression.attr)
+        return None
+
+    # -- classes
+
+    def _class(self, name: str) -> Optional[ast.ClassDef]:
+        node = self.scope.definitions.get(name)
+        return node if isinstance(node, ast.ClassDef) else None
+
+    def _class_scope(self, node: ast.ClassDef) -> _Scope:
+        scope = self._classes.get(node.name)
+        if scope is None:
+            scope = self._classes[node.name] = _Scope(node.body)
+        return scope
+
+    def _bases(
+        self, node: ast.ClassDef, seen: Optional[set[int]] = None
+    ) -> list[_Defined | type]:
+        """The bases of the class, both those defined in source and those imported, in an
+        approximation of the method resolution order.
+        """
+        seen = {id(node)} if seen is None else seen
+        bases: list[_Defined | type] = []
+        for expression in node.bases:
+            if isinstance(expression, ast.Name) and self._class(expression.id):
+                base = _Defined(self, expression.id, self._class(expression.id))
+            else:
+                base = self._external(expression)
+
+            if isinstance(base, type):
+                bases.append(base)
+            elif isinstance(base, _Defined) and base.is_class:
+                if id(base.node) in seen:
+                    continue
+                seen.add(id(base.node))
+                bases.append(base)
+                bases.extend(base.design._bases(base.node, seen))
+        return bases
+
+    def _member(
+        self, node: ast.ClassDef, name: str, clazz: Optional[str] = None
+    ) -> Optional[Definition]:
+        qualified = f"{clazz or node.name}.{name}"
+        for owner in [_Defined(self, node.name, node), *self._bases(node)]:
+            if isinstance(owner, type):
+                if hasattr(owner, name):
+                    return _inspect(qualified, getattr(owner, name))
+                continue
+
+            definitions = owner.design._class_scope(owner.node).definitions
+            value = definitions.get(name)
+            # e.g. `pack = pack_configure` within the class
+            for _ in range(len(definitions)):
+                if not isinstance(value, ast.Name) or value.id not in definitions:
+                    break
+                value = definitions[value.id]
+
+            if value is None:
+                continue
+            if isinstance(value, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                return _function(qualified, value)
+            if isinstance(value, ast.ClassDef):
+                return owner.design._definition(qualified, value)
+            return Definition(qualified, False, False, None)
+
+        if hasattr(object, name):
+            return _inspect(qualified, getattr(object, name))
+        return None
+
+    def _constructor(self, node: ast.ClassDef) -> Optional[list[Parameter]]:
+        """The parameters taken when calling the class, as `inspect.signature` finds them."""
+        for owner in [_Defined(self, node.name, node), *self._bases(node)]:
+            if isinstance(owner, type):
+                return _inspect(node.name, owner).parameters
+
+            scope = owner.design._class_scope(owner.node)
+            initialiser = scope.definitions.get("__init__")
+            if isinstance(initialiser, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # the class is called without self
+                return _parameters(initialiser.args)[1:]
+        return []
+
+    def _definition(self, name: str, node: ast.AST) -> Definition:
+        if isinstance(node, ast.ClassDef):
+            return Definition(name, True, True, self._constructor(node))
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            definition = _function(name, node)
+            definition.callable = True
+            return definition
+
+        # an alias of something else defined by the module
+        if isinstance(node, ast.Name) and node.id != name:
+            aliased = self.scope.definitions.get(node.id)
+            if aliased is not None and aliased is not node:
+                return self._definition(name, aliased)
+
+        external = self._external(node) if isinstance(node, ast.expr) else None
+        if external is not None:
+            return _describe(name, external)
+        return Definition(name, False, False, None)
+
+    # -- questions asked by the design steps
+
+    def lookup(self, name: str) -> Optional[Definition]:
+        node = self.scope.definitions.get(name)
+        if node is not None:
+            return self._definition(name, node)
+
+        external = self._external(ast.Name(name))
+        if external is not None:
+            return _describe(name, external)
+        return None
+
+    def member(self, clazz: str, name: str) -> Optional[Definition]:
+        node = self._class(clazz)
+        if node is not None:
+            return self._member(node, name)
+
+        external = self._external(ast.Name(clazz))
+        if isinstance(external, _Defined):
+            if not external.is_class:
+                return None
+            return external.design._member(external.node, name, clazz)
+        if external is None or not hasattr(external, name):
+            return None
+        return _inspect(f"{clazz}.{name}", getattr(external, name))
+
+    def inherits(self, subclazz: str, clazz: str | type) -> bool:
+        node = self._class(subclazz)
+        if node is None:
+            return False
+
+        bases = self._bases(node)
+        if isinstance(clazz, str):
+            defined = self._class(clazz)
+            found = defined if defined is not None else self._external(ast.Name(clazz))
+            if isinstance(found, _Defined):
+                found = found.node
+            if isinstance(found, ast.ClassDef):
+                return any(
+                    isinstance(base, _Defined) and base.node is found for base in bases
+                )
+            if not isinstance(found, type):
+                return False
+            clazz = found
+
+        for base in bases:
+            if isinstance(base, type):
+                if issubclass(base, clazz):
+                    return True
+            # a class read from the source of a module which hasn't been imported
+            elif (base.design.module, base.name) == (
+                clazz.__module__,
+                clazz.__qualname__,
+            ):
+                return True
+        return False
+
+
+# (file digest, directory, module) -> parsed design
+_designs: dict[tuple[str, Path, Optional[str]], StaticDesign] = {}
+
+
+def static_design(path: Path, module: Optional[str] = None) -> StaticDesign:
+    """Returns the static design of the source file, parsing each version of it only once.
+
+    Parameters:
+        path: The source file of the submission, or of a module it imports.
+        module: The dotted name of the module, if it isn't the submission.
+    """
+    path = Path(path)
+    key = (file_digest(path), path.resolve().parent, module)
+    design = _designs.get(key)
+    if design is None:
+        source = path.read_text(encoding="utf8")
+        design = _designs[key] = StaticDesign(source, path, module)
+    return design
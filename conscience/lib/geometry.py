@@ -0,0 +1,174 @@
+"""Query the layout of a GUI from a single snapshot of every widget's geometry.
+
+The geometry of each widget is read in the same bulk Tcl call as its other attributes
+(see `conscience.lib.identify.fetch_attributes`) and stored as columns, so layout
+queries compare plain integers rather than calling `winfo_*` one widget at a time.
+
+Two coordinate systems are kept:
+    - positions (`x`, `y`), relative to the widget's parent as returned by `winfo_x`,
+      used by the directional queries, which the relative position steps have always
+      compared;
+    - screen coordinates (`root_x`, `root_y`), used by the spatial queries, which
+      compare widgets with different parents.
+"""
+
+from array import array
+import tkinter as tk
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from conscience.lib.identify import WidgetAttributes
+
+Edge = Literal["left", "right", "top", "bottom", "centre_x", "centre_y"]
+
+
+class Rectangle(NamedTuple):
+    """The screen area covered by a widget"""
+
+    left: int
+    top: int
+    width: int
+    height: int
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.top + self.height
+
+
+class Geometry:
+    """The positions and sizes of a list of widgets, stored column by column."""
+
+    def __init__(
+        self,
+        widgets: list[tk.Widget],
+        attributes: dict[tk.Widget, "WidgetAttributes"],
+    ):
+        self.widgets = widgets
+        self._rows = {widget: row for row, widget in enumerate(widgets)}
+
+        rows = [attributes[widget] for widget in widgets]
+        self.x = array("i", (row.x for row in rows))
+        self.y = array("i", (row.y for row in rows))
+        self.width = array("i", (row.width for row in rows))
+        self.height = array("i", (row.height for row in rows))
+        self.left = array("i", (row.root_x for row in rows))
+        self.top = array("i", (row.root_y for row in rows))
+        self.right = array("i", map(sum, zip(self.left, self.width)))
+        self.bottom = array("i", map(sum, zip(self.top, self.height)))
+
+    def __len__(self) -> int:
+        return len(self.widgets)
+
+    def __contains__(self, widget: tk.Widget) -> bool:
+        return widget in self._rows
+
+    def _select(self, mask) -> list[tk.Widget]:
+        return [widget for widget, selected in zip(self.widgets, mask) if selected]
+
+    def position(self, widget: tk.Widget) -> tuple[int, int]:
+        """Equivalent to (widget.winfo_x(), widget.winfo_y())"""
+        row = self._rows[widget]
+        return self.x[row], self.y[row]
+
+    def size(self, widget: tk.Widget) -> tuple[int, int]:
+        """Equivalent to (widget.winfo_width(), widget.winfo_height())"""
+        row = self._rows[widget]
+        return self.width[row], self.height[row]
+
+    def rectangle(self, widget: tk.Widget) -> Rectangle:
+        row = self._rows[widget]
+        return Rectangle(
+            self.left[row], self.top[row], self.width[row], self.height[row]
+        )
+
+    # Directional queries, comparing positions as winfo_x and winfo_y do.
+
+    def left_of(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The widgets positioned further left than the widget"""
+        x = self.x[self._rows[widget]]
+        return self._select(other < x for other in self.x)
+
+    def right_of(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The widgets positioned further right than the widget"""
+        x = self.x[self._rows[widget]]
+        return self._select(other > x for other in self.x)
+
+    def above(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The widgets positioned higher than the widget"""
+        y = self.y[self._rows[widget]]
+        return self._select(other < y for other in self.y)
+
+    def below(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The widgets positioned lower than the widget"""
+        y = self.y[self._rows[widget]]
+        return self._select(other > y for other in self.y)
+
+    # Spatial queries, comparing screen coordinates.
+
+    def overlapping(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The other widgets which cover some of the same area as the widget"""
+        area = self.rectangle(widget)
+        return self._select(
+            other is not widget
+            and left < area.right
+            and area.left < right
+            and top < area.bottom
+            and area.top < bottom
+            for other, left, top, right, bottom in zip(
+                self.widgets, self.left, self.top, self.right, self.bottom
+            )
+        )
+
+    def contained_in(self, widget: tk.Widget) -> list[tk.Widget]:
+        """The other widgets which lie entirely within the area of the widget"""
+        area = self.rectangle(widget)
+        return self._select(
+            other is not widget
+            and area.left <= left
+            and right <= area.right
+            and area.top <= top
+            and bottom <= area.bottom
+            for other, left, top, right, bottom in zip(
+                self.widgets, self.left, self.top, self.right, self.bottom
+            )
+        )
+
+    def _edge(self, edge: Edge) -> list[float]:
+        if edge == "centre_x":
+            return [(left + right) / 2 for left, right in zip(self.left, self.right)]
+        if edge == "centre_y":
+            return [(top + bottom) / 2 for top, bottom in zip(self.top, self.bottom)]
+        return getattr(self, edge)
+
+    def aligned(
+        self, widget: tk.Widget, edge: Edge = "left", tolerance: int = 0
+    ) -> list[tk.Widget]:
+        """The other widgets whose edge (or centre line) is within tolerance pixels of the widget's"""
+        column = self._edge(edge)
+        value = column[self._rows[widget]]
+        return self._select(
+            other is not widget and abs(position - value) <= tolerance
+            for other, position in zip(self.widgets, column)
+        )
+
+    def centred(
+        self,
+        within: tk.Widget,
+        axis: Literal["x", "y", "both"] = "x",
+        tolerance: int = 0,
+    ) -> list[tk.Widget]:
+        """The other widgets inside `within` whose centre lines up with its centre"""
+        edges: tuple[Edge, ...] = {
+            "x": ("centre_x",),
+            "y": ("centre_y",),
+            "both": ("centre_x", "centre_y"),
+        }[axis]
+
+        candidates = set(self.contained_in(within))
+        for edge in edges:
+            candidates &= set(self.aligned(within, edge, tolerance))
+        return [widget for widget in self.widgets if widget in candidates]
@@ -1,10 +1,12 @@
 from functools import reduce
 import tkinter as tk
-from typing import Any, Iterable, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Set, Tuple, Union
 
-from PIL import ImageTk
+from .canvas import BoundingBox, CanvasIndex
+from .images import ImageIndex
 
-from .images import image_id_path
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 Position = tuple[int, int]
 """A position of the form, (row, col)"""
@@ -44,34 +46,48 @@ class SerializedGrid:
         rows = int(grid.winfo_height() // cell_height)
         return rows, columns
 
-    def get_items_at_position(self, position: Position) -> Tuple[Item, ...]:
+    def _cell_area(self, position: Position, cell_size: tuple[int, int]) -> BoundingBox:
         row, col = position
-        cell_width, cell_height = self.cell_size
+        cell_width, cell_height = cell_size
         start_x, start_y = col * cell_width, row * cell_height
-
-        return self.grid.find_enclosed(
+        return (
             start_x - self.CELL_SPACING,
             start_y - self.CELL_SPACING,
             start_x + cell_width + self.CELL_SPACING,
             start_y + cell_height + self.CELL_SPACING,
         )
 
+    def get_items_at_position(self, position: Position) -> Tuple[Item, ...]:
+        area = self._cell_area(position, self.cell_size)
+        return CanvasIndex.of(self.grid).enclosed(*area)
+
     def serialize(self) -> dict[Position, tuple[Item, ...]]:
+        """Maps every position to the items enclosed by its cell.
+
+        Equivalent to calling `get_items_at_position` for every position, but answers
+        every cell from one snapshot of the canvas (see `CanvasIndex.enclosed_many`).
+        """
         rows, columns = self.dimensions
-        return {
-            (row, column): self.get_items_at_position((row, column))
-            for row in range(rows)
-            for column in range(columns)
-        }
+        cell_size = self.cell_size
+        positions = [(row, column) for row in range(rows) for column in range(columns)]
+        areas = [self._cell_area(position, cell_size) for position in positions]
+        return dict(zip(positions, CanvasIndex.of(self.grid).enclosed_many(areas)))
+
+    def _first_item(self, items: Iterable[Item]) -> Optional[Item]:
+        return next(iter(items), None)
 
     def _find_item(self, position: Position) -> Optional[Item]:
-        items = self.get_items_at_position(position)
-        return items[0] if len(items) > 0 else None
+        return self._first_item(self.get_items_at_position(position))
 
     def get_position(self, item: Item) -> list[float]:
         return self.grid.coords(item)
 
     def _get_item_option(self, item: Item, option: str) -> Optional[Any]:
+        if option in ("text", "image"):
+            indexed = CanvasIndex.of(self.grid).get(item)
+            if indexed is not None:
+                return getattr(indexed, option)
+
         try:
             return self.grid.itemcget(item, option)
         except tk.TclError:
@@ -101,20 +117,24 @@ class SerializedGrid:
         """
         return self._get_item_option(item, "text")
 
-    def _render_position(self, position: Position) -> str:
-        item = self._find_item(position)
+    def _render_items(self, items: Iterable[Item]) -> str:
+        item = self._first_item(items)
         if item is None:
             return self.EMPTY
 
         text = self._identify_item(item)
         return text if text is not None else self.EMPTY
 
+    def _render_position(self, position: Position) -> str:
+        return self._render_items(self.get_items_at_position(position))
+
     def render(self) -> str:
         rows, cols = self.dimensions
+        cells = self.serialize()
 
         def render_row(row: int) -> str:
             inner = self.DIVIDER.join(
-                (self._render_position((row, col)) for col in range(cols))
+                (self._render_items(cells[(row, col)]) for col in range(cols))
             )
             return f"{self.DIVIDER}{inner}{self.DIVIDER}\n"
 
@@ -139,7 +159,7 @@ class ImageGrid(SerializedGrid):
         self,
         grid: tk.Canvas,
         dimensions: tuple[int, int],
-        cache: dict[str, ImageTk.PhotoImage],
+        cache: dict[str, "ImageTk.PhotoImage"],
         translations: dict[str, str],
     ) -> None:
         """Constructs a new ImageGrid for the given cache and set of translations.
@@ -154,6 +174,7 @@ class ImageGrid(SerializedGrid):
         super().__init__(grid, dimensions)
         self.cache = cache
         self.translations = translations
+        self.images = ImageIndex(cache, translations)
 
     @property
     def layer(self) -> Set[str]:
@@ -171,18 +192,13 @@ class ImageGrid(SerializedGrid):
         if image_id is None:
             return None
 
-        path = image_id_path(self.cache, image_id)
-        if path not in self.layer:
-            return None
-
-        return self.translations.get(path)
+        return self.images.symbol(image_id)
 
     def _layer_filter(self, items: Iterable[Item]) -> Iterable[Item]:
         return filter(lambda item: self._identify_item(item) is not None, items)
 
-    def _find_item(self, position: Position) -> Optional[Item]:
-        items = list(self._layer_filter(self.get_items_at_position(position)))
-        return items[0] if len(items) > 0 else None
+    def _first_item(self, items: Iterable[Item]) -> Optional[Item]:
+        return next(iter(self._layer_filter(items)), None)
 
     def _overlaps(self, items: Iterable[Item]):
         """Returns true iff 2 items of the supplied iterable have overlapping
@@ -6,28 +6,261 @@ Allows testing to occur in an environment where no knowledge
 is known about the implementation details of the GUI.
 """
 
+from collections import defaultdict
 import tkinter as tk
-from typing import Callable, List, TypeVar
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, TypeVar
 
-from PIL import ImageTk
+from conscience.lib.canvas import CanvasIndex
+from conscience.lib.geometry import Geometry
+from conscience.profiling import count
+
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 T = TypeVar("T")
 Selector = Callable[[tk.Widget], bool]
 Accessor = Callable[[tk.Widget], T]
 
 
-def _widget_selector(parent: tk.Widget, selector: Selector):
-    """Recursively generates all widgets in the tree from the parent node which match the selector"""
-    if selector(parent):
-        yield parent
-    for child in parent.children.values():
-        # for child in parent.winfo_children(): doesn't work as students override self._root
-        yield from _widget_selector(child, selector)
-
-
 def find_widgets(selector: Selector, widget: tk.Widget) -> List[tk.Widget]:
     """Find all widgets which match the supplied selector"""
-    return list(_widget_selector(widget, selector))
+    return WidgetIndex.of(widget).find(selector, widget)
+
+
+_generation = 0
+
+
+def invalidate_widget_index():
+    """Marks every existing WidgetIndex as stale.
+
+    Called whenever the GUI may have changed, e.g. after events, calls to update or
+    ticks of the after simulator, and before every step.
+    """
+    global _generation
+    _generation += 1
+
+
+def _relax(text: str) -> str:
+    return text.lower().strip()
+
+
+class WidgetAttributes(NamedTuple):
+    """The attributes of a widget which selectors inspect, None if the widget lacks the option."""
+
+    text: Optional[str]
+    image: Optional[str]
+    bg: Optional[str]
+    tk_class: str
+    x: int
+    y: int
+    width: int
+    height: int
+    root_x: int
+    root_y: int
+
+
+_OPTIONS = ("text", "image", "bg")
+
+# A Tcl lambda which reads the attributes of every widget passed to it, flagging the
+# options each widget is missing rather than raising.
+_READ_ATTRIBUTES = """widgets {
+    set rows {}
+    foreach w $widgets {
+        set row {}
+        foreach option {-text -image -bg} {
+            lappend row [expr {![catch {$w cget $option} value]}] $value
+        }
+        if {[catch {list [winfo class $w] [winfo x $w] [winfo y $w] [winfo width $w] [winfo height $w] [winfo rootx $w] [winfo rooty $w]} geometry]} {
+            set geometry {{} 0 0 0 0 0 0}
+        }
+        lappend rows [list {*}$row {*}$geometry]
+    }
+    return $rows
+}"""
+
+
+def _read_attributes(widget: tk.Widget) -> WidgetAttributes:
+    """Reads the attributes of a single widget, one Tcl call at a time."""
+    options = []
+    for option in _OPTIONS:
+        try:
+            options.append(str(widget.cget(option)))
+        except tk.TclError:
+            options.append(None)
+
+    try:
+        geometry = (
+            widget.winfo_class(),
+            widget.winfo_x(),
+            widget.winfo_y(),
+            widget.winfo_width(),
+            widget.winfo_height(),
+            widget.winfo_rootx(),
+            widget.winfo_rooty(),
+        )
+    except (tk.TclError, AttributeError):
+        geometry = ("", 0, 0, 0, 0, 0, 0)
+
+    return WidgetAttributes(*options, *geometry)
+
+
+def fetch_attributes(widgets: list[tk.Widget]) -> dict[tk.Widget, WidgetAttributes]:
+    """Fetches the text, image, background, class and geometry of all the widgets with a
+    single Tcl call.
+    """
+    if len(widgets) == 0:
+        return {}
+
+    try:
+        interpreter = widgets[0].tk
+        # widget._w rather than str(widget), students may override __str__
+        rows = interpreter.splitlist(
+            interpreter.call(
+                "apply", _READ_ATTRIBUTES, tuple(widget._w for widget in widgets)
+            )
+        )
+    except (tk.TclError, AttributeError):
+        return {widget: _read_attributes(widget) for widget in widgets}
+
+    table = {}
+    for widget, row in zip(widgets, rows):
+        row = interpreter.splitlist(row)
+        options = [
+            str(row[i + 1]) if int(row[i]) else None
+            for i in range(0, 2 * len(_OPTIONS), 2)
+        ]
+        tk_class, *geometry = row[2 * len(_OPTIONS) :]
+        table[widget] = WidgetAttributes(*options, str(tk_class), *map(int, geometry))
+
+    return table
+
+
+def _cget(widget: tk.Widget, option: str):
+    """Equivalent to widget.cget(option), answered from the latest WidgetIndex if possible."""
+    index = WidgetIndex._latest
+    if option in _OPTIONS and index is not None and index.generation == _generation:
+        attributes = index.attributes.get(widget)
+        if attributes is not None:
+            value = getattr(attributes, option)
+            if value is None:
+                raise tk.TclError(f'unknown option "-{option}"')
+            return value
+
+    return widget.cget(option)
+
+
+class WidgetIndex:
+    """A snapshot of a widget tree, built in a single traversal.
+
+    Indexes widgets by their class name, text, image and parent, so that repeated
+    lookups within a step don't walk the tree (and query Tcl) again. The attributes
+    of every widget are fetched in bulk (see `fetch_attributes`), and are used by the
+    `WidgetSelector` selectors in place of calls to cget.
+    """
+
+    _latest: Optional["WidgetIndex"] = None
+    _geometry: Optional[Geometry] = None
+
+    def __init__(self, root: tk.Widget):
+        self.root = root
+        self.generation = _generation
+
+        self.widgets: list[tk.Widget] = []
+        self.parents: dict[tk.Widget, Optional[tk.Widget]] = {}
+        self._spans: dict[tk.Widget, tuple[int, int]] = {}
+        self._classes: dict[str, list[tk.Widget]] = defaultdict(list)
+        self._texts: dict[str, list[tk.Widget]] = defaultdict(list)
+        self._rough_texts: dict[str, list[tk.Widget]] = defaultdict(list)
+        self._images: dict[str, list[tk.Widget]] = defaultdict(list)
+
+        self._index(root, None)
+        count("widgets_traversed", len(self.widgets))
+        self.attributes = fetch_attributes(self.widgets)
+
+        for widget, attributes in self.attributes.items():
+            if attributes.text is not None:
+                self._texts[attributes.text].append(widget)
+                self._rough_texts[_relax(attributes.text)].append(widget)
+            if attributes.image:
+                self._images[attributes.image].append(widget)
+
+    @classmethod
+    def of(cls, widget: tk.Widget) -> "WidgetIndex":
+        """Returns an up to date index containing the widget, reusing the last one if possible.
+
+        The returned index may be rooted above the widget, pass it as `within` to restrict
+        lookups to the widget and those beneath it.
+        """
+        latest = cls._latest
+        if (
+            latest is None
+            or latest.generation != _generation
+            or widget not in latest._spans
+        ):
+            latest = cls._latest = cls(widget)
+        return latest
+
+    def _index(self, widget: tk.Widget, parent: Optional[tk.Widget]):
+        start = len(self.widgets)
+        self.widgets.append(widget)
+        self.parents[widget] = parent
+        self._classes[widget.__class__.__name__].append(widget)
+
+        # for child in parent.winfo_children(): doesn't work as students override self._root
+        for child in widget.children.values():
+            self._index(child, widget)
+
+        self._spans[widget] = (start, len(self.widgets))
+
+    def _within(
+        self, widgets: list[tk.Widget], within: Optional[tk.Widget]
+    ) -> list[tk.Widget]:
+        if within is None or within is self.root:
+            return widgets[:]
+        start, end = self._spans[within]
+        return [w for w in widgets if start <= self._spans[w][0] < end]
+
+    @property
+    def geometry(self) -> Geometry:
+        """The positions and sizes of every indexed widget, see `conscience.lib.geometry`"""
+        if self._geometry is None:
+            self._geometry = Geometry(self.widgets, self.attributes)
+        return self._geometry
+
+    def descendants(self, widget: Optional[tk.Widget] = None) -> list[tk.Widget]:
+        """Returns the widget and all widgets beneath it, parents before children."""
+        if widget is None:
+            return self.widgets[:]
+        start, end = self._spans[widget]
+        return self.widgets[start:end]
+
+    def find(
+        self, selector: Selector, within: Optional[tk.Widget] = None
+    ) -> list[tk.Widget]:
+        """Find all widgets (beneath within) which match the supplied selector"""
+        widgets = self.descendants(within)
+        count("widgets_traversed", len(widgets))
+        return [widget for widget in widgets if selector(widget)]
+
+    def by_class_name(
+        self, expected: str, within: Optional[tk.Widget] = None
+    ) -> list[tk.Widget]:
+        return self._within(self._classes.get(expected, []), within)
+
+    def by_text(
+        self, expected: str, within: Optional[tk.Widget] = None
+    ) -> list[tk.Widget]:
+        return self._within(self._texts.get(expected, []), within)
+
+    def by_rough_text(
+        self, expected: str, within: Optional[tk.Widget] = None
+    ) -> list[tk.Widget]:
+        return self._within(self._rough_texts.get(expected, []), within)
+
+    def by_image_id(
+        self, expected: str, within: Optional[tk.Widget] = None
+    ) -> list[tk.Widget]:
+        return self._within(self._images.get(expected, []), within)
 
 
 # Helper method for generating selectors
@@ -61,16 +294,13 @@ class WidgetSelector:
     @staticmethod
     def by_text(expected: str) -> Selector:
         """A selector which returns true iff the supplied text exists on the widget"""
-        return _build_selector(lambda widget: widget.cget("text"), expected)
+        return _build_selector(lambda widget: _cget(widget, "text"), expected)
 
     @staticmethod
     def by_rough_text(expected: str) -> Selector:
         """A selector which returns true iff the supplied text approximately exists on the widget."""
 
-        def relax(text: str) -> str:
-            return text.lower().strip()
-
-        return _build_selector(lambda widget: relax(widget.cget("text")), expected)
+        return _build_selector(lambda widget: _relax(_cget(widget, "text")), expected)
 
     @staticmethod
     def by_label(expected: str) -> Selector:
@@ -83,19 +313,19 @@ class WidgetSelector:
         within the supplied registry."""
 
         def accessor(widget: tk.Widget) -> T | None:
-            image_id = widget.cget("image")
+            image_id = _cget(widget, "image")
             return registry.get(image_id)
 
         return _build_selector(accessor, expected)
 
     @staticmethod
-    def by_image_name(cache: dict[str, ImageTk.PhotoImage], name: str):
+    def by_image_name(cache: dict[str, "ImageTk.PhotoImage"], name: str):
         """A selector which returns true iff the expected image is encountered and exists
         within the supplied registry."""
 
         # for some reason tkinter stores only the strings of the image?
         return _build_selector(
-            lambda widget: widget.cget("image"), str(cache.get(name))
+            lambda widget: _cget(widget, "image"), str(cache.get(name))
         )
 
     @staticmethod
@@ -104,7 +334,7 @@ class WidgetSelector:
 
         def f(widget):
             try:
-                widget.cget("text")
+                _cget(widget, "text")
                 return True
             except tk.TclError:
                 return False
@@ -155,20 +385,7 @@ class CanvasSelector:
         Returns:
             A list of the element ids on the canvas
         """
-        found = []
-        for item in widget.find_all():
-            config = widget.itemconfig(item)
-            if config is None:
-                continue
-
-            if "text" not in config:
-                continue
-
-            # TODO: why 4?
-            if config["text"][4] == expected:
-                found.append(item)
-
-        return found
+        return CanvasIndex.of(widget).with_text(expected)
 
     @staticmethod
     def get_canvas_images(
@@ -181,22 +398,8 @@ class CanvasSelector:
         Returns:
             A list of the element ids on the canvas
         """
-        found = []
-        for item in canvas.find_all():
-            config = canvas.itemconfig(item)
-            if config is None:
-                continue
-
-            if "image" not in config:
-                continue
-
-            # TODO: why 4?
-            image_id = config["image"][4]
-            if image_id not in registry:
-                continue
-
-            image_type = registry[image_id]
-            if image_type == expected:
-                found.append(item)
-
-        return found
+        return [
+            item.id
+            for item in CanvasIndex.of(canvas).all()
+            if item.image in registry and registry[item.image] == expected
+        ]
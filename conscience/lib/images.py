@@ -1,36 +1,115 @@
-from typing import Optional
-from PIL.ImageTk import PhotoImage
+import functools
+import tkinter as tk
+from typing import TYPE_CHECKING, Optional
 
-from loguru import logger
-from PIL.Image import Image
+if TYPE_CHECKING:
+    from PIL.Image import Image
+    from PIL.ImageTk import PhotoImage
 
+# Incremented whenever a Tk image is created, see `_track_images`.
+_generation = 0
 
-def image_id_path(cache: dict[str, PhotoImage], id: str) -> Optional[str]:
+
+def _track_images():
+    """Wraps tkinter.Image.__init__ (which both tk.PhotoImage and ImageTk.PhotoImage
+    create images through), so that ImageIndexes know when they may be stale.
+    """
+    original = tk.Image.__init__
+    if getattr(original, "_tracked", False):
+        return
+
+    @functools.wraps(original)
+    def tracked(self, *args, **kwargs):
+        global _generation
+        original(self, *args, **kwargs)
+        _generation += 1
+
+    tracked._tracked = True
+    tk.Image.__init__ = tracked
+
+
+_track_images()
+
+
+class ImageIndex:
+    """A bidirectional index between Tk image names, the paths in an image cache they
+    were loaded from, and the symbols those paths translate to.
+
+    The index is rebuilt only when an image has been created, or the cache has changed
+    size, since it was last built.
+    """
+
+    def __init__(
+        self,
+        cache: dict[str, "PhotoImage"],
+        translations: Optional[dict[str, str]] = None,
+    ):
+        """
+        Parameters:
+            cache: A mapping from image paths to the corresponding images.
+            translations: A mapping from image paths to their shortened symbols.
+        """
+        self.cache = cache
+        self.translations = translations if translations is not None else {}
+        self._built: Optional[tuple[int, int]] = None
+        self._paths: dict[str, str] = {}
+
+    def _refresh(self):
+        state = (_generation, len(self.cache))
+        if self._built == state:
+            return
+
+        self._paths = {str(image): path for path, image in self.cache.items()}
+        self._built = state
+
+    def path(self, name: str) -> Optional[str]:
+        """Returns the path of the image with this Tk name, if it is in the cache"""
+        self._refresh()
+        return self._paths.get(str(name))
+
+    def symbol(self, name: str) -> Optional[str]:
+        """Returns the symbol of the image with this Tk name, if it has a translation"""
+        return self.translations.get(self.path(name))
+
+    def name(self, path: str) -> Optional[str]:
+        """Returns the Tk name of the image loaded from this path, if it is in the cache"""
+        image = self.cache.get(path)
+        return str(image) if image is not None else None
+
+
+_latest: Optional[ImageIndex] = None
+
+
+def image_id_path(cache: dict[str, "PhotoImage"], id: str) -> Optional[str]:
     """Returns the path of this image_id in the cache if it exists, else None"""
-    for path, image in cache.items():
-        if str(image) == id:
-            return path
+    global _latest
+    if _latest is None or _latest.cache is not cache:
+        _latest = ImageIndex(cache)
+    return _latest.path(id)
 
 
 # TODO: Harry note -> isn't this a glorified dictionary?
 class ImageRegistry:
-    def __init__(self, images: Optional[dict[str, Image]] = None):
+    def __init__(self, images: Optional[dict[str, "Image"]] = None):
         if images is None:
             self._images = {}
         else:
             self._images = images
 
-    def register_image(self, name: str, image: Image):
+    def register_image(self, name: str, image: "Image"):
         self._images[name] = image
 
-    def lookup(self, name: str) -> Optional[Image]:
+    def lookup(self, name: str) -> Optional["Image"]:
         result = self._images.get(name)
         if result is None:
+            # imported here, as importing loguru is slow and this is its only use
+            from loguru import logger
+
             logger.warning(f"unable to find an image corresponding to {name}")
         return result
 
     def __contains__(self, name: str) -> bool:
         return name in self._images
 
-    def __getitem__(self, name: str) -> Optional[Image]:
+    def __getitem__(self, name: str) -> Optional["Image"]:
         return self.lookup(name)
@@ -7,7 +7,16 @@ time steps, to be triggered.
 
 import types
 import functools
-from typing import Callable
+from collections import deque
+from typing import Callable, Iterator, Optional, Sequence
+
+from conscience.profiling import count_calls
+
+Record = tuple[tuple, dict]
+"""The positional and keyword arguments of a logged call"""
+
+RecordPredicate = Callable[[tuple, dict], bool]
+"""Decides from its positional and keyword arguments whether a call is logged"""
 
 
 def copy_function(f: Callable):
@@ -28,6 +37,18 @@ def copy_function(f: Callable):
     return g
 
 
+def silent(inject: Callable) -> Callable:
+    """Marks a mixin's inject method as never returning a value, allowing its calls
+    to skip collecting results.
+    """
+    inject._silent = True
+    return inject
+
+
+def _vacant(*args, **kwargs):
+    return None
+
+
 class MixinBase(object):
     """
     Core mocking functionality, allows calls to methods to be replaced with
@@ -53,30 +74,70 @@ class MixinBase(object):
         callable = getattr(context, reference)
         self._original = copy_function(callable)
         self._context, self._reference = context, reference
-        setattr(self._context, self._reference, self._call)
 
-        for mixin in self.__class__.__mro__:
-            if mixin == self.__class__:
-                continue
-            if hasattr(mixin, "setup"):
+        # resolve the hooks of each mixin once, rather than on every call
+        mixins = [mixin for mixin in self.__class__.__mro__ if mixin != self.__class__]
+        injections = [
+            vars(mixin)["inject"] for mixin in mixins if "inject" in vars(mixin)
+        ]
+        self._call = count_calls(
+            self._chain([types.MethodType(f, self) for f in injections])
+        )
+        # a function set on a class is bound to the instance it's called through, which
+        # would pass the hooks the instance as well as the arguments of the call
+        setattr(self._context, self._reference, staticmethod(self._call))
+
+        for mixin in mixins:
+            if "setup" in vars(mixin):
                 mixin.setup(self)
 
-    def _call(self, *args, **kwargs):
-        results = []
-        for mixin in self.__class__.__mro__:
-            if mixin == self.__class__:
-                continue
-            if hasattr(mixin, "inject"):
-                returned = mixin.inject(self, *args, **kwargs)
+    @staticmethod
+    def _chain(injections: Sequence[Callable]) -> Callable:
+        """Builds a single callable which calls each injection in turn.
+
+        Returns None if no injection returned a value, the value if exactly one did,
+        or a list of the values otherwise.
+        """
+        silent = [f for f in injections if getattr(f, "_silent", False)]
+        returning = [f for f in injections if not getattr(f, "_silent", False)]
+
+        # -- FAST PATHS: the VacantLog, RelayLog and MockLog combinations.
+        if len(injections) == 0:
+            return _vacant
+        if len(injections) == 1:
+            return injections[0]
+        if len(returning) == 0:
+
+            def call(*args, **kwargs):
+                for inject in injections:
+                    inject(*args, **kwargs)
+
+            return call
+        if len(returning) == 1 and injections[-1] is returning[0]:
+            before, inject = injections[:-1], returning[0]
+
+            def call(*args, **kwargs):
+                for f in before:
+                    f(*args, **kwargs)
+                return inject(*args, **kwargs)
+
+            return call
+
+        def call(*args, **kwargs):
+            results = []
+            for inject in injections:
+                returned = inject(*args, **kwargs)
                 if returned is not None:
                     results.append(returned)
 
-        if len(results) == 0:
-            return None
-        elif len(results) == 1:
-            return results[0]
-        else:
-            return results
+            if len(results) == 0:
+                return None
+            elif len(results) == 1:
+                return results[0]
+            else:
+                return results
+
+        return call
 
     def restore(self):
         setattr(self._context, self._reference, self._original)
@@ -102,21 +163,87 @@ class LogMixin(MixinBase):
     called
     >>> mock.logs
     [(('life',), {'answer': 42}), ((), {})]
+
+    Long running simulations can limit how many calls are kept, every call is still counted.
+
+    >>> mock = Logger(MockMe, "do_it").retain(limit=1)
+    >>> mockme.do_it(1)
+    >>> mockme.do_it(2)
+    >>> mock.restore()
+    >>> mock.count, mock.logs
+    (2, [((2,), {})])
     """
 
+    retention_limit: Optional[int] = None
+    """The default number of most recent calls to keep, 0 keeps only a count and None keeps all"""
+
+    retention_predicate: Optional[RecordPredicate] = None
+    """The default filter deciding which calls to keep, None keeps all"""
+
     def setup(self) -> None:
-        self._records = []
-        self._records_with_self = []
+        self.retain(self.retention_limit, self.retention_predicate)
+
+    def retain(
+        self,
+        limit: Optional[int] = None,
+        predicate: Optional[RecordPredicate] = None,
+    ):
+        """Configures which calls are kept in the log, discarding those kept so far.
+
+        Parameters:
+            limit: Keep only the most recent `limit` calls, in a ring buffer. If 0, calls
+                are only counted. If None, every call is kept.
+            predicate: Keep only the calls for which `predicate(args, kwargs)` is true.
+
+        Returns:
+            This mock, to allow chaining from the constructor.
+        """
+        self.count = 0
+        self._predicate = predicate
+        if limit is None:
+            self._records, self._records_with_self = [], []
+        else:
+            self._records = deque(maxlen=limit)
+            self._records_with_self = deque(maxlen=limit)
+        return self
+
+    @property
+    def logs(self) -> list[Record]:
+        return list(self._records)
 
     @property
-    def logs(self):
-        return self._records[:]
+    def records(self) -> "LogView":
+        """A read only view of the kept calls, which unlike `logs` is not a copy"""
+        return LogView(self._records)
 
+    @silent
     def inject(self, *args, **kwargs):
+        self.count += 1
+        if self._predicate is not None and not self._predicate(args, kwargs):
+            return
         self._records.append((args, kwargs))
         self._records_with_self.append((self, args, kwargs))
 
 
+class LogView(Sequence[Record]):
+    """A read only view over the calls kept by a LogMixin."""
+
+    def __init__(self, records: list[Record] | deque[Record]):
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(self._records)
+
+    def __repr__(self) -> str:
+        return repr(list(self._records))
+
+
 class MockMixin(MixinBase):
     """
     Inject arbitrary calls to a mocked reference.
@@ -147,11 +274,7 @@ class MockMixin(MixinBase):
         self._mocks.append(mock)
 
     def inject(self, *args, **kwargs):
-        results = []
-        for mock in self._mocks:
-            returned = results.append(mock(*args, **kwargs))
-            if returned is not None:
-                results.append(returned)
+        results = [mock(*args, **kwargs) for mock in self._mocks]
 
         if len(results) == 0:
             return None
@@ -185,6 +308,7 @@ class RelayMixin(MixinBase):
     [(('life',), {'answer': 42}), ((), {})]
     """
 
+    @silent
     def inject(self, *args, **kwargs):
         self._original(*args, **kwargs)
 
@@ -0,0 +1,219 @@
+"""Reuse a single Tk root window between scenarios.
+
+Creating a Tk interpreter is one of the slowest parts of starting a scenario. Instead,
+`scrub` returns a root window to the state captured by `snapshot` when it was created:
+destroying its children, and removing the bindings, pending calls to after, images,
+fonts, variables, grid weights, geometry propagation, window manager state, settings
+and protocol handlers, and options added since. `reset_root` then compares a fresh snapshot with the original to
+prove that nothing was left behind.
+
+Tk can't list the option database, so `snapshot` traces the calls which change it.
+Once changed, the database is cleared back to the defaults Tk loads on its own.
+"""
+
+import tkinter as tk
+from typing import Any
+
+from conscience.lib.mocking import copy_function
+
+# Suites may replace these to warn students off calling them (see `ConscienceSuite.warn_on`)
+_destroy_widget = copy_function(tk.BaseWidget.destroy)
+_destroy_root = copy_function(tk.Tk.destroy)
+
+WindowState = dict[str, Any]
+
+# the options of a grid column or row which hasn't been configured
+_DEFAULT_SLOT = ("-minsize", 0, "-pad", 0, "-uniform", "", "-weight", 0)
+
+# window manager settings which change the size of the window
+_WM_SIZES = ("resizable", "minsize", "maxsize")
+
+# records the calls to option which change the option database
+_OPTION_TRACE = """
+namespace eval ::conscience {
+    variable options {}
+    proc record_option {command op} {
+        variable options
+        if {[regexp {^(::)?option +[acr]} $command]} {
+            lappend options $command
+        }
+    }
+}
+trace add execution option enter ::conscience::record_option
+"""
+
+
+def _strings(root: tk.Tk, *args) -> list[str]:
+    return [str(value) for value in root.tk.splitlist(root.tk.call(*args))]
+
+
+def _bindings(root: tk.Tk, tag: str) -> dict[str, str]:
+    return {
+        sequence: str(root.tk.call("bind", tag, sequence))
+        for sequence in _strings(root, "bind", tag)
+    }
+
+
+def _pairs(root: tk.Tk, *args) -> dict[str, str]:
+    values = _strings(root, *args)
+    return dict(zip(values[::2], values[1::2]))
+
+
+def _slots(root: tk.Tk, command: str) -> dict[int, dict[str, str]]:
+    """The options of the grid columns (or rows) of the root window which have been
+    configured, e.g. given a weight.
+    """
+    columns, rows = (int(size) for size in _strings(root, "grid", "size", root._w))
+    slots = {}
+    for index in range(columns if command == "columnconfigure" else rows):
+        options = _pairs(root, "grid", command, root._w, index)
+        if any(value not in ("0", "") for value in options.values()):
+            slots[index] = options
+    return slots
+
+
+def _option_changes(root: tk.Tk) -> list[str]:
+    """The calls which changed the option database since the first snapshot of the root."""
+    if not root.tk.getboolean(root.tk.call("namespace", "exists", "::conscience")):
+        root.tk.eval(_OPTION_TRACE)
+    return _strings(root, "set", "::conscience::options")
+
+
+def _options(root: tk.Tk) -> dict[str, str]:
+    options = {}
+    for entry in root.tk.splitlist(root.tk.call(root._w, "configure")):
+        entry = root.tk.splitlist(entry)
+        # synonyms such as -bg only have two entries
+        if len(entry) == 5:
+            options[str(entry[0])] = str(entry[4])
+    return options
+
+
+def snapshot(root: tk.Tk) -> WindowState:
+    """Captures everything about the root window a scenario may change."""
+    return {
+        "children": _strings(root, "winfo", "children", root._w),
+        "python_children": sorted(root.children),
+        "after": _strings(root, "after", "info"),
+        "bindings": _bindings(root, root._w),
+        "all_bindings": _bindings(root, "all"),
+        "bindtags": _strings(root, "bindtags", root._w),
+        "images": sorted(_strings(root, "image", "names")),
+        "fonts": sorted(_strings(root, "font", "names")),
+        "globals": sorted(_strings(root, "info", "globals")),
+        "title": str(root.tk.call("wm", "title", root._w)),
+        # e.g. withdrawn or iconified by the scenario
+        "wm_state": str(root.tk.call("wm", "state", root._w)),
+        "overrideredirect": str(root.tk.call("wm", "overrideredirect", root._w)),
+        "protocols": {
+            protocol: str(root.tk.call("wm", "protocol", root._w, protocol))
+            for protocol in _strings(root, "wm", "protocol", root._w)
+        },
+        "wm": {
+            command: _strings(root, "wm", command, root._w) for command in _WM_SIZES
+        },
+        "wm_attributes": _pairs(root, "wm", "attributes", root._w),
+        "columnconfigure": _slots(root, "columnconfigure"),
+        "rowconfigure": _slots(root, "rowconfigure"),
+        "propagate": {
+            manager: str(root.tk.call(manager, "propagate", root._w))
+            for manager in ("pack", "grid")
+        },
+        "options": _options(root),
+        "option_changes": _option_changes(root),
+        "attributes": sorted(vars(root)),
+        "commands": list(root._tclCommands or []),
+    }
+
+
+def scrub(root: tk.Tk, baseline: WindowState):
+    """Undoes everything done to the root window since the baseline snapshot."""
+    call = root.tk.call
+
+    for after_id in _strings(root, "after", "info"):
+        call("after", "cancel", after_id)
+
+    for child in list(root.children.values()):
+        _destroy_widget(child)
+    # widgets created directly in Tcl have no python object
+    for path in _strings(root, "winfo", "children", root._w):
+        call("destroy", path)
+
+    for tag, bound in ((root._w, "bindings"), ("all", "all_bindings")):
+        current = _bindings(root, tag)
+        for sequence in current.keys() - baseline[bound].keys():
+            call("bind", tag, sequence, "")
+        for sequence, script in baseline[bound].items():
+            if current.get(sequence) != script:
+                call("bind", tag, sequence, script)
+    call("bindtags", root._w, tuple(baseline["bindtags"]))
+
+    for image in set(_strings(root, "image", "names")) - set(baseline["images"]):
+        call("image", "delete", image)
+    for font in set(_strings(root, "font", "names")) - set(baseline["fonts"]):
+        call("font", "delete", font)
+    for name in set(_strings(root, "info", "globals")) - set(baseline["globals"]):
+        call("unset", "-nocomplain", name)
+
+    call("wm", "title", root._w, baseline["title"])
+    call("wm", "geometry", root._w, "")
+    for protocol in _strings(root, "wm", "protocol", root._w):
+        call("wm", "protocol", root._w, protocol, "")
+    for protocol, script in baseline["protocols"].items():
+        call("wm", "protocol", root._w, protocol, script)
+    for command, values in baseline["wm"].items():
+        if _strings(root, "wm", command, root._w) != values:
+            call("wm", command, root._w, *values)
+    current = _pairs(root, "wm", "attributes", root._w)
+    for attribute, value in baseline["wm_attributes"].items():
+        if current.get(attribute) != value:
+            call("wm", "attributes", root._w, attribute, value)
+    if str(call("wm", "overrideredirect", root._w)) != baseline["overrideredirect"]:
+        call("wm", "overrideredirect", root._w, baseline["overrideredirect"])
+    if str(call("wm", "state", root._w)) != baseline["wm_state"]:
+        call("wm", "state", root._w, baseline["wm_state"])
+
+    # after destroying the children, so only configured columns and rows remain
+    for command in ("columnconfigure", "rowconfigure"):
+        for index in _slots(root, command):
+            call("grid", command, root._w, index, *_DEFAULT_SLOT)
+        for index, options in baseline[command].items():
+            flat = [value for option in options.items() for value in option]
+            call("grid", command, root._w, index, *flat)
+    for manager, propagate in baseline["propagate"].items():
+        call(manager, "propagate", root._w, propagate)
+
+    if _option_changes(root) != baseline["option_changes"]:
+        call("option", "clear")
+        for command in baseline["option_changes"]:
+            root.tk.eval(command)
+        call("set", "::conscience::options", tuple(baseline["option_changes"]))
+
+    current = _options(root)
+    for option, value in baseline["options"].items():
+        if current.get(option) != value:
+            call(root._w, "configure", option, value)
+
+    for name in (root._tclCommands or [])[len(baseline["commands"]) :]:
+        root.deletecommand(name)
+    for attribute in set(vars(root)) - set(baseline["attributes"]):
+        delattr(root, attribute)
+
+    root.update_idletasks()
+
+
+def reset_root(root: tk.Tk, baseline: WindowState) -> bool:
+    """Scrubs the root window, returning whether it now matches the baseline exactly."""
+    try:
+        scrub(root, baseline)
+        return snapshot(root) == baseline
+    except tk.TclError:
+        # e.g. the root window was destroyed
+        return False
+
+
+def destroy_root(root: tk.Tk):
+    try:
+        _destroy_root(root)
+    except tk.TclError:
+        pass
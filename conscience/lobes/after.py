@@ -1,8 +1,11 @@
+import heapq
 import tkinter as tk
+from typing import Callable
 
 from behave.runner import Context
 from behave import *
 
+from conscience.lib.identify import invalidate_widget_index
 from conscience.lib.mocking import MockLog
 from conscience.lobes.lobe import Lobe
 
@@ -12,14 +15,15 @@ class MockAfter(Lobe):
 
     def on_start(self, context, suite):
         context.after = AfterSimulator()
-        after_mock = MockLog(tk.Tk, "after")
+        # game loops call after every tick, only count the calls
+        after_mock = MockLog(tk.Tk, "after").retain(limit=0)
         after_mock.register(context.after.after)
-        after_mock = MockLog(tk.Widget, "after")
+        after_mock = MockLog(tk.Widget, "after").retain(limit=0)
         after_mock.register(context.after.after)
 
-        after_cancel_mock = MockLog(tk.Tk, "after_cancel")
+        after_cancel_mock = MockLog(tk.Tk, "after_cancel").retain(limit=0)
         after_cancel_mock.register(context.after.after_cancel)
-        after_cancel_mock = MockLog(tk.Widget, "after_cancel")
+        after_cancel_mock = MockLog(tk.Widget, "after_cancel").retain(limit=0)
         after_cancel_mock.register(context.after.after_cancel)
 
         @when("one second passes")
@@ -32,33 +36,55 @@ class MockAfter(Lobe):
 
 
 class AfterSimulator:
-    """Simulates .after bindings in tkinter"""
+    """Simulates .after bindings in tkinter
+
+    Keeps a virtual clock (in milliseconds) and a heap of pending callbacks, so that
+    stepping the clock jumps straight from one due callback to the next.
+    """
 
     def __init__(self) -> None:
         self._bind_id = 0
-        self._bindings = []
+        # heap of (due time, bind id), ordered by when they were scheduled on ties
+        self._queue: list[tuple[int, int]] = []
+        self._callbacks: dict[int, tuple[Callable, tuple]] = {}
         self._step = 0
 
     def step(self, step=1):
-        if len(self._bindings) == 0:
+        if len(self._callbacks) == 0:
             print("no calls to after")
-        for i in range(1, step + 1):
-            for _, time, callback in self._bindings[:]:
-                if time == self._step + 1:
-                    callback()
-                    self._bindings.pop(0)
-            self._step += 1
-
-    def after(self, time, callback):
+
+        end = self._step + step
+        while self._queue and self._queue[0][0] <= end:
+            due, bind_id = heapq.heappop(self._queue)
+            scheduled = self._callbacks.pop(bind_id, None)
+            if scheduled is None:
+                # cancelled
+                continue
+
+            # callbacks scheduling more callbacks do so relative to when they fired
+            self._step = due
+            callback, args = scheduled
+            callback(*args)
+
+        self._step = end
+        invalidate_widget_index()
+
+    def after(self, time, callback=None, *args):
         self._bind_id += 1
-        self._bindings.append((self._bind_id, self._step + time, callback))
+        if callback is None:
+            # after(ms) without a callback sleeps, which is meaningless here
+            return self._bind_id
+
+        # mimic tkinter, which never runs a callback within the call that scheduled it
+        due = self._step + max(int(time), 1)
+        heapq.heappush(self._queue, (due, self._bind_id))
+        self._callbacks[self._bind_id] = (callback, args)
         return self._bind_id
 
     def after_cancel(self, bind_id, *args):
-        to_remove = []
-        for i, (_id, _, _callback) in enumerate(self._bindings):
-            if _id == bind_id:
-                to_remove.append(i)
+        # the heap entry is skipped once it comes due
+        self._callbacks.pop(bind_id, None)
 
-        for i in to_remove:
-            removed = self._bindings.pop(i)
+    def pending(self) -> int:
+        """Returns the number of callbacks still waiting to be called"""
+        return len(self._callbacks)
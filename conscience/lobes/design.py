@@ -1,41 +1,58 @@
-import inspect
 from behave import *
 
 import tkinter as tk
+from conscience.lib.design import ImportedDesign, StaticDesign, static_design
 from conscience.lobes.lobe import Lobe
 
 
 class CodeDesign(Lobe):
     """Lobe which adds functionality to check that certain classes and functions are defined."""
 
+    def __init__(self, static: bool = False):
+        """
+        Parameters:
+            static: Whether to answer design checks from the source of the target,
+                rather than by inspecting the imported module. Static checks still work
+                when the target fails to import, and with a configuration that doesn't
+                execute the target at all (see `ConscienceConfiguration.execute_target`).
+        """
+        self.static = static
+
     def on_load(self, suite):
         load_design_tests()
 
 
+def design_of(context) -> ImportedDesign | StaticDesign:
+    """Returns the design of the software under test, as the suite's CodeDesign prefers."""
+    suite = getattr(context, "suite", None)
+    lobes = suite._lobes if suite is not None else []
+    static = any(isinstance(lobe, CodeDesign) and lobe.static for lobe in lobes)
+
+    under_test = getattr(context, "under_test", None)
+    if static or under_test is None:
+        return static_design(context.config.target)
+    return ImportedDesign(under_test)
+
+
 def load_design_tests():
     @given("the {clazz:w} class is defined")
     def class_defined(context, clazz):
-        assert hasattr(context.under_test, clazz), f"{clazz} not defined"
-        assert isinstance(
-            getattr(context.under_test, clazz), type
-        ), f"{clazz} is not a class"
+        definition = design_of(context).lookup(clazz)
+        assert definition is not None, f"{clazz} not defined"
+        assert definition.is_class, f"{clazz} is not a class"
 
     @given("the {func:w} function is defined")
     def function_defined(context, func):
-        assert hasattr(context.under_test, func), f"{func} not defined"
-        assert callable(getattr(context.under_test, func)), f"{func} is not callable"
+        definition = design_of(context).lookup(func)
+        assert definition is not None, f"{func} not defined"
+        assert definition.callable, f"{func} is not callable"
 
     @given("{func:w} function takes {args:d} positional parameters")
     def function_takes_args(context, func, args):
-        assert hasattr(context.under_test, func), f"{func} not defined"
-        func_obj = getattr(context.under_test, func)
-
-        parameters = inspect.signature(func_obj).parameters
-        positional_parameters = [
-            param
-            for param in parameters
-            if parameters[param].kind != inspect.Parameter.VAR_KEYWORD
-        ]
+        definition = design_of(context).lookup(func)
+        assert definition is not None, f"{func} not defined"
+
+        positional_parameters = definition.positional_parameters()
         num_args = len(positional_parameters)
         assert (
             num_args == args
@@ -43,35 +60,31 @@ def load_design_tests():
 
     @given("{subclazz:w} class inherits from {clazz:w}")
     def subclazz_inherits_from_clazz(context, subclazz, clazz):
-        assert hasattr(context.under_test, clazz), f"{clazz} not defined"
-        assert hasattr(context.under_test, subclazz), f"{subclazz} not defined"
-        assert issubclass(
-            getattr(context.under_test, subclazz), getattr(context.under_test, clazz)
+        design = design_of(context)
+        assert design.lookup(clazz) is not None, f"{clazz} not defined"
+        assert design.lookup(subclazz) is not None, f"{subclazz} not defined"
+        assert design.inherits(
+            subclazz, clazz
         ), f"{subclazz} does not inherit from {clazz}"
 
     @given("{subclazz:w} class inherits from tk.{clazz:w}")
     def subclazz_inherits_from_tk_clazz(context, subclazz, clazz):
-        assert hasattr(context.under_test, subclazz), f"{subclazz} not defined"
-        assert issubclass(
-            getattr(context.under_test, subclazz), getattr(tk, clazz)
+        design = design_of(context)
+        assert design.lookup(subclazz) is not None, f"{subclazz} not defined"
+        assert design.inherits(
+            subclazz, getattr(tk, clazz)
         ), f"{subclazz} does not inherit from {clazz}"
 
     @given("{clazz:w}.{method:w} with {params:d} positional parameters is defined")
     def method_defined(context, clazz, method, params):
-        assert hasattr(context.under_test, clazz), f"{clazz} not defined"
-
-        clazz_obj = getattr(context.under_test, clazz)
-        assert hasattr(clazz_obj, method), f"{clazz}.{method} not defined"
+        design = design_of(context)
+        assert design.lookup(clazz) is not None, f"{clazz} not defined"
 
-        method_obj = getattr(clazz_obj, method)
-        assert callable(method_obj), f"{clazz}.{method} is not callable"
+        definition = design.member(clazz, method)
+        assert definition is not None, f"{clazz}.{method} not defined"
+        assert definition.callable, f"{clazz}.{method} is not callable"
 
-        parameters = inspect.signature(method_obj).parameters
-        positional_parameters = [
-            param
-            for param in parameters
-            if parameters[param].kind != inspect.Parameter.VAR_KEYWORD
-        ]
+        positional_parameters = definition.positional_parameters()
         num_args = len(positional_parameters)
         assert (
             num_args == params
@@ -83,15 +96,8 @@ def load_design_tests():
     def method_defined_kw(context, clazz, method, params, kwargs):
         method_defined(context, clazz, method, params)
 
-        clazz_obj = getattr(context.under_test, clazz)
-        method_obj = getattr(clazz_obj, method)
-
-        parameters = inspect.signature(method_obj).parameters
-        keyword_parameters = [
-            param
-            for param in parameters
-            if parameters[param].kind == inspect.Parameter.VAR_KEYWORD
-        ]
+        definition = design_of(context).member(clazz, method)
+        keyword_parameters = definition.keyword_parameters()
         num_kwargs = len(keyword_parameters)
 
         assert (
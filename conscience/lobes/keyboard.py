@@ -1,11 +1,12 @@
-from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
 import tkinter as tk
+from typing import Callable, Optional
 
 from behave.runner import Context
 from behave import *
 
+from conscience.lib.identify import invalidate_widget_index
 from conscience.lib.mocking import VacantLog, MockLog
 from conscience.lobes.lobe import Lobe
 
@@ -24,7 +25,10 @@ class TrackKeypresses(Lobe):
 
     def on_start(self, context, suite):
         TrackKeypresses._enabled = True
-        context.key_binds = VacantLog(tk.Tk, "bind")
+        context.key_bindings = KeyBindings()
+        # the bindings table keeps the latest binds, so only keep recent calls for debugging
+        context.key_binds = MockLog(tk.Tk, "bind").retain(limit=100)
+        context.key_binds.register(context.key_bindings.bind)
 
         bind_all_mock = MockLog(tk.Tk, "bind_all")
         bind_all_mock.register(
@@ -44,7 +48,8 @@ def all_key_formats(key: str) -> list[str]:
     for form in key, key.upper(), key.capitalize():
         result.extend([x.format(form) for x in KEY_FORMATS])
 
-    return result
+    # single letters are the same upper cased and capitalised
+    return list(dict.fromkeys(result))
 
 
 @dataclass
@@ -70,65 +75,74 @@ class Events(Enum):
     RETURN = KeyEvent(" ", "return", 0)
 
 
-def keypress_func(key_binds):
-    # gather all bound functions that should always be invoked
-    always_call = []
-    for events in KEY_EVENT_TYPES:
-        kp = key_binds.get(events)
-        if kp is not None:
-            always_call.append(kp)
-
-    # build a mapping of keys to all the possible variations of their binding
-    key_calls = defaultdict(list)
-    for key in ("w", "a", "s", "d"):
-        for keybind in all_key_formats(key):
-            keycb = key_binds.get(keybind)
-            if keycb is not None:
-                key_calls[key].append(keycb)
-
-    def callback(event):
-        found_call = False
-        # try the generic
-        for call in always_call:
-            found_call = True
-            call(event)
-
-        # try the specific
-        keycb = key_calls[event.keysym.lower()]
-        for call in keycb:
-            found_call = True
-            call(event)
-
-        # fail if no call was found
-        if not found_call:
-            print(key_binds)
-            assert (
-                False
-            ), f"unable to find an appropriate keyboard binding to call for {event.keysym.lower()}"
-
-    return callback
+# key -> every bind sequence which refers to it, for every key in Events
+KEY_BINDS: dict[str, tuple[str, ...]] = {
+    event.value.keysym.lower(): tuple(all_key_formats(event.value.keysym.lower()))
+    for event in Events
+}
+# bind sequence -> the key it refers to
+KEY_BIND_KEYSYMS: dict[str, str] = {
+    sequence: key for key, sequences in KEY_BINDS.items() for sequence in sequences
+}
+
+
+class KeyBindings:
+    """A dispatch table from keys to the callbacks bound to them, kept up to date as
+    bind is called, so that pressing a key is a single lookup.
+    """
+
+    def __init__(self) -> None:
+        self.binds: dict[str, Callable] = {}
+        self.count = 0
+        self.malformed: Optional[tuple] = None
+        self._table: dict[str, list[Callable]] = {}
+
+    def bind(self, *args, **kwargs):
+        self.count += 1
+        if len(args) < 2:
+            self.malformed = args
+            return
+
+        key_bind, callback = args[0], args[1]
+        self.binds[key_bind] = callback
+
+        if key_bind in KEY_EVENT_TYPES:
+            self._table.clear()
+        elif key_bind in KEY_BIND_KEYSYMS:
+            self._table.pop(KEY_BIND_KEYSYMS[key_bind], None)
+
+    def callbacks(self, keysym: str) -> list[Callable]:
+        """Returns the callbacks to invoke when the key is pressed, the generic
+        bindings followed by those specific to the key.
+        """
+        key = keysym.lower()
+        callbacks = self._table.get(key)
+        if callbacks is None:
+            sequences = KEY_EVENT_TYPES + KEY_BINDS.get(key, ())
+            callbacks = [self.binds[seq] for seq in sequences if seq in self.binds]
+            self._table[key] = callbacks
+        return callbacks
 
 
 def press(context, key):
-    if len(context.key_binds.logs) == 0:
+    bindings: KeyBindings = context.key_bindings
+    if bindings.count == 0:
         assert (
             False
         ), "no calls made to the tkinter bind method, see: https://web.archive.org/web/20171112175007/http://www.effbot.org/tkinterbook/widget.htm#Tkinter.Widget.bind-method"
 
-    method_calls = context.key_binds.logs
-
-    key_binds = {}
-    for call in method_calls:
-        positional_arguments = call[0]
-
-        if len(positional_arguments) < 2:
-            assert (
-                False
-            ), f"call to bind does not specify a key and a callback, got: bind({', '.join(positional_arguments)})"
-
-        key_bind = positional_arguments[0]
-        callback = positional_arguments[1]
+    if bindings.malformed is not None:
+        assert (
+            False
+        ), f"call to bind does not specify a key and a callback, got: bind({', '.join(map(str, bindings.malformed))})"
 
-        key_binds[key_bind] = callback
+    callbacks = bindings.callbacks(key.keysym)
+    if len(callbacks) == 0:
+        print(bindings.binds)
+        assert (
+            False
+        ), f"unable to find an appropriate keyboard binding to call for {key.keysym.lower()}"
 
-    keypress_func(key_binds)(key)
+    for callback in callbacks:
+        callback(key)
+    invalidate_widget_index()
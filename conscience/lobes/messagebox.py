@@ -87,22 +87,22 @@ class MockMessagebox(Lobe):
         @then("no messageboxes have been displayed")
         def no_messageboxes(context):
             assert (
-                len(context.message_boxes.logs) == 0
-            ), f"found {len(context.message_boxes.logs)} calls create messageboxes: {context.message_boxes.logs}"
+                len(context.message_boxes.records) == 0
+            ), f"found {len(context.message_boxes.records)} calls create messageboxes: {context.message_boxes.records}"
             assert (
-                len(context.dialog.logs) == 0
-            ), f"found {len(context.dialog.logs)} calls create dialogs: {context.dialog.logs}"
+                len(context.dialog.records) == 0
+            ), f"found {len(context.dialog.records)} calls create dialogs: {context.dialog.records}"
 
         @then("a messagebox should be displayed")
         def messagebox_displayed(context):
-            potential_calls = context.message_boxes.logs + context.dialog.logs
+            potential_calls = [*context.message_boxes.records, *context.dialog.records]
             assert (
                 len(potential_calls) == 1
             ), f"found {len(potential_calls)} calls create messageboxes: {potential_calls}"
 
         @then('the messagebox should say "{text}"')
         def messagebox_text(context, text):
-            potential_calls = context.message_boxes.logs + context.dialog.logs
+            potential_calls = [*context.message_boxes.records, *context.dialog.records]
             assert (
                 len(potential_calls) == 1
             ), f"found {len(potential_calls)} calls create messageboxes: {potential_calls}"
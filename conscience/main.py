@@ -7,6 +7,7 @@ from conscience.config import ConscienceConfiguration
 
 from behave.__main__ import run_behave
 from conscience.parsers import register_parsers
+from conscience.runner import ConscienceRunner
 from conscience.score import GradescopeResults, TestScore
 
 
@@ -34,11 +35,26 @@ def witness(
     Returns:
         The score representing how the student did on the tests.
         If the Configuration passed in is not a GradescopeConfiguration, returns
-        a dummy score.
+        a dummy score. If the configuration has a result cache which has already
+        seen this target and test suite, returns the stored score instead.
     """
     if config.working_directory:
         chdir(config.working_directory)
 
+    cache = config.result_cache
+    if cache is not None:
+        key = cache.key(config, target)
+        results = cache.get(key)
+        if results is not None:
+            return results
+
+    results = _witness(config, target)
+    if cache is not None:
+        cache.put(key, results)
+    return results
+
+
+def _witness(config: ConscienceConfiguration, target: Path) -> GradescopeResults:
     if config.suite:
         config.suite.load()
 
@@ -51,7 +67,7 @@ def witness(
     except Exception as e:
         return config.handle_load_failure(e)
 
-    run_behave(config)
+    run_behave(config, runner_class=ConscienceRunner)
     return config.read_results()
 
 
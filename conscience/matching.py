@@ -0,0 +1,117 @@
+"""Match step text to step definitions once per process, rather than once per step.
+
+behave finds the definition of a step by trying the pattern of every registered
+definition in turn, twice for every step run (once to check for undefined steps, once
+to run it). Grading a cohort runs the same step lines thousands of times.
+
+A `CachedStepRegistry` wraps behave's step registry, skipping definitions whose
+literal prefix (the text before their first field) the step doesn't start with, and
+remembering the match found for each step text. The matches are kept for as long as
+the process lives, e.g. across every submission graded by a batch worker, and are
+forgotten whenever a step definition is registered (e.g. by a lobe's `on_start`).
+"""
+
+import weakref
+from typing import Optional
+
+from behave.matchers import Match, Matcher, ParseMatcher
+from behave.step_registry import StepRegistry
+
+
+def literal_prefix(matcher: Matcher) -> str:
+    """The text every step matched by the definition starts with, in lower case.
+
+    Only known for parse patterns, e.g. 'it is {pixels} pixels wide' starts with
+    'it is '. Regular expressions are assumed to match anything.
+    """
+    if not isinstance(matcher, ParseMatcher):
+        return ""
+
+    pattern, prefix, i = matcher.pattern, [], 0
+    while i < len(pattern):
+        if pattern.startswith(("{{", "}}"), i):
+            prefix.append(pattern[i])
+            i += 2
+        elif pattern[i] == "{":
+            break
+        else:
+            prefix.append(pattern[i])
+            i += 1
+    # parse patterns ignore case, unlike str.startswith
+    return "".join(prefix).lower()
+
+
+class CachedStepRegistry:
+    """A step registry which remembers the match of every step text it has seen."""
+
+    def __init__(self, registry: StepRegistry):
+        self.registry = registry
+        self.hits = 0
+        self.misses = 0
+        self._size = -1
+        self._matches: dict[tuple[str, str], Optional[Match]] = {}
+        self._prefixes: dict[int, str] = {}
+
+    def _check(self):
+        """Forgets every match if step definitions have been added since."""
+        size = sum(len(definitions) for definitions in self.registry.steps.values())
+        if size != self._size:
+            self._size = size
+            self._matches.clear()
+            self._prefixes = {
+                id(definition): literal_prefix(definition)
+                for definitions in self.registry.steps.values()
+                for definition in definitions
+            }
+
+    def _candidates(self, step_type: str, name: str) -> list[Matcher]:
+        # the same definitions, in the same order, as StepRegistry.find_match tries
+        candidates = self.registry.steps[step_type]
+        if step_type != "step":
+            candidates = candidates + self.registry.steps["step"]
+
+        lowered = name.lower()
+        return [
+            definition
+            for definition in candidates
+            if lowered.startswith(self._prefixes[id(definition)])
+        ]
+
+    def find_match(self, step) -> Optional[Match]:
+        self._check()
+        key = (step.step_type, step.name)
+        if key in self._matches:
+            self.hits += 1
+            return self._matches[key]
+
+        self.misses += 1
+        match = None
+        for definition in self._candidates(*key):
+            match = definition.match(step.name)
+            if match:
+                break
+        self._matches[key] = match or None
+        return match or None
+
+    def find_step_definition(self, step) -> Optional[Matcher]:
+        self._check()
+        for definition in self._candidates(step.step_type, step.name):
+            if definition.match(step.name):
+                return definition
+        return None
+
+    def __getattr__(self, name):
+        return getattr(self.registry, name)
+
+
+_cached: "weakref.WeakKeyDictionary[StepRegistry, CachedStepRegistry]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def cached_registry(registry: StepRegistry) -> CachedStepRegistry:
+    """Returns the cached registry wrapping the registry, shared by every run in this process."""
+    cached = _cached.get(registry)
+    if cached is None:
+        cached = _cached[registry] = CachedStepRegistry(registry)
+    return cached
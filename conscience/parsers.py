@@ -1,4 +1,4 @@
-"""This module describes patterns that parse step instructions, and forward 
+"""This module describes patterns that parse step instructions, and forward
 the matching elements as arguments to the step function.
 
 For an example, see the `relative_to_all` function in `steps.py`, which makes
@@ -18,7 +18,8 @@ class RelativePosition(Enum):
     Below = 3
 
 
-@parse.with_pattern(r"(\w|\s|\d|.)*")
+# any text, including newlines, without the backtracking of an alternation
+@parse.with_pattern(r"[\s\S]*")
 def parse_string(text):
     logger.debug(f"Parsing Text pattern: {text}")
     return text
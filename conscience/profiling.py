@@ -0,0 +1,200 @@
+"""Profile where the time goes while grading a submission.
+
+Profiling is opt-in: give the configuration a `Profiler`, and `ConscienceRunner`
+records for every step:
+    - the wall clock and CPU time it took;
+    - the number of calls it made into Tcl;
+    - the number of calls intercepted by mocks (see `conscience.lib.mocking`);
+    - the number of widgets traversed to find widgets (see `conscience.lib.identify`).
+
+    config.profiler = Profiler()
+    witness(config, target)
+    report = config.profiler.report()
+
+`Profiler.report` is a JSON serialisable report for the submission, and
+`aggregate_profiles` summarises the reports of a cohort per scenario.
+
+Tcl calls are only counted for interpreters created while profiling, such as the root
+window of each scenario, as they are counted by a proxy around the interpreter.
+Mocks are likewise only counted if they were installed while profiling. Nothing is
+counted, or wrapped, while no profiler is active.
+"""
+
+import json
+import statistics
+import time
+import tkinter
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, TypedDict
+
+if TYPE_CHECKING:
+    from behave.model import Scenario, Step
+
+COUNTERS = ("tcl_calls", "mock_calls", "widgets_traversed")
+
+
+class StepProfile(TypedDict):
+    keyword: str
+    name: str
+    status: str
+    wall: float
+    """Wall clock time in seconds"""
+    cpu: float
+    """CPU time in seconds"""
+    tcl_calls: int
+    mock_calls: int
+    widgets_traversed: int
+
+
+class ScenarioProfile(TypedDict):
+    name: str
+    steps: list[StepProfile]
+
+
+# The profiler currently recording, see `Profiler.recording`
+_active: Optional["Profiler"] = None
+
+
+def count(counter: str, n: int = 1):
+    """Adds n to a counter of the step being profiled, if any."""
+    if _active is not None and _active._counts is not None:
+        _active._counts[counter] += n
+
+
+def count_calls(function: Callable, counter: str = "mock_calls") -> Callable:
+    """Wraps the function to count its calls, if a profiler is recording.
+
+    Like any function, the wrapper is bound as a method when set on a class, so mocks
+    install it as a staticmethod, to be called with the same arguments either way.
+    """
+    if _active is None:
+        return function
+
+    def counted(*args, **kwargs):
+        count(counter)
+        return function(*args, **kwargs)
+
+    return counted
+
+
+class _CountingInterpreter:
+    """A proxy around a Tcl interpreter counting the calls made through it."""
+
+    def __init__(self, interpreter):
+        self._interpreter = interpreter
+
+    def call(self, *args):
+        count("tcl_calls")
+        return self._interpreter.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._interpreter, name)
+
+
+_create = tkinter._tkinter.create
+
+
+def _create_counting(*args, **kwargs):
+    interpreter = _create(*args, **kwargs)
+    if _active is None:
+        return interpreter
+    return _CountingInterpreter(interpreter)
+
+
+class Profiler:
+    """Records the cost of each step of a run, see the module documentation."""
+
+    def __init__(self):
+        self.scenarios: list[ScenarioProfile] = []
+        self._counts: Optional[Counter] = None
+        self._started = (0.0, 0.0)
+
+    @contextmanager
+    def recording(self) -> Iterator["Profiler"]:
+        """Makes this the profiler counting calls, for the duration of the context."""
+        global _active
+        previous, _active = _active, self
+        tkinter._tkinter.create = _create_counting
+        try:
+            yield self
+        finally:
+            _active = previous
+            if previous is None:
+                tkinter._tkinter.create = _create
+
+    def before_scenario(self, scenario: "Scenario"):
+        # imported here, so the mocks and widget index can count calls without behave
+        from conscience.formatters import test_name
+
+        self.scenarios.append({"name": test_name(scenario), "steps": []})
+
+    def before_step(self):
+        self._counts = Counter()
+        self._started = (time.perf_counter(), time.process_time())
+
+    def after_step(self, step: "Step"):
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+        counts, self._counts = self._counts or Counter(), None
+        if len(self.scenarios) == 0:
+            return
+
+        self.scenarios[-1]["steps"].append(
+            {
+                "keyword": step.keyword,
+                "name": step.name,
+                "status": step.status.name,
+                "wall": wall,
+                "cpu": cpu,
+                **{counter: counts[counter] for counter in COUNTERS},
+            }
+        )
+
+    def report(self) -> list[ScenarioProfile]:
+        """The profile of every scenario run, in the order they were run."""
+        return self.scenarios
+
+    def write(self, path: Path):
+        """Writes the report to the path as JSON."""
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def aggregate_profiles(reports: Iterable[list[ScenarioProfile]]) -> dict[str, dict]:
+    """Summarises the reports of many submissions, per scenario.
+
+    Returns:
+        For each scenario, the number of submissions which ran it, the median, 95th
+        percentile and maximum of its total wall clock and CPU time, and the mean of
+        each counter per submission.
+    """
+    totals: dict[str, list[dict[str, float]]] = {}
+    for report in reports:
+        for scenario in report:
+            total = {
+                measure: sum(step[measure] for step in scenario["steps"])
+                for measure in ("wall", "cpu", *COUNTERS)
+            }
+            totals.setdefault(scenario["name"], []).append(total)
+
+    summary = {}
+    for name, runs in totals.items():
+        summary[name] = {"runs": len(runs)}
+        for measure in ("wall", "cpu"):
+            values = [run[measure] for run in runs]
+            summary[name][measure] = {
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "max": max(values),
+            }
+        for counter in COUNTERS:
+            summary[name][counter] = statistics.fmean(run[counter] for run in runs)
+    return summary
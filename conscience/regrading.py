@@ -0,0 +1,105 @@
+"""Regrade submissions, re-running only the scenarios which have changed.
+
+Every test written by the `GradescopeFormatter` records a fingerprint of its scenario
+in its `extra_data`. Given the results of a previous run, `regrade` runs only the
+scenarios which are new, or whose fingerprint has changed, and merges their results
+with the previous results of the unchanged scenarios. Scenarios which no longer exist
+are dropped.
+"""
+
+from pathlib import Path
+
+from behave.model import Scenario
+
+from conscience.config import ConscienceConfiguration
+from conscience.formatters import scenario_fingerprint, test_name
+from conscience.main import witness
+from conscience.score import GradescopeResults, aggregate_results
+
+
+def previous_fingerprints(previous: GradescopeResults) -> dict[str, str]:
+    """Maps the name of each test in the previous results to its scenario fingerprint."""
+    fingerprints = {}
+    for test in previous.get("tests", []):
+        fingerprint = test.get("extra_data", {}).get("fingerprint")
+        if "name" in test and fingerprint is not None:
+            fingerprints[test["name"]] = fingerprint
+    return fingerprints
+
+
+class ChangedScenarios:
+    """A `scenario_filter` which selects the scenarios that changed since the previous
+    results, recording the order in which it saw every scenario.
+    """
+
+    def __init__(self, previous: GradescopeResults):
+        self.fingerprints = previous_fingerprints(previous)
+        self.order: dict[str, int] = {}
+        self.changed: set[str] = set()
+
+    def __call__(self, scenario: Scenario) -> bool:
+        name = test_name(scenario)
+        self.order.setdefault(name, len(self.order))
+
+        if self.fingerprints.get(name) == scenario_fingerprint(scenario):
+            return False
+
+        self.changed.add(name)
+        return True
+
+    def merge(
+        self, previous: GradescopeResults, rerun: GradescopeResults
+    ) -> GradescopeResults:
+        """Combines the results of the re-run scenarios with the previous results of
+        those that didn't change, in the order of the current features.
+        """
+        # tests which aren't scenarios (e.g. metadata) are taken from the new run
+        current = [
+            test
+            for test in rerun["tests"]
+            if test.get("name") in self.changed or test.get("name") not in self.order
+        ]
+        kept = [
+            test
+            for test in previous["tests"]
+            if test.get("name") in self.order and test.get("name") not in self.changed
+        ]
+
+        header = {key: value for key, value in rerun.items() if key != "tests"}
+        merged = aggregate_results(header, {"tests": current}, {"tests": kept})
+        merged["tests"].sort(key=lambda test: self.order.get(test.get("name"), -1))
+        return merged
+
+
+def regrade(
+    config: ConscienceConfiguration, target: Path, previous: GradescopeResults
+) -> GradescopeResults:
+    """Tests a target assessment file again, re-running only the scenarios which are
+    new or have changed since the previous results were graded.
+
+    Parameters:
+        config: A GradescopeConfiguration, already setup (see `conscience.config.setup_config`).
+        target: The target file to run the tests on, see `conscience.main.witness`.
+        previous: The results of grading the same target with an earlier version of the tests.
+
+    Returns:
+        The merged results. If the previous results hold no tests, e.g. as the target
+        failed to load, every scenario is run again.
+    """
+    if "tests" not in previous:
+        return witness(config, target)
+
+    selector = ChangedScenarios(previous)
+    config.scenario_filter = selector
+    # partial results must never be stored as if they were complete
+    cache, config.result_cache = config.result_cache, None
+    try:
+        rerun = witness(config, target)
+    finally:
+        config.scenario_filter = None
+        config.result_cache = cache
+
+    if "tests" not in rerun:
+        return rerun
+
+    return selector.merge(previous, rerun)
@@ -0,0 +1,121 @@
+"""The behave runner used by conscience.
+
+Behaves the same as `behave.runner.Runner`, except that the features to run may be
+supplied up front by the configuration, or read from its `FeatureCache`, instead of
+being parsed from disk each run, and that the time and CPU budgets of each scenario
+are enforced (see `conscience.budget`). If the configuration has a profiler, the cost
+of each step is recorded (see `conscience.profiling`). Steps are matched to their
+definitions through a cache shared by every run in the process (see
+`conscience.matching`).
+"""
+
+from contextlib import contextmanager, nullcontext
+
+from behave.formatter._registry import make_formatters
+from behave.model import Feature
+from behave.runner import Context, Runner
+from behave.runner_util import parse_features
+from behave.step_registry import registry
+
+from conscience.budget import BudgetEnforcer, BudgetFailure
+from conscience.lib.identify import invalidate_widget_index
+from conscience.matching import cached_registry
+
+
+class ConscienceContext(Context):
+    """A behave context which runs the code of steps and hooks within the time budgets
+    of the runner.
+    """
+
+    @contextmanager
+    def use_with_user_mode(self):
+        with self._runner.budgets.running(), super().use_with_user_mode():
+            yield
+
+
+class ConscienceRunner(Runner):
+    def __init__(self, config):
+        super().__init__(config)
+        self.step_registry = cached_registry(registry)
+        self.budgets = BudgetEnforcer(config)
+        self.profiler = getattr(config, "profiler", None)
+
+    def parse_features(self) -> list[Feature]:
+        """Returns the features to run, preferring those already parsed by the config,
+        then those in the config's feature cache.
+        """
+        features = getattr(self.config, "features", None)
+        if features is not None:
+            return features
+
+        locations = [
+            filename
+            for filename in self.feature_locations()
+            if not self.config.exclude(filename)
+        ]
+
+        cache = getattr(self.config, "feature_cache", None)
+        if cache is not None:
+            return cache.parse(locations, language=self.config.lang)
+
+        return parse_features(locations, language=self.config.lang)
+
+    def select_scenarios(self):
+        """Skips the scenarios rejected by the config's `scenario_filter`, and any
+        feature left without scenarios to run.
+        """
+        selected = getattr(self.config, "scenario_filter", None)
+        if selected is None:
+            return
+
+        for feature in self.features:
+            skipped = 0
+            scenarios = list(feature.walk_scenarios())
+            for scenario in scenarios:
+                if not selected(scenario):
+                    scenario.mark_skipped()
+                    skipped += 1
+
+            if skipped == len(scenarios):
+                feature.mark_skipped()
+
+    def run_hook(self, name, context, *args):
+        if name == "before_scenario":
+            self.budgets.before_scenario(*args)
+            if self.profiler is not None:
+                self.profiler.before_scenario(*args)
+        elif name == "before_step":
+            # steps may change the GUI in ways we can't observe
+            invalidate_widget_index()
+        elif name == "after_step":
+            self.budgets.after_step()
+            (step,) = args
+            # like hook_failed, so the formatter can tell the results depend on the machine
+            step.over_budget = isinstance(
+                getattr(step, "exception", None), BudgetFailure
+            )
+            if self.profiler is not None:
+                self.profiler.after_step(*args)
+
+        super().run_hook(name, context, *args)
+
+        # only time the step itself, not the user's hooks around it
+        if name == "before_step":
+            if self.profiler is not None:
+                self.profiler.before_step()
+            self.budgets.before_step()
+
+    def run_with_paths(self):
+        self.context = ConscienceContext(self)
+        self.load_hooks()
+        self.load_step_definitions()
+
+        self.features.extend(self.parse_features())
+        self.select_scenarios()
+
+        self.formatters = make_formatters(self.config, self.config.outputs)
+        recording = (
+            nullcontext() if self.profiler is None else self.profiler.recording()
+        )
+        with recording:
+            return self.run_model()
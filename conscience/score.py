@@ -2,7 +2,7 @@ from io import BytesIO
 import sys
 import json
 from logging import error
-from typing import Literal, NotRequired, TypedDict
+from typing import BinaryIO, Literal, NotRequired, TypedDict
 
 TestStatus = Literal["passed", "failed"]
 OutputFormat = Literal["text", "html", "simple_format", "md", "ansi"]
@@ -62,6 +62,28 @@ def read_results_from_stream(stream: BytesIO) -> GradescopeResults:
         return error_results(stream.read().decode())
 
 
+def read_results_from_ndjson(stream: BinaryIO) -> GradescopeResults:
+    """Reassembles results written one test per line by a streaming GradescopeFormatter.
+
+    A final line which was only partially written, e.g. when grading timed out, is ignored.
+    """
+    stream.seek(0)
+    tests: list[TestScore] = []
+    for line in stream:
+        if len(line.strip()) == 0:
+            continue
+        try:
+            tests.append(json.loads(line))
+        except json.JSONDecodeError:
+            break
+
+    if len(tests) == 0:
+        stream.seek(0)
+        return error_results(stream.read().decode())
+
+    return {"tests": tests}
+
+
 def aggregate_tests(*results: GradescopeResults) -> list[TestScore]:
     scores = []
 
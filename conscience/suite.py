@@ -26,6 +26,8 @@ from typing import Any, Optional
 
 from loguru import logger
 
+from conscience.lib.window import WindowState, destroy_root, reset_root, snapshot
+
 
 def warn(message):
     def inner(*args, **kwargs):
@@ -43,9 +45,12 @@ def warn(message):
 @dataclass
 class ConscienceSuite:
     seed: Optional[int] = None
+    reuse_window: bool = False
+    """Whether `start` reuses one root window for every scenario, scrubbing it in between"""
     _overwrites: dict[str, Any] = field(default_factory=dict)
     _warnings: list[tuple[Any, Any, str]] = field(default_factory=list)
     _lobes: list = field(default_factory=list)
+    _reusable: Optional[tuple[tk.Tk, WindowState]] = None
 
     def enable(self, feature):
         self._lobes.append(feature)
@@ -82,4 +87,20 @@ class ConscienceSuite:
         for feature in self._lobes:
             feature.on_start(context, self)
 
-        self.window = tk.Tk()
+        self.window = self._create_window()
+
+    def _create_window(self) -> tk.Tk:
+        if not self.reuse_window:
+            return tk.Tk()
+
+        if self._reusable is not None:
+            window, baseline = self._reusable
+            if reset_root(window, baseline):
+                return window
+
+            logger.debug("could not scrub the previous window, creating a new one")
+            destroy_root(window)
+
+        window = tk.Tk()
+        self._reusable = (window, snapshot(window))
+        return window
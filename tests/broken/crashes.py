@@ -0,0 +1,5 @@
+"""A submission which ends the grading process as soon as it is loaded."""
+
+import os
+
+os._exit(1)
@@ -0,0 +1,5 @@
+"""A submission which exits as soon as it is loaded."""
+
+import sys
+
+sys.exit(1)
@@ -0,0 +1,27 @@
+"""
+Helpers shared between the tests.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from conscience import build_config, setup_config
+from conscience.cache import ResultCache
+from conscience.suite import ConscienceSuite
+
+
+def hello_world_config(cache: Optional[ResultCache] = None):
+    """Builds a gradescope configuration for the hello world tests, storing results in
+    the cache if one is given. A module level function, so that it can be passed to
+    the workers of `conscience.witness_all`.
+    """
+    config = build_config(is_gradescope=True)
+    setup_config(
+        config,
+        ConscienceSuite(),
+        tests=[Path("tests/hello_world_tests")],
+        steps_dir=Path("steps"),
+        environment_file=Path("environment.py"),
+    )
+    config.result_cache = cache
+    return config
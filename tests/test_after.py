@@ -0,0 +1,50 @@
+"""
+Test the virtual clock used to simulate calls to after.
+"""
+
+import unittest
+
+from conscience.lobes.after import AfterSimulator
+
+
+class TestAfterSimulator(unittest.TestCase):
+    def test_order(self):
+        after = AfterSimulator()
+        calls = []
+        after.after(200, calls.append, "second")
+        after.after(100, calls.append, "first")
+        after.after(300, calls.append, "third")
+
+        after.step(250)
+        self.assertEqual(calls, ["first", "second"])
+        after.step(50)
+        self.assertEqual(calls, ["first", "second", "third"])
+
+    def test_reschedule(self):
+        after = AfterSimulator()
+        ticks = []
+
+        def tick():
+            ticks.append(after._step)
+            after.after(100, tick)
+
+        after.after(100, tick)
+        after.step(60_000)
+
+        self.assertEqual(len(ticks), 600)
+        self.assertEqual(ticks[:3], [100, 200, 300])
+        self.assertEqual(after.pending(), 1)
+
+    def test_cancel(self):
+        after = AfterSimulator()
+        calls = []
+        bind_id = after.after(100, calls.append, "cancelled")
+        after.after(100, calls.append, "kept")
+        after.after_cancel(bind_id)
+
+        after.step(1000)
+        self.assertEqual(calls, ["kept"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Test grading several submissions over a pool of workers.
+"""
+
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import unittest
+
+from conscience import witness_all
+from tests.conftest import hello_world_config
+
+
+class TestWitnessAll(unittest.TestCase):
+    def test_hello_world(self):
+        target = Path("tests/hello_world/hello_world_gui.py")
+        graded = list(
+            witness_all(
+                hello_world_config,
+                [target] * 3,
+                workers=2,
+                submissions_per_worker=1,
+            )
+        )
+
+        self.assertEqual(len(graded), 3)
+        for submission in graded:
+            self.assertEqual(submission.target, target)
+            self.assertIn("tests", submission.results)
+            self.assertIsNotNone(submission.worker)
+            self.assertGreater(submission.peak_rss, 0)
+
+    def test_exiting_submission(self):
+        target = Path("tests/broken/exits.py")
+        healthy = Path("tests/hello_world/hello_world_gui.py")
+        graded = {
+            submission.target: submission
+            for submission in witness_all(
+                hello_world_config, [target, healthy], workers=1
+            )
+        }
+
+        self.assertEqual(graded[target].results["score"], 0)
+        self.assertIn("SystemExit", graded[target].results["output"])
+        self.assertIn("tests", graded[healthy].results)
+
+    def test_crashing_submission(self):
+        target = Path("tests/broken/crashes.py")
+        with self.assertRaises(BrokenProcessPool):
+            list(witness_all(hello_world_config, [target], workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
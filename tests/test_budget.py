@@ -0,0 +1,89 @@
+"""
+Test that steps exceeding their time budgets are interrupted.
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+
+from conscience.budget import BudgetEnforcer
+
+
+def scenario(*tags):
+    return SimpleNamespace(tags=list(tags))
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestBudgetEnforcer(unittest.TestCase):
+    def run_step(self, budgets, seconds):
+        budgets.before_step()
+        try:
+            with budgets.running():
+                busy(seconds)
+        finally:
+            budgets.after_step()
+
+    def test_step_timeout(self):
+        budgets = BudgetEnforcer(SimpleNamespace())
+        budgets.before_scenario(scenario("stepTimeout(0.05)"))
+
+        with self.assertRaisesRegex(AssertionError, "step exceeded"):
+            self.run_step(budgets, 1)
+
+    def test_scenario_timeout(self):
+        budgets = BudgetEnforcer(SimpleNamespace(scenario_timeout=0.1))
+        budgets.before_scenario(scenario())
+
+        self.run_step(budgets, 0.06)
+        with self.assertRaisesRegex(AssertionError, "scenario exceeded its time"):
+            self.run_step(budgets, 0.06)
+
+    def test_cpu(self):
+        budgets = BudgetEnforcer(SimpleNamespace())
+        budgets.before_scenario(scenario("cpu(0.05)"))
+
+        with self.assertRaisesRegex(AssertionError, "CPU budget"):
+            self.run_step(budgets, 1)
+
+    def test_unlimited(self):
+        budgets = BudgetEnforcer(SimpleNamespace())
+        budgets.before_scenario(scenario("weight(2)"))
+        self.run_step(budgets, 0.01)
+
+    def test_not_swallowed(self):
+        budgets = BudgetEnforcer(SimpleNamespace())
+        budgets.before_scenario(scenario("stepTimeout(0.05)"))
+        start = time.perf_counter()
+
+        budgets.before_step()
+        try:
+            with self.assertRaises(AssertionError):
+                with budgets.running():
+                    # swallows the first interruption, the next is a moment later
+                    try:
+                        busy(1)
+                    except BaseException:
+                        pass
+                    try:
+                        busy(1)
+                    except Exception:
+                        pass
+                    busy(1)
+        finally:
+            budgets.after_step()
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_only_interrupts_steps(self):
+        budgets = BudgetEnforcer(SimpleNamespace())
+        budgets.before_scenario(scenario("stepTimeout(0.01)"))
+
+        budgets.before_step()
+        try:
+            busy(0.3)
+        finally:
+            budgets.after_step()
@@ -0,0 +1,149 @@
+"""
+Test that grading results are reused for unchanged submissions.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from conscience import witness
+from conscience.cache import ResultCache
+from tests.conftest import hello_world_config
+
+SLOW_FEATURE = """
+Feature: Budgets
+
+  @stepTimeout(0.05)
+  Scenario: Slow
+    When the grader waits for a second
+"""
+
+SLOW_STEPS = """
+import time
+from behave import when
+
+@when("the grader waits for a second")
+def wait(context):
+    time.sleep(1)
+"""
+
+
+class TestResultCache(unittest.TestCase):
+    def test_hit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(Path(directory))
+            target = Path("tests/hello_world/hello_world_gui.py")
+
+            graded = witness(hello_world_config(cache), target)
+            cached = witness(hello_world_config(cache), target)
+
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(graded, cached)
+
+    def test_suite_changes(self):
+        cache = ResultCache(Path("unused"))
+        config = hello_world_config(cache)
+        before = cache.suite_fingerprint(config)
+
+        config.suite.seed = 10017030
+        self.assertNotEqual(cache.suite_fingerprint(config), before)
+
+    def test_suite_edited(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tests = Path(directory, "tests")
+            shutil.copytree("tests/hello_world_tests", tests)
+            cache = ResultCache(Path(directory, "cache"))
+            config = hello_world_config(cache)
+            config.paths = [tests.as_posix()]
+            before = cache.suite_fingerprint(config)
+
+            with open(tests / "features" / "functions.feature", "a") as feature:
+                feature.write("\n    Scenario: Added\n")
+            self.assertNotEqual(cache.suite_fingerprint(config), before)
+
+    def test_metadata_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(Path(directory))
+            config = hello_world_config(cache)
+            target = Path("tests/hello_world/hello_world_gui.py")
+            before = cache.key(config, target)
+
+            categories = Path(directory, "categories.csv")
+            categories.write_text("email,postgrad\nstudent@uq.edu.au,True\n")
+            config.student_categories = categories.as_posix()
+            config.student_metadata = categories.as_posix()
+            postgrad = cache.key(config, target)
+            self.assertNotEqual(postgrad, before)
+
+            categories.write_text("email,postgrad\nstudent@uq.edu.au,\n")
+            self.assertNotEqual(cache.key(config, target), postgrad)
+
+    def test_load_error_not_stored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(Path(directory))
+            target = Path("tests/hello_world/missing.py")
+
+            witness(hello_world_config(cache), target)
+            witness(hello_world_config(cache), target)
+
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_hook_failure_not_stored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(Path(directory))
+            test = {"score": 0, "extra_data": {"hook_failed": True}}
+
+            cache.put("key", {"tests": [test]})
+            self.assertIsNone(cache.get("key"))
+
+    def test_budget_failure_not_stored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tests = Path(directory, "tests")
+            (tests / "features").mkdir(parents=True)
+            (tests / "steps").mkdir()
+            (tests / "features" / "slow.feature").write_text(SLOW_FEATURE)
+            (tests / "steps" / "slow.py").write_text(SLOW_STEPS)
+            cache = ResultCache(Path(directory, "cache"))
+            config = hello_world_config(cache)
+            config.paths = [tests.as_posix()]
+            target = Path("tests/hello_world/hello_world_gui.py")
+
+            results = witness(config, target)
+            witness(config, target)
+
+            (test,) = results["tests"]
+            self.assertTrue(test["extra_data"]["over_budget"])
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_submission_uses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            submissions = Path(directory)
+            (submissions / "images").mkdir()
+            target = submissions / "a1.py"
+            target.write_text('import helpers\nPLAYER = "images/player.png"\n')
+            (submissions / "helpers.py").write_text('DATA = "data.txt"\n')
+            (submissions / "images" / "player.png").write_bytes(b"player")
+            (submissions / "data.txt").write_text("data")
+            cache = ResultCache(Path("unused"))
+
+            for used in ["helpers.py", "images/player.png", "data.txt"]:
+                before = cache.submission_fingerprint(target)
+                with open(submissions / used, "a") as f:
+                    f.write("\n")
+                self.assertNotEqual(cache.submission_fingerprint(target), before, used)
+
+    def test_sibling_submissions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            submissions = Path(directory)
+            target = submissions / "a1.py"
+            target.write_text("import tkinter\n")
+            sibling = submissions / "a1_other.py"
+            sibling.write_text("import tkinter\n")
+            cache = ResultCache(Path("unused"))
+            before = cache.submission_fingerprint(target)
+
+            sibling.write_text("import tkinter as tk\n")
+            (submissions / "a1_another.py").write_text("import tkinter\n")
+            (submissions / "data.csv").write_text("unused")
+            self.assertEqual(cache.submission_fingerprint(target), before)
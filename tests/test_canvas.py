@@ -0,0 +1,110 @@
+"""
+Test that the canvas index agrees with the canvas as items change.
+"""
+
+import tkinter as tk
+import unittest
+
+from conscience.lib.canvas import CanvasIndex
+from conscience.lib.grid import SerializedGrid
+
+
+class TestCanvasIndex(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("no display available")
+        self.addCleanup(self.root.destroy)
+        self.canvas = tk.Canvas(self.root, width=200, height=200)
+
+    def assertAgrees(self, index: CanvasIndex, area):
+        self.assertEqual(index.enclosed(*area), self.canvas.find_enclosed(*area))
+
+    def test_incremental(self):
+        canvas = self.canvas
+        first = canvas.create_rectangle(10, 10, 40, 40, tags="cell")
+        index = CanvasIndex.of(canvas)
+        self.assertAgrees(index, (0, 0, 50, 50))
+
+        second = canvas.create_text(20, 20, text="hello")
+        canvas.move(first, 100, 100)
+        self.assertAgrees(index, (0, 0, 50, 50))
+        self.assertAgrees(index, (100, 100, 150, 150))
+
+        canvas.itemconfigure(second, text="goodbye")
+        self.assertEqual(index.with_text("goodbye"), [second])
+
+        canvas.itemconfigure(second, state="hidden")
+        self.assertAgrees(index, (0, 0, 50, 50))
+
+        canvas.delete("cell")
+        self.assertEqual([item.id for item in index.all()], [second])
+        canvas.delete("all")
+        self.assertEqual(index.all(), [])
+
+    def draw_on_borders(self):
+        """Draws items of every kind on, and a pixel either side of, the borders of
+        20 pixel cells.
+        """
+        canvas = self.canvas
+        self.image = tk.PhotoImage(width=20, height=20)
+        for i, offset in enumerate((-1, 0, 1)):
+            x, y = 20 + offset, 20 + 40 * i + offset
+            canvas.create_rectangle(x, y, x + 20, y + 20)
+            canvas.create_rectangle(x + 40, y, x + 60, y + 20, width=3, fill="red")
+            canvas.create_rectangle(x + 80, y, x + 100, y + 20, outline="", fill="red")
+            canvas.create_oval(x + 120, y, x + 140, y + 20)
+            canvas.create_text(x + 160, y, text="hi", anchor="nw")
+            canvas.create_image(x, y + 120, image=self.image, anchor="nw")
+            canvas.create_line(x + 40, y + 120, x + 60, y + 120)
+            canvas.create_polygon(x + 80, y + 120, x + 100, y + 120, x + 90, y + 140)
+
+    def test_enclosed_at_borders(self):
+        self.draw_on_borders()
+        index = CanvasIndex.of(self.canvas)
+
+        areas = [
+            (x + shift, y + shift, x + shift + 20, y + shift + 20)
+            for shift in (-2, -1, 0, 1, 2)
+            for x in range(0, 200, 20)
+            for y in range(0, 200, 20)
+        ]
+        self.assertEqual(
+            index.enclosed_many(areas),
+            [self.canvas.find_enclosed(*area) for area in areas],
+        )
+
+    def test_serialize_at_borders(self):
+        self.canvas.configure(highlightthickness=0, borderwidth=0)
+        self.canvas.pack()
+        self.draw_on_borders()
+        self.root.update()
+        grid = SerializedGrid(self.canvas, (10, 10))
+
+        serialized = grid.serialize()
+        for (row, column), items in serialized.items():
+            x, y = column * 20, row * 20
+            self.assertEqual(items, self.canvas.find_enclosed(x, y, x + 20, y + 20))
+
+
+class TestPendingChanges(unittest.TestCase):
+    def setUp(self):
+        # never queried, so never needs a canvas
+        self.index = CanvasIndex(None)
+        self.index._stale = False
+
+    def test_repeated_changes(self):
+        for _ in range(10000):
+            self.index.invalidate(1)
+            self.index.invalidate("player")
+
+        self.assertEqual(list(self.index._pending), [1, "player"])
+        self.assertFalse(self.index._stale)
+
+    def test_many_changes(self):
+        for item in range(10000):
+            self.index.invalidate(item)
+
+        self.assertLessEqual(len(self.index._pending), CanvasIndex.PENDING_LIMIT)
+        self.assertTrue(self.index._stale)
@@ -0,0 +1,149 @@
+"""
+Test that the static design of a submission agrees with its imported design.
+"""
+
+import sys
+import tempfile
+import tkinter as tk
+import unittest
+from pathlib import Path
+
+from conscience.config import load_under_test
+from conscience.lib.design import ImportedDesign, StaticDesign, static_design
+
+SOURCE = """
+import tkinter as tk
+from tkinter import Canvas
+
+
+def main(root, *args, key=None, **kwargs):
+    pass
+
+
+class Model:
+    def __init__(self, rows, columns):
+        pass
+
+    def move(self, direction, /):
+        pass
+
+    @classmethod
+    def load(cls, path):
+        pass
+
+    @property
+    def size(self):
+        return 0
+
+
+class Game(Model):
+    pass
+
+
+class View(tk.Frame):
+    def redraw(self, model, **kwargs):
+        pass
+
+
+class Grid(Canvas):
+    pass
+
+
+LIMIT = 10
+
+
+if __name__ == "__main__":
+    # never defined when imported as the software under test
+    def launch():
+        pass
+
+    class App(tk.Frame):
+        pass
+"""
+
+
+class TestStaticDesign(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "submission.py"
+        self.path.write_text(SOURCE)
+
+        self.designs = [
+            ImportedDesign(load_under_test(self.path)),
+            static_design(self.path),
+        ]
+
+    def assertAgree(self, question):
+        imported, static = (question(design) for design in self.designs)
+        self.assertEqual(static, imported)
+
+    def test_lookup(self):
+        names = ("main", "Model", "Game", "View", "LIMIT", "missing", "Canvas", "App")
+        for name in names:
+            self.assertAgree(lambda design: design.lookup(name))
+
+    def test_members(self):
+        for clazz, name in [
+            ("Model", "__init__"),
+            ("Model", "move"),
+            ("Model", "load"),
+            ("Game", "move"),
+            ("View", "redraw"),
+            ("View", "pack"),
+            ("Grid", "create_text"),
+            ("Game", "missing"),
+        ]:
+            self.assertAgree(lambda design: design.member(clazz, name))
+
+    def test_inherits(self):
+        for subclazz, clazz in [
+            ("Game", "Model"),
+            ("Model", "Game"),
+            ("Grid", "Canvas"),
+            ("View", tk.Frame),
+            ("View", tk.Widget),
+            ("Grid", tk.Frame),
+        ]:
+            self.assertAgree(lambda design: design.inherits(subclazz, clazz))
+
+    def test_cached(self):
+        self.assertIs(static_design(self.path), self.designs[1])
+
+    def test_broken_import(self):
+        design = StaticDesign("import not_a_module\n\nclass App:\n    pass\n")
+        self.assertTrue(design.lookup("App").is_class)
+
+    def test_not_imported(self):
+        if "sched" in sys.modules:
+            self.skipTest("sched has already been imported")
+
+        design = StaticDesign(
+            "import sched\n\nclass Timetable(sched.scheduler):\n    pass\n"
+        )
+        self.assertEqual(
+            design.lookup("Timetable").positional_parameters(),
+            ["timefunc", "delayfunc"],
+        )
+        self.assertTrue(design.member("Timetable", "enter").callable)
+        self.assertNotIn("sched", sys.modules)
+
+        import sched
+
+        self.assertTrue(design.inherits("Timetable", sched.scheduler))
+
+    def test_local_module(self):
+        support = self.path.with_name("design_support.py")
+        support.write_text(
+            "class Entity:\n    def __init__(self, name, health=10):\n        pass\n"
+        )
+        self.path.write_text(
+            "from design_support import Entity\n\nclass Player(Entity):\n    pass\n"
+        )
+
+        design = static_design(self.path)
+        self.assertEqual(
+            design.lookup("Player").positional_parameters(), ["name", "health"]
+        )
+        self.assertTrue(design.inherits("Player", "Entity"))
+        self.assertNotIn("design_support", sys.modules)
@@ -0,0 +1,26 @@
+"""
+Test the pool of headless displays.
+"""
+
+import shutil
+import unittest
+
+from conscience.display import DisplayPool, display_ready
+
+
+@unittest.skipUnless(shutil.which("Xvfb"), "Xvfb is not installed")
+class TestDisplayPool(unittest.TestCase):
+    def test_restart(self):
+        with DisplayPool(2, check_interval=None) as displays:
+            self.assertEqual(len(set(displays.names)), 2)
+            self.assertTrue(all(map(display_ready, displays.names)))
+
+            crashed = displays.displays[0]
+            crashed.process.kill()
+            crashed.process.wait()
+
+            self.assertEqual(displays.check(), 1)
+            self.assertTrue(crashed.healthy())
+            self.assertEqual(crashed.restarts, 1)
+
+        self.assertFalse(any(map(display_ready, displays.names)))
@@ -0,0 +1,42 @@
+"""
+Test that parsed feature files are cached and handed out as fresh copies.
+"""
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from conscience.features import FeatureCache
+
+FEATURE = "tests/dayz/features/00_display_gui.feature"
+
+
+class TestFeatureCache(unittest.TestCase):
+    def test_fresh_copies(self):
+        cache = FeatureCache()
+        first, second = cache.parse([FEATURE]), cache.parse([FEATURE])
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(
+            [scenario.name for scenario in first[0].scenarios],
+            [scenario.name for scenario in second[0].scenarios],
+        )
+
+    def test_save_and_load(self):
+        cache = FeatureCache()
+        cache.parse([FEATURE])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "features.pickle"
+            cache.save(path)
+            loaded = FeatureCache.load(path)
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(
+            loaded.parse([FEATURE])[0].name, cache.parse([FEATURE])[0].name
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Test grading submissions in children of a pre-warmed fork server.
+"""
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from conscience import witness
+from conscience.cache import ResultCache
+from conscience.forkserver import ForkServer
+from conscience.profiling import Profiler
+from tests.conftest import hello_world_config
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestForkServer(unittest.TestCase):
+    def setUp(self):
+        self.home = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.home)
+
+    def test_hello_world(self):
+        server = ForkServer(hello_world_config())
+        target = Path("tests/hello_world/hello_world_gui.py")
+
+        graded = list(server.witness_all([target] * 3, workers=2))
+
+        self.assertEqual(len(graded), 3)
+        for submission in graded:
+            self.assertIn("tests", submission.results)
+            self.assertEqual(len(submission.results["tests"]), 1)
+
+    def test_result_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = hello_world_config()
+            config.result_cache = ResultCache(Path(directory))
+            server = ForkServer(config)
+            target = Path("tests/hello_world/hello_world_gui.py")
+
+            (graded,) = server.witness_all([target])
+            os.chdir(self.home)
+
+            # the child stored its results where this process can find them
+            self.assertEqual(witness(config, target), graded.results)
+            self.assertEqual(config.result_cache.hits, 1)
+
+    def test_profiler(self):
+        config = hello_world_config()
+        config.profiler = Profiler()
+        server = ForkServer(config)
+        target = Path("tests/hello_world/hello_world_gui.py")
+
+        (graded,) = server.witness_all([target])
+
+        self.assertIsNotNone(graded.profile)
+        self.assertEqual(len(graded.profile), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
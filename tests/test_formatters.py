@@ -0,0 +1,46 @@
+"""
+Test how the gradescope formatter scores scenarios.
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from behave.parser import parse_feature
+
+from conscience.formatters import GradescopeFormatter
+
+FEATURE = """
+Feature: Window
+
+  @weight(2)
+  Scenario: Title
+    Then the window title is "Hello"
+"""
+
+
+class TestGradescopeFormatter(unittest.TestCase):
+    def setUp(self):
+        config = SimpleNamespace(student_metadata=None, student_categories=None)
+        self.formatter = GradescopeFormatter(SimpleNamespace(stream=None), config)
+        self.scenario = parse_feature(FEATURE).scenarios[0]
+
+    def test_steps_not_failed(self):
+        self.formatter.scenario(self.scenario)
+        test = self.formatter._make_test()
+
+        self.assertEqual((test["score"], test["max_score"]), (2, 2))
+
+    def test_hook_failed(self):
+        # as set by behave when the before_scenario hook raises, before any steps run
+        self.scenario.hook_failed = True
+        self.scenario.error_message = "HOOK-ERROR in before_scenario: TclError"
+        self.formatter.scenario(self.scenario)
+        test = self.formatter._make_test()
+
+        # previously scored 2, since none of its steps had failed
+        self.assertEqual((test["score"], test["max_score"]), (0, 2))
+        self.assertIn("HOOK-ERROR in before_scenario", test["output"])
+
+
+if __name__ == "__main__":
+    unittest.main()
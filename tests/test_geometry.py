@@ -0,0 +1,53 @@
+"""
+Test layout queries over a snapshot of widget geometry.
+"""
+
+import unittest
+
+from conscience.lib.geometry import Geometry
+from conscience.lib.identify import WidgetAttributes
+
+
+def attributes(left, top, width, height):
+    return WidgetAttributes(
+        None, None, None, "Frame", left, top, width, height, left, top
+    )
+
+
+class TestGeometry(unittest.TestCase):
+    def setUp(self):
+        # a window containing a centred title above two side by side buttons
+        self.window, self.title, self.ok, self.cancel = (
+            "window",
+            "title",
+            "ok",
+            "cancel",
+        )
+        self.geometry = Geometry(
+            [self.window, self.title, self.ok, self.cancel],
+            {
+                self.window: attributes(0, 0, 200, 100),
+                self.title: attributes(50, 0, 100, 20),
+                self.ok: attributes(0, 50, 100, 50),
+                self.cancel: attributes(100, 50, 100, 50),
+            },
+        )
+
+    def test_directions(self):
+        geometry = self.geometry
+        self.assertEqual(
+            geometry.left_of(self.cancel), [self.window, self.title, self.ok]
+        )
+        self.assertEqual(geometry.right_of(self.title), [self.cancel])
+        self.assertEqual(geometry.above(self.ok), [self.window, self.title])
+        self.assertEqual(geometry.below(self.title), [self.ok, self.cancel])
+
+    def test_areas(self):
+        geometry = self.geometry
+        self.assertEqual(geometry.overlapping(self.ok), [self.window])
+        self.assertEqual(
+            geometry.contained_in(self.window), [self.title, self.ok, self.cancel]
+        )
+        self.assertEqual(geometry.aligned(self.ok, "top"), [self.cancel])
+        self.assertEqual(geometry.centred(self.window), [self.title])
+        self.assertEqual(geometry.size(self.ok), (100, 50))
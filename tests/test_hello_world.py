@@ -4,6 +4,7 @@ Test a very simple GUI.
 
 from pathlib import Path
 
+import tempfile
 import unittest
 
 from conscience import build_config, setup_config, witness
@@ -39,5 +40,43 @@ class TestHelloWorldGradeScope(unittest.TestCase):
         print(results)
 
 
+class TestHelloWorldStreaming(unittest.TestCase):
+    def test_hello_world(self):
+        suite = ConscienceSuite()
+        config = build_config(is_gradescope=True, streaming=True)
+        setup_config(
+            config,
+            suite,
+            tests=[Path("tests/hello_world_tests")],
+            steps_dir=Path("steps"),
+            environment_file=Path("environment.py"),
+        )
+        results = witness(config, Path("tests/hello_world/hello_world_gui.py"))
+        self.assertEqual(len(results["tests"]), 1)
+
+
+class TestHelloWorldResultsFile(unittest.TestCase):
+    def test_closed_after_each_target(self):
+        suite = ConscienceSuite()
+        config = build_config(is_gradescope=True, streaming=True)
+        setup_config(
+            config,
+            suite,
+            tests=[Path("tests/hello_world_tests")],
+            steps_dir=Path("steps"),
+            environment_file=Path("environment.py"),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            config.results_path = Path(directory) / "results.ndjson"
+
+            results = witness(config, Path("tests/hello_world/hello_world_gui.py"))
+            self.assertEqual(len(results["tests"]), 1)
+            self.assertTrue(config.output_stream.closed)
+
+            results = witness(config, Path("tests/hello_world/missing.py"))
+            self.assertNotIn("tests", results)
+            self.assertTrue(config.output_stream.closed)
+
+
 if __name__ == "__main__":
     unittest.main()
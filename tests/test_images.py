@@ -0,0 +1,39 @@
+"""
+Test the reverse index from Tk image names to paths and symbols.
+"""
+
+import unittest
+
+from conscience.lib.images import ImageIndex, image_id_path
+
+
+class FakeImage:
+    """Stands in for a PhotoImage, which needs a display to create"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+
+class TestImageIndex(unittest.TestCase):
+    def test_lookup(self):
+        cache = {"images/hero.png": FakeImage("pyimage1")}
+        index = ImageIndex(cache, {"images/hero.png": "P"})
+
+        self.assertEqual(index.path("pyimage1"), "images/hero.png")
+        self.assertEqual(index.symbol("pyimage1"), "P")
+        self.assertEqual(index.name("images/hero.png"), "pyimage1")
+        self.assertIsNone(index.symbol("pyimage2"))
+
+    def test_cache_grows(self):
+        cache = {"images/hero.png": FakeImage("pyimage1")}
+        self.assertIsNone(image_id_path(cache, "pyimage2"))
+
+        cache["images/zombie.png"] = FakeImage("pyimage2")
+        self.assertEqual(image_id_path(cache, "pyimage2"), "images/zombie.png")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Test that importing conscience doesn't import its heavy dependencies until they are used.
+"""
+
+import importlib
+import subprocess
+import sys
+import types
+import unittest
+
+HEAVY = ("behave", "PIL", "conscience.formatters")
+
+
+def loaded_after(statement: str) -> set[str]:
+    """The heavy modules loaded by running the statement in a fresh interpreter."""
+    script = f"""
+import sys
+{statement}
+print(" ".join(sorted(name for name in sys.modules if name.startswith({HEAVY!r}))))
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_conscience(self):
+        self.assertEqual(loaded_after("import conscience"), set())
+
+    def test_import_lib(self):
+        self.assertEqual(loaded_after("import conscience.lib"), set())
+
+    def test_public_names_load_on_use(self):
+        loaded = loaded_after("import conscience; conscience.build_config")
+        self.assertIn("behave.__main__", loaded)
+
+    def test_public_names(self):
+        import conscience
+
+        for name in conscience.__all__:
+            self.assertTrue(hasattr(conscience, name), name)
+        self.assertIn("witness", dir(conscience))
+        with self.assertRaises(AttributeError):
+            conscience.not_a_name
+
+    def test_public_names_after_submodules(self):
+        import conscience
+
+        # importing a submodule sets it as an attribute of the package, which would
+        # hide an export of the same name from __getattr__
+        for module in set(conscience._EXPORTS.values()):
+            importlib.import_module(module)
+        for name in conscience.__all__:
+            self.assertNotIsInstance(getattr(conscience, name), types.ModuleType, name)
+
+        from conscience import regrade
+
+        self.assertTrue(callable(regrade))
@@ -0,0 +1,33 @@
+"""
+Test that the keyboard steps press the keys they name.
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from conscience.common import repeat_key_sequence, when_i_press_n
+from conscience.lobes.keyboard import KeyBindings
+
+
+class TestKeyboardSteps(unittest.TestCase):
+    def setUp(self):
+        self.pressed = []
+        bindings = KeyBindings()
+        bindings.bind("<Key>", lambda event: self.pressed.append(event.keysym))
+        self.context = SimpleNamespace(
+            key_bindings=bindings,
+            after=SimpleNamespace(step=lambda ms: None),
+            window=SimpleNamespace(update=lambda: None),
+        )
+
+    def test_press_n_times(self):
+        when_i_press_n(self.context, " left", 2)
+        self.assertEqual(self.pressed, ["Left", "Left"])
+
+    def test_repeat_key_sequence(self):
+        repeat_key_sequence(self.context, "wasd", 2)
+        self.assertEqual(self.pressed, list("wasdwasd"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test that steps are matched to the same definitions as behave would, once per step text.
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+
+import parse
+from behave.step_registry import StepRegistry
+
+from conscience.matching import CachedStepRegistry, literal_prefix
+from conscience.parsers import parse_string, register_parsers
+
+register_parsers()
+
+
+def step(step_type, name):
+    return SimpleNamespace(step_type=step_type, name=name)
+
+
+def seen(context, text):
+    pass
+
+
+def wide(context, pixels):
+    pass
+
+
+def anything(context, text):
+    pass
+
+
+class TestCachedStepRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = StepRegistry()
+        self.registry.add_step_definition("then", 'I see text "{text:Text}"', seen)
+        self.registry.add_step_definition("then", "it is {pixels:d} pixels wide", wide)
+        self.cached = CachedStepRegistry(self.registry)
+
+    def test_same_match_as_behave(self):
+        for name in (
+            'I see text "Hello"',
+            "it is 10 pixels wide",
+            "IT IS 3 PIXELS WIDE",
+        ):
+            expected = self.registry.find_match(step("then", name))
+            actual = self.cached.find_match(step("then", name))
+            self.assertEqual(actual, expected)
+            self.assertEqual(
+                [a.value for a in actual.arguments],
+                [a.value for a in expected.arguments],
+            )
+        self.assertIsNone(self.cached.find_match(step("then", "it is wide")))
+        self.assertIsNone(self.cached.find_match(step("given", "it is 10 pixels wide")))
+
+    def test_memoised(self):
+        first = self.cached.find_match(step("then", "it is 10 pixels wide"))
+        second = self.cached.find_match(step("then", "it is 10 pixels wide"))
+        self.assertIs(first, second)
+        self.assertEqual((self.cached.hits, self.cached.misses), (1, 1))
+
+    def test_forgets_when_steps_are_added(self):
+        name = "anything at all"
+        self.assertIsNone(self.cached.find_match(step("then", name)))
+
+        self.registry.add_step_definition("step", "{text}", anything)
+        match = self.cached.find_match(step("then", name))
+        self.assertEqual(match.func, anything)
+
+    def test_literal_prefix(self):
+        (matcher,) = [m for m in self.registry.steps["then"] if m.func is wide]
+        self.assertEqual(literal_prefix(matcher), "it is ")
+
+
+class TestParseString(unittest.TestCase):
+    def test_matches_any_text(self):
+        parser = parse.Parser('says "{text:Text}"', {"Text": parse_string})
+        self.assertEqual(parser.parse('says "a, b\nc"')["text"], "a, b\nc")
+
+    def test_no_backtracking(self):
+        parser = parse.Parser('says "{text:Text}" twice', {"Text": parse_string})
+        start = time.perf_counter()
+        self.assertIsNone(parser.parse('says "' + "a " * 5000))
+        self.assertLess(time.perf_counter() - start, 1)
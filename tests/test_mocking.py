@@ -2,7 +2,7 @@
 Ensure that mocking correctly captures subsequent calls to methods.
 """
 
-from conscience.lib.mocking import MixinBase
+from conscience.lib.mocking import MixinBase, MockLog, VacantLog
 import unittest
 import traceback
 
@@ -91,5 +91,27 @@ class TestCoreMock(unittest.TestCase):
         self.assertEqual(calls[4], (("p0", "p1"), {"kw0": None, "kw1": None}))
 
 
+class TestCalledThroughInstance(unittest.TestCase):
+    """Hooks receive the arguments of calls to a mocked method, not the instance."""
+
+    def test_vacant_log(self):
+        mock = VacantLog(MockMe, "both_args")
+        MockMe(None).both_args("p0", "p1", kw1=1)
+        mock.restore()
+
+        self.assertEqual(mock.logs, [(("p0", "p1"), {"kw1": 1})])
+
+    def test_mock_log(self):
+        calls = []
+        mock = MockLog(MockMe, "single_arg")
+        mock.register(lambda *args, **kwargs: calls.append((args, kwargs)) or "mocked")
+        returned = MockMe(None).single_arg("p0")
+        mock.restore()
+
+        self.assertEqual(returned, "mocked")
+        self.assertEqual(calls, [(("p0",), {})])
+        self.assertEqual(mock.logs, [(("p0",), {})])
+
+
 if __name__ == "__main__":
     unittest.main()
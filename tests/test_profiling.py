@@ -0,0 +1,99 @@
+"""
+Test that the profiler counts the cost of each step.
+"""
+
+import json
+import os
+import tkinter as tk
+import unittest
+from types import SimpleNamespace
+
+from conscience import witness
+from conscience.lib.mocking import MockLog, VacantLog
+from conscience.profiling import Profiler, aggregate_profiles
+
+from benchmarks.grade_cohort import SUBMISSION, cohort_config
+
+
+def scenario(name):
+    return SimpleNamespace(name=name, feature=SimpleNamespace(name="Feature"))
+
+
+def step(name):
+    return SimpleNamespace(
+        keyword="Then", name=name, status=SimpleNamespace(name="passed")
+    )
+
+
+class MockMe:
+    def do_it(self):
+        pass
+
+
+class TestProfiler(unittest.TestCase):
+    def test_counts_per_step(self):
+        profiler = Profiler()
+        with profiler.recording():
+            mock = VacantLog(MockMe, "do_it")
+            interpreter = tk.Tcl()
+            profiler.before_scenario(scenario("Counting"))
+
+            profiler.before_step()
+            MockMe().do_it()
+            MockMe().do_it()
+            interpreter.tk.call("set", "x", 1)
+            profiler.after_step(step("first"))
+
+            profiler.before_step()
+            profiler.after_step(step("second"))
+            mock.restore()
+
+        (report,) = profiler.report()
+        self.assertEqual(report["name"], "Counting (Feature)")
+        first, second = report["steps"]
+        self.assertEqual(first["mock_calls"], 2)
+        self.assertEqual(first["tcl_calls"], 1)
+        self.assertEqual((second["mock_calls"], second["tcl_calls"]), (0, 0))
+        json.dumps(profiler.report())
+
+    def test_nothing_wrapped_when_not_recording(self):
+        mock = VacantLog(MockMe, "do_it")
+        self.assertEqual(mock._call.__name__, "inject")
+        mock.restore()
+        self.assertNotEqual(type(tk.Tcl().tk).__name__, "_CountingInterpreter")
+
+    def test_mocks_receive_the_same_arguments(self):
+        calls = []
+        with Profiler().recording():
+            mock = MockLog(MockMe, "do_it")
+            mock.register(lambda *args, **kwargs: calls.append(args))
+            MockMe().do_it()
+            mock.restore()
+
+        self.assertEqual(calls, [()])
+
+    def test_same_grades(self):
+        home = os.getcwd()
+        self.addCleanup(os.chdir, home)
+
+        def grade(profiler):
+            os.chdir(home)
+            config = cohort_config(
+                step_timeout=5, scenario_timeout=15, reuse_window=False
+            )
+            config.profiler = profiler
+            return witness(config, SUBMISSION)
+
+        self.assertEqual(grade(Profiler()), grade(None))
+
+    def test_aggregate(self):
+        def report(wall, calls):
+            profile = {"wall": wall, "cpu": 0.0, "tcl_calls": calls}
+            profile.update(mock_calls=0, widgets_traversed=0)
+            return [{"name": "A", "steps": [profile]}]
+
+        summary = aggregate_profiles([report(1.0, 10), report(3.0, 30)])
+        self.assertEqual(summary["A"]["runs"], 2)
+        self.assertEqual(summary["A"]["wall"]["p50"], 2.0)
+        self.assertEqual(summary["A"]["wall"]["max"], 3.0)
+        self.assertEqual(summary["A"]["tcl_calls"], 20)
@@ -0,0 +1,47 @@
+"""
+Test that regrading only re-runs changed scenarios.
+"""
+
+import unittest
+from pathlib import Path
+
+from conscience import witness
+from conscience.regrading import regrade
+from tests.conftest import hello_world_config
+
+TARGET = Path("tests/hello_world/hello_world_gui.py")
+
+
+class TestRegrade(unittest.TestCase):
+    def setUp(self):
+        self.previous = witness(hello_world_config(), TARGET)
+
+    def test_unchanged(self):
+        stale = {
+            "tests": [{**test, "output": "stale"} for test in self.previous["tests"]]
+        }
+        results = regrade(hello_world_config(), TARGET, stale)
+
+        self.assertEqual(results["tests"], stale["tests"])
+
+    def test_changed(self):
+        stale = {
+            "tests": [
+                {**test, "output": "stale", "extra_data": {"fingerprint": "old"}}
+                for test in self.previous["tests"]
+            ]
+        }
+        results = regrade(hello_world_config(), TARGET, stale)
+
+        self.assertEqual(results["tests"], self.previous["tests"])
+
+    def test_removed(self):
+        removed = {
+            "name": "Removed (Scenario)",
+            "score": 1,
+            "extra_data": {"fingerprint": "x"},
+        }
+        stale = {"tests": [*self.previous["tests"], removed]}
+        results = regrade(hello_world_config(), TARGET, stale)
+
+        self.assertNotIn(removed, results["tests"])
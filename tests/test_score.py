@@ -0,0 +1,28 @@
+"""
+Test reading results back from gradescope formatter output.
+"""
+
+from io import BytesIO
+import json
+import unittest
+
+from conscience.score import read_results_from_ndjson
+
+
+class TestReadNDJSON(unittest.TestCase):
+    def test_truncated(self):
+        first = {"score": 1, "max_score": 1, "name": "first"}
+        second = {"score": 0, "max_score": 1, "name": "second"}
+        lines = [json.dumps(first), json.dumps(second), json.dumps(first)[:10]]
+        stream = BytesIO("\n".join(lines).encode("utf8"))
+
+        self.assertEqual(read_results_from_ndjson(stream), {"tests": [first, second]})
+
+    def test_empty(self):
+        results = read_results_from_ndjson(BytesIO(b"Traceback"))
+        self.assertEqual(results["score"], 0)
+        self.assertEqual(results["output"], "Traceback")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Test that a root window can be scrubbed clean and reused.
+"""
+
+import tkinter as tk
+import unittest
+
+from conscience.lib.window import destroy_root, reset_root, snapshot
+
+
+class TestResetRoot(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("no display available")
+        self.addCleanup(destroy_root, self.root)
+
+    def test_scrub(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        frame = tk.Frame(root)
+        tk.Label(frame, text="hello", textvariable=tk.StringVar(root)).pack()
+        frame.pack()
+        root.bind("<Key>", lambda event: None)
+        root.bind_all("<Button-1>", lambda event: None)
+        root.after(10_000, lambda: None)
+        root.title("student")
+        root.configure(bg="red")
+        root.protocol("WM_DELETE_WINDOW", lambda: None)
+        image = tk.PhotoImage(master=root, name="student", width=1, height=1)
+        root.tk.call("font", "create", "StudentFont")
+        root.model = object()
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+
+    def test_grid_weights(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        root.grid_columnconfigure(2, weight=1)
+        root.grid_rowconfigure(0, minsize=50)
+        tk.Label(root, text="hello").grid(row=3, column=3)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertEqual(root.grid_columnconfigure(2)["weight"], 0)
+        self.assertEqual(root.grid_rowconfigure(0)["minsize"], 0)
+
+    def test_propagate(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        root.pack_propagate(False)
+        root.grid_propagate(False)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertTrue(root.pack_propagate())
+        self.assertTrue(root.grid_propagate())
+
+    def test_wm_sizes(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        root.resizable(False, False)
+        root.minsize(300, 200)
+        root.maxsize(400, 300)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        resizable = root.tk.splitlist(root.resizable())
+        self.assertEqual([root.tk.getboolean(value) for value in resizable], [1, 1])
+
+    def test_wm_attributes(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        root.attributes("-topmost", True)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertFalse(root.tk.getboolean(root.attributes("-topmost")))
+
+    def test_wm_state(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        for change in (root.iconify, root.withdraw):
+            change()
+            self.assertNotEqual(snapshot(root), baseline)
+            self.assertTrue(reset_root(root, baseline))
+            self.assertEqual(root.state(), baseline["wm_state"])
+
+    def test_overrideredirect(self):
+        root = self.root
+        baseline = snapshot(root)
+
+        root.overrideredirect(True)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertFalse(root.overrideredirect())
+
+    def test_protocols(self):
+        root = self.root
+        baseline = snapshot(root)
+        original = root.protocol("WM_DELETE_WINDOW")
+
+        root.protocol("WM_DELETE_WINDOW", lambda: None)
+        root.protocol("WM_TAKE_FOCUS", lambda: None)
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertEqual(root.protocol("WM_DELETE_WINDOW"), original)
+        self.assertEqual(root.protocol("WM_TAKE_FOCUS"), "")
+
+    def test_option_database(self):
+        root = self.root
+        baseline = snapshot(root)
+        default = tk.Label(root).cget("foreground")
+
+        root.option_add("*Label.foreground", "red")
+        self.assertEqual(tk.Label(root).cget("foreground"), "red")
+
+        self.assertNotEqual(snapshot(root), baseline)
+        self.assertTrue(reset_root(root, baseline))
+        self.assertEqual(tk.Label(root).cget("foreground"), default)
+
+    def test_destroyed(self):
+        baseline = snapshot(self.root)
+        self.root.tk.call("destroy", ".")
+        self.assertFalse(reset_root(self.root, baseline))